@@ -8,16 +8,42 @@ class FileStoragePort(ABC):
         """Upload a file and return its storage URI/path."""
         pass
 
+    @abstractmethod
+    async def upload_file(self, file_path: str, local_path: str, content_type: str = "application/octet-stream") -> str:
+        """Upload a local file without reading it into memory and return its storage URI/path."""
+        pass
+
     @abstractmethod
     async def download(self, storage_uri: str) -> bytes:
         """Download a file's content."""
         pass
 
+    @abstractmethod
+    async def download_to_file(self, storage_uri: str, local_path: str) -> None:
+        """Stream a file's content to a local path without holding it in memory."""
+        pass
+
     @abstractmethod
     async def delete(self, storage_uri: str) -> bool:
         """Delete a file."""
         pass
 
+    @abstractmethod
+    async def upload_part(self, upload_id: str, part_number: int, content: bytes) -> None:
+        """Store one part of a multi-part upload. Re-sending a part overwrites it."""
+        pass
+
+    @abstractmethod
+    async def complete_upload(self, upload_id: str, file_path: str, part_count: int, content_type: str = "application/octet-stream") -> str:
+        """Assemble parts 1..part_count into one file and return its storage URI/path."""
+        pass
+
+    @abstractmethod
+    async def abort_upload(self, upload_id: str) -> None:
+        """Discard the stored parts of a multi-part upload."""
+        pass
+
+
 class EventBusPort(ABC):
     @abstractmethod
     async def publish(self, topic: str, message: Dict[str, Any]) -> None:
@@ -0,0 +1,64 @@
+"""
+Background Task Registry
+
+Named task handlers executed by the TaskQueuePort adapters: the local
+adapter runs them on an in-process worker pool, Cloud Tasks delivers them
+to the /tasks/{task_name} receiver in main.py.
+
+Usage:
+    from backend.core.tasks import task_handler
+
+    @task_handler("generation.process_file")
+    def process_file(payload):
+        ...
+
+    await container.task_queue.enqueue("generation.process_file", {"file_id": 42})
+
+Handlers are plain synchronous functions taking the JSON payload. They run
+outside any request, so they open their own database sessions, and they
+must be safe to run more than once for the same payload (queues retry).
+"""
+
+import logging
+from typing import Any, Callable, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+TaskHandler = Callable[[Dict[str, Any]], Any]
+
+_handlers: Dict[str, TaskHandler] = {}
+
+
+def task_handler(task_name: str) -> Callable[[TaskHandler], TaskHandler]:
+    """Decorator registering a function as the handler for a task name."""
+    def register(handler: TaskHandler) -> TaskHandler:
+        if task_name in _handlers and _handlers[task_name] is not handler:
+            raise ValueError(f"Task handler already registered: {task_name}")
+        _handlers[task_name] = handler
+        return handler
+    return register
+
+
+def get_task_handler(task_name: str) -> Optional[TaskHandler]:
+    """Handler registered for a task name, if any."""
+    return _handlers.get(task_name)
+
+
+def task_names() -> List[str]:
+    """Names of all registered tasks."""
+    return sorted(_handlers)
+
+
+def run_task(task_name: str, payload: Dict[str, Any]) -> Any:
+    """
+    Run a task synchronously.
+
+    Raises:
+        KeyError: If no handler is registered for the task name
+        Exception: Whatever the handler raises
+    """
+    handler = _handlers.get(task_name)
+    if handler is None:
+        raise KeyError(f"No handler registered for task: {task_name}")
+    logger.info(f"[Tasks] Running {task_name}")
+    return handler(payload)
@@ -23,6 +23,7 @@ from typing import Any, Dict, List, Optional, TypeVar, Generic
 from datetime import datetime
 import logging
 import asyncio
+import os
 from functools import wraps
 
 from backend.core.ports import (
@@ -137,6 +138,18 @@ class CloudFileStorageBase(CloudAdapterBase, FileStoragePort):
             self._log_error("upload", e, file_path=file_path)
             raise
     
+    @with_retry(max_attempts=3)
+    async def upload_file(self, file_path: str, local_path: str, content_type: str = "application/octet-stream") -> str:
+        """Upload a local file with automatic retry and logging."""
+        self._log_operation("upload_file", file_path=file_path, size=os.path.getsize(local_path))
+        try:
+            result = await self._do_upload_file(file_path, local_path, content_type)
+            self._log_operation("upload_file_complete", file_path=file_path, uri=result)
+            return result
+        except Exception as e:
+            self._log_error("upload_file", e, file_path=file_path)
+            raise
+    
     @with_retry(max_attempts=3)
     async def download(self, storage_uri: str) -> bytes:
         """Download with automatic retry and logging."""
@@ -149,6 +162,17 @@ class CloudFileStorageBase(CloudAdapterBase, FileStoragePort):
             self._log_error("download", e, uri=storage_uri)
             raise
     
+    @with_retry(max_attempts=3)
+    async def download_to_file(self, storage_uri: str, local_path: str) -> None:
+        """Stream a download to a local file with automatic retry and logging."""
+        self._log_operation("download_to_file", uri=storage_uri, local_path=local_path)
+        try:
+            await self._do_download_to_file(storage_uri, local_path)
+            self._log_operation("download_to_file_complete", uri=storage_uri, size=os.path.getsize(local_path))
+        except Exception as e:
+            self._log_error("download_to_file", e, uri=storage_uri)
+            raise
+    
     async def delete(self, storage_uri: str) -> bool:
         """Delete with logging."""
         self._log_operation("delete", uri=storage_uri)
@@ -160,20 +184,79 @@ class CloudFileStorageBase(CloudAdapterBase, FileStoragePort):
             self._log_error("delete", e, uri=storage_uri)
             return False
     
+    @with_retry(max_attempts=3)
+    async def upload_part(self, upload_id: str, part_number: int, content: bytes) -> None:
+        """Store an upload part with automatic retry."""
+        try:
+            await self._do_upload_part(upload_id, part_number, content)
+        except Exception as e:
+            self._log_error("upload_part", e, upload_id=upload_id, part_number=part_number)
+            raise
+    
+    async def complete_upload(
+        self,
+        upload_id: str,
+        file_path: str,
+        part_count: int,
+        content_type: str = "application/octet-stream"
+    ) -> str:
+        """Assemble upload parts with logging."""
+        self._log_operation("complete_upload", upload_id=upload_id, file_path=file_path, parts=part_count)
+        try:
+            result = await self._do_complete_upload(upload_id, file_path, part_count, content_type)
+            self._log_operation("complete_upload_done", upload_id=upload_id, uri=result)
+            return result
+        except Exception as e:
+            self._log_error("complete_upload", e, upload_id=upload_id)
+            raise
+    
+    async def abort_upload(self, upload_id: str) -> None:
+        """Discard upload parts with logging."""
+        self._log_operation("abort_upload", upload_id=upload_id)
+        try:
+            await self._do_abort_upload(upload_id)
+        except Exception as e:
+            self._log_error("abort_upload", e, upload_id=upload_id)
+    
     @abstractmethod
     async def _do_upload(self, file_path: str, content: bytes, content_type: str) -> str:
         """Provider-specific upload implementation."""
         pass
     
+    @abstractmethod
+    async def _do_upload_file(self, file_path: str, local_path: str, content_type: str) -> str:
+        """Provider-specific upload-from-file implementation."""
+        pass
+    
     @abstractmethod
     async def _do_download(self, storage_uri: str) -> bytes:
         """Provider-specific download implementation."""
         pass
     
+    @abstractmethod
+    async def _do_download_to_file(self, storage_uri: str, local_path: str) -> None:
+        """Provider-specific streaming download implementation."""
+        pass
+    
     @abstractmethod
     async def _do_delete(self, storage_uri: str) -> bool:
         """Provider-specific delete implementation."""
         pass
+    
+    @abstractmethod
+    async def _do_upload_part(self, upload_id: str, part_number: int, content: bytes) -> None:
+        """Provider-specific upload part implementation."""
+        pass
+    
+    @abstractmethod
+    async def _do_complete_upload(self, upload_id: str, file_path: str, part_count: int, content_type: str) -> str:
+        """Provider-specific part assembly implementation."""
+        pass
+    
+    @abstractmethod
+    async def _do_abort_upload(self, upload_id: str) -> None:
+        """Provider-specific upload abort implementation."""
+        pass
 
 
 class CloudEventBusBase(CloudAdapterBase, EventBusPort):
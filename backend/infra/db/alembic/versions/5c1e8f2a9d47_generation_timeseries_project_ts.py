@@ -0,0 +1,176 @@
+"""Generation timeseries (project_id, ts_utc) key and monthly partitioning
+
+Revision ID: 5c1e8f2a9d47
+Revises: 37ffeba1613a
+Create Date: 2026-10-16 23:30:00.000000
+
+Every generation query filters on project_id and then a ts_utc range, so
+the table gets a unique (project_id, ts_utc) constraint. Its index serves
+those range scans and the ingestion upsert.
+
+With GENERATION_TIMESERIES_PARTITIONING=true on PostgreSQL the table is
+rebuilt as RANGE partitioned by month on ts_utc, with one partition per
+month that holds data. Later months are created by the bulk writer. The
+primary key becomes (id, ts_utc) because partition keys must be part of
+every unique constraint.
+
+The generation tables are created by Base.metadata.create_all, so this
+revision only alters the table if it already exists. A missing table is
+created partitioned when requested, or else left to create_all. Run it
+after the application has created its tables.
+"""
+import os
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '5c1e8f2a9d47'
+down_revision: Union[str, None] = '37ffeba1613a'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = 'generation_timeseries'
+UNIQUE_NAME = 'uq_generation_timeseries_project_ts'
+
+PARTITIONING = os.environ.get("GENERATION_TIMESERIES_PARTITIONING", "false").lower() == "true"
+
+# Columns shared by the plain and the partitioned table
+COLUMNS_SQL = """
+    id integer NOT NULL DEFAULT nextval('generation_timeseries_id_seq'),
+    project_id integer NOT NULL REFERENCES projects (id) ON DELETE CASCADE,
+    file_id integer REFERENCES uploaded_files (id),
+    ts_utc timestamp without time zone NOT NULL,
+    energy_mwh numeric(12, 6) NOT NULL,
+    power_mw numeric(12, 6),
+    quality_flag varchar(20),
+    original_value numeric(16, 6),
+    original_unit varchar(10),
+    created_at timestamp without time zone
+"""
+COLUMN_NAMES = (
+    "id, project_id, file_id, ts_utc, energy_mwh, power_mw, "
+    "quality_flag, original_value, original_unit, created_at"
+)
+
+
+def _has_table(bind) -> bool:
+    return TABLE in sa.inspect(bind).get_table_names()
+
+
+def _is_partitioned(bind) -> bool:
+    return bind.dialect.name == 'postgresql' and bind.execute(sa.text(
+        "SELECT 1 FROM pg_partitioned_table WHERE partrelid = to_regclass(:table)"
+    ), {"table": TABLE}).first() is not None
+
+
+def _delete_duplicates() -> None:
+    """Keep the newest row for each (project_id, ts_utc) so the unique key can be added."""
+    op.execute(f"""
+        DELETE FROM {TABLE} WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (
+                    PARTITION BY project_id, ts_utc ORDER BY id DESC
+                ) AS rank
+                FROM {TABLE}
+            ) ranked
+            WHERE rank > 1
+        )
+    """)
+
+
+def _month_partitions(bind, source: str) -> None:
+    """Create a partition for each month that holds rows in source."""
+    months = bind.execute(sa.text(
+        f"SELECT DISTINCT date_trunc('month', ts_utc) FROM {source} ORDER BY 1"
+    )).scalars().all()
+    for month in months:
+        op.execute(
+            f"CREATE TABLE IF NOT EXISTS {TABLE}_p{month:%Y%m} PARTITION OF {TABLE} "
+            f"FOR VALUES FROM ('{month:%Y-%m-01}') TO "
+            f"('{month:%Y-%m-01}'::timestamp + interval '1 month')"
+        )
+
+
+def _create_indexes() -> None:
+    op.create_index(op.f('ix_generation_timeseries_id'), TABLE, ['id'], unique=False)
+    op.create_index(op.f('ix_generation_timeseries_ts_utc'), TABLE, ['ts_utc'], unique=False)
+
+
+def _rebuild(bind, partitioned: bool) -> None:
+    """Recreate the table (partitioned or plain) and move its rows across."""
+    exists = _has_table(bind)
+    if exists:
+        op.rename_table(TABLE, f'{TABLE}_old')
+        op.execute(f"ALTER TABLE {TABLE}_old DROP CONSTRAINT IF EXISTS {UNIQUE_NAME}")
+        # Index and constraint names are schema-wide; free them for the new table
+        for index in ('generation_timeseries_pkey', 'ix_generation_timeseries_id', 'ix_generation_timeseries_ts_utc'):
+            op.execute(f"ALTER INDEX IF EXISTS {index} RENAME TO {index}_old")
+    op.execute("CREATE SEQUENCE IF NOT EXISTS generation_timeseries_id_seq")
+
+    if partitioned:
+        op.execute(f"""
+            CREATE TABLE {TABLE} (
+                {COLUMNS_SQL},
+                PRIMARY KEY (id, ts_utc),
+                CONSTRAINT {UNIQUE_NAME} UNIQUE (project_id, ts_utc)
+            ) PARTITION BY RANGE (ts_utc)
+        """)
+    else:
+        op.execute(f"""
+            CREATE TABLE {TABLE} (
+                {COLUMNS_SQL},
+                PRIMARY KEY (id),
+                CONSTRAINT {UNIQUE_NAME} UNIQUE (project_id, ts_utc)
+            )
+        """)
+    _create_indexes()
+
+    if exists:
+        if partitioned:
+            _month_partitions(bind, f'{TABLE}_old')
+        op.execute(f"""
+            INSERT INTO {TABLE} ({COLUMN_NAMES})
+            SELECT DISTINCT ON (project_id, ts_utc) {COLUMN_NAMES}
+            FROM {TABLE}_old
+            ORDER BY project_id, ts_utc, id DESC
+        """)
+        op.execute("ALTER SEQUENCE generation_timeseries_id_seq OWNED BY NONE")
+        op.drop_table(f'{TABLE}_old')
+    op.execute(f"ALTER SEQUENCE generation_timeseries_id_seq OWNED BY {TABLE}.id")
+    op.execute(
+        f"SELECT setval('generation_timeseries_id_seq', COALESCE((SELECT max(id) FROM {TABLE}), 0) + 1, false)"
+    )
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if PARTITIONING and bind.dialect.name == 'postgresql':
+        # Without uploaded_files the schema is not there yet; create_all builds a plain table
+        if not _is_partitioned(bind) and 'uploaded_files' in sa.inspect(bind).get_table_names():
+            _rebuild(bind, partitioned=True)
+        return
+
+    if not _has_table(bind):
+        return
+    unique = {c['name'] for c in sa.inspect(bind).get_unique_constraints(TABLE)}
+    if UNIQUE_NAME in unique:
+        return
+    _delete_duplicates()
+    with op.batch_alter_table(TABLE) as batch_op:
+        batch_op.create_unique_constraint(UNIQUE_NAME, ['project_id', 'ts_utc'])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if _is_partitioned(bind):
+        _rebuild(bind, partitioned=False)
+    if not _has_table(bind):
+        return
+    unique = {c['name'] for c in sa.inspect(bind).get_unique_constraints(TABLE)}
+    if UNIQUE_NAME in unique:
+        with op.batch_alter_table(TABLE) as batch_op:
+            batch_op.drop_constraint(UNIQUE_NAME, type_='unique')
@@ -0,0 +1,146 @@
+"""Generation ingestion progress, upload sessions, archives and month aggregates
+
+Revision ID: 8b3d6f1c2a90
+Revises: 5c1e8f2a9d47
+Create Date: 2026-10-16 23:35:00.000000
+
+Adds the columns and tables the generation module gained after its tables
+were first created:
+
+- uploaded_files.rows_processed and uploaded_files.processing_stats
+- dataset_mappings.sheet_name
+- upload_sessions, generation_archives, generation_months and
+  estimation_month_aggregates
+
+Like 5c1e8f2a9d47 this only touches a schema that already exists. On a fresh
+database Base.metadata.create_all builds the generation tables complete, so
+missing parents are skipped and existing columns and tables are left as is.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8b3d6f1c2a90'
+down_revision: Union[str, None] = '5c1e8f2a9d47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _tables(bind) -> set:
+    return set(sa.inspect(bind).get_table_names())
+
+
+def _columns(bind, table: str) -> set:
+    return {c['name'] for c in sa.inspect(bind).get_columns(table)}
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    tables = _tables(bind)
+    if 'uploaded_files' not in tables:
+        # Generation schema not created yet; create_all builds it complete
+        return
+
+    uploaded_file_columns = _columns(bind, 'uploaded_files')
+    if 'rows_processed' not in uploaded_file_columns:
+        op.add_column('uploaded_files', sa.Column('rows_processed', sa.Integer(), nullable=True))
+    if 'processing_stats' not in uploaded_file_columns:
+        op.add_column('uploaded_files', sa.Column('processing_stats', sa.JSON(), nullable=True))
+
+    if 'dataset_mappings' in tables and 'sheet_name' not in _columns(bind, 'dataset_mappings'):
+        op.add_column('dataset_mappings', sa.Column('sheet_name', sa.String(length=100), nullable=True))
+
+    if 'upload_sessions' not in tables:
+        op.create_table('upload_sessions',
+        sa.Column('id', sa.String(length=32), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('original_filename', sa.String(length=255), nullable=False),
+        sa.Column('mime_type', sa.String(length=100), nullable=False),
+        sa.Column('total_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('received_bytes', sa.BigInteger(), nullable=False),
+        sa.Column('part_count', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(length=20), nullable=True),
+        sa.Column('file_id', sa.Integer(), nullable=True),
+        sa.Column('uploaded_by', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['file_id'], ['uploaded_files.id'], ),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.ForeignKeyConstraint(['uploaded_by'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+
+    if 'generation_archives' not in tables:
+        op.create_table('generation_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('year', sa.Integer(), nullable=False),
+        sa.Column('storage_uri', sa.Text(), nullable=False),
+        sa.Column('row_count', sa.Integer(), nullable=False),
+        sa.Column('size_bytes', sa.BigInteger(), nullable=True),
+        sa.Column('ts_min', sa.DateTime(), nullable=True),
+        sa.Column('ts_max', sa.DateTime(), nullable=True),
+        sa.Column('is_stale', sa.Boolean(), nullable=True),
+        sa.Column('built_at', sa.DateTime(), nullable=True),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'year', name='uq_generation_archive_project_year')
+        )
+        op.create_index(op.f('ix_generation_archives_id'), 'generation_archives', ['id'], unique=False)
+        op.create_index(op.f('ix_generation_archives_project_id'), 'generation_archives', ['project_id'], unique=False)
+
+    if 'generation_months' not in tables:
+        op.create_table('generation_months',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('changed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'month', name='uq_generation_month_project_month')
+        )
+        op.create_index(op.f('ix_generation_months_id'), 'generation_months', ['id'], unique=False)
+        op.create_index(op.f('ix_generation_months_project_id'), 'generation_months', ['project_id'], unique=False)
+
+    if 'estimation_month_aggregates' not in tables:
+        op.create_table('estimation_month_aggregates',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('project_id', sa.Integer(), nullable=False),
+        sa.Column('methodology_id', sa.String(length=50), nullable=False),
+        sa.Column('ef_version', sa.String(length=255), nullable=False),
+        sa.Column('month', sa.String(length=7), nullable=False),
+        sa.Column('generation_mwh', sa.Numeric(precision=16, scale=6), nullable=False),
+        sa.Column('computed_at', sa.DateTime(), nullable=False),
+        sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('project_id', 'methodology_id', 'ef_version', 'month', name='uq_estimation_month_aggregate')
+        )
+        op.create_index(op.f('ix_estimation_month_aggregates_id'), 'estimation_month_aggregates', ['id'], unique=False)
+        op.create_index(op.f('ix_estimation_month_aggregates_project_id'), 'estimation_month_aggregates', ['project_id'], unique=False)
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    tables = _tables(bind)
+
+    for table in ('estimation_month_aggregates', 'generation_months', 'generation_archives'):
+        if table in tables:
+            op.drop_index(op.f(f'ix_{table}_project_id'), table_name=table)
+            op.drop_index(op.f(f'ix_{table}_id'), table_name=table)
+            op.drop_table(table)
+    if 'upload_sessions' in tables:
+        op.drop_table('upload_sessions')
+
+    if 'dataset_mappings' in tables and 'sheet_name' in _columns(bind, 'dataset_mappings'):
+        with op.batch_alter_table('dataset_mappings') as batch_op:
+            batch_op.drop_column('sheet_name')
+    if 'uploaded_files' in tables:
+        uploaded_file_columns = _columns(bind, 'uploaded_files')
+        with op.batch_alter_table('uploaded_files') as batch_op:
+            if 'processing_stats' in uploaded_file_columns:
+                batch_op.drop_column('processing_stats')
+            if 'rows_processed' in uploaded_file_columns:
+                batch_op.drop_column('rows_processed')
@@ -0,0 +1,69 @@
+"""Key estimation month aggregates on (project_id, month)
+
+Revision ID: c4e7a2d9f1b3
+Revises: 8b3d6f1c2a90
+Create Date: 2026-10-16 23:38:00.000000
+
+Monthly generation does not depend on the methodology or the grid EF, so
+estimation_month_aggregates drops its methodology_id and ef_version columns
+and keeps one row per project month. The table only caches totals that are
+recomputed from generation_timeseries on a miss, so it is rebuilt empty
+rather than merged.
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4e7a2d9f1b3'
+down_revision: Union[str, None] = '8b3d6f1c2a90'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = 'estimation_month_aggregates'
+
+
+def _columns(bind) -> set:
+    return {c['name'] for c in sa.inspect(bind).get_columns(TABLE)}
+
+
+def _recreate(key_columns: list, extra_columns: list) -> None:
+    op.drop_index(op.f(f'ix_{TABLE}_project_id'), table_name=TABLE)
+    op.drop_index(op.f(f'ix_{TABLE}_id'), table_name=TABLE)
+    op.drop_table(TABLE)
+    op.create_table(TABLE,
+    sa.Column('id', sa.Integer(), nullable=False),
+    sa.Column('project_id', sa.Integer(), nullable=False),
+    *extra_columns,
+    sa.Column('month', sa.String(length=7), nullable=False),
+    sa.Column('generation_mwh', sa.Numeric(precision=16, scale=6), nullable=False),
+    sa.Column('computed_at', sa.DateTime(), nullable=False),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint(*key_columns, name='uq_estimation_month_aggregate')
+    )
+    op.create_index(op.f(f'ix_{TABLE}_id'), TABLE, ['id'], unique=False)
+    op.create_index(op.f(f'ix_{TABLE}_project_id'), TABLE, ['project_id'], unique=False)
+
+
+def upgrade() -> None:
+    bind = op.get_bind()
+    if TABLE not in sa.inspect(bind).get_table_names() or 'methodology_id' not in _columns(bind):
+        return
+    _recreate(['project_id', 'month'], [])
+
+
+def downgrade() -> None:
+    bind = op.get_bind()
+    if TABLE not in sa.inspect(bind).get_table_names() or 'methodology_id' in _columns(bind):
+        return
+    _recreate(
+        ['project_id', 'methodology_id', 'ef_version', 'month'],
+        [
+            sa.Column('methodology_id', sa.String(length=50), nullable=False),
+            sa.Column('ef_version', sa.String(length=255), nullable=False),
+        ],
+    )
@@ -0,0 +1,51 @@
+"""Record failed generation archive rebuilds
+
+Revision ID: e2a9c7b41d05
+Revises: c4e7a2d9f1b3
+Create Date: 2026-10-16 23:43:00.000000
+
+Adds generation_archives.last_error and generation_archives.failed_at, set
+when a background rebuild fails and cleared by the next successful one.
+Skipped when the table does not exist yet; create_all builds it complete.
+"""
+from typing import Optional, Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e2a9c7b41d05'
+down_revision: Union[str, None] = 'c4e7a2d9f1b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+TABLE = 'generation_archives'
+
+
+def _columns(bind) -> Optional[set]:
+    if TABLE not in sa.inspect(bind).get_table_names():
+        return None
+    return {c['name'] for c in sa.inspect(bind).get_columns(TABLE)}
+
+
+def upgrade() -> None:
+    columns = _columns(op.get_bind())
+    if columns is None:
+        return
+    if 'last_error' not in columns:
+        op.add_column(TABLE, sa.Column('last_error', sa.Text(), nullable=True))
+    if 'failed_at' not in columns:
+        op.add_column(TABLE, sa.Column('failed_at', sa.DateTime(), nullable=True))
+
+
+def downgrade() -> None:
+    columns = _columns(op.get_bind())
+    if not columns:
+        return
+    with op.batch_alter_table(TABLE) as batch_op:
+        if 'failed_at' in columns:
+            batch_op.drop_column('failed_at')
+        if 'last_error' in columns:
+            batch_op.drop_column('last_error')
@@ -19,6 +19,7 @@ Environment Variables:
     - EMAIL_FROM: Default sender email address
 """
 
+import asyncio
 import os
 import json
 from typing import Any, Dict, Optional
@@ -87,6 +88,18 @@ class GCSFileStorageAdapter(CloudFileStorageBase):
         blob.upload_from_string(content, content_type=content_type)
         return self.build_uri(self.bucket_name, blob_path)
     
+    async def _do_upload_file(
+        self,
+        file_path: str,
+        local_path: str,
+        content_type: str
+    ) -> str:
+        """Upload a local file to GCS."""
+        blob_path = file_path.lstrip("/")
+        blob = self.bucket.blob(blob_path)
+        await asyncio.to_thread(blob.upload_from_filename, local_path, content_type=content_type)
+        return self.build_uri(self.bucket_name, blob_path)
+    
     async def _do_download(self, storage_uri: str) -> bytes:
         """Download file from GCS."""
         bucket_name, blob_path = self.parse_uri(storage_uri)
@@ -114,6 +127,66 @@ class GCSFileStorageAdapter(CloudFileStorageBase):
             return True
         except NotFound:
             return False
+
+    def _part_blob_path(self, upload_id: str, part_number: int) -> str:
+        return f".uploads/{upload_id}/{part_number:06d}"
+
+    async def _do_download_to_file(self, storage_uri: str, local_path: str) -> None:
+        """Stream a GCS object to a local file."""
+        bucket_name, blob_path = self.parse_uri(storage_uri)
+        if not blob_path:
+            blob_path = bucket_name
+            bucket_name = self.bucket_name
+
+        blob = self.client.bucket(bucket_name).blob(blob_path)
+        await asyncio.to_thread(blob.download_to_filename, local_path)
+
+    async def _do_upload_part(self, upload_id: str, part_number: int, content: bytes) -> None:
+        """Upload one part as a temporary blob."""
+        blob = self.bucket.blob(self._part_blob_path(upload_id, part_number))
+        await asyncio.to_thread(blob.upload_from_string, content)
+
+    async def _do_complete_upload(
+        self,
+        upload_id: str,
+        file_path: str,
+        part_count: int,
+        content_type: str
+    ) -> str:
+        """Compose part blobs into the destination object server-side."""
+        blob_path = file_path.lstrip("/")
+        await asyncio.to_thread(self._compose_parts, upload_id, blob_path, part_count, content_type)
+        await self._do_abort_upload(upload_id)
+        return self.build_uri(self.bucket_name, blob_path)
+
+    def _compose_parts(self, upload_id: str, blob_path: str, part_count: int, content_type: str) -> None:
+        sources = [
+            self.bucket.blob(self._part_blob_path(upload_id, n))
+            for n in range(1, part_count + 1)
+        ]
+
+        # GCS composes at most 32 sources per call; fold larger uploads in rounds
+        level = 0
+        while len(sources) > 32:
+            merged = []
+            for i in range(0, len(sources), 32):
+                target = self.bucket.blob(f".uploads/{upload_id}/compose-{level}-{i // 32:06d}")
+                target.compose(sources[i:i + 32])
+                merged.append(target)
+            sources = merged
+            level += 1
+
+        destination = self.bucket.blob(blob_path)
+        destination.content_type = content_type
+        destination.compose(sources)
+
+    async def _do_abort_upload(self, upload_id: str) -> None:
+        """Delete all temporary blobs of an upload."""
+        await asyncio.to_thread(self._delete_parts, upload_id)
+
+    def _delete_parts(self, upload_id: str) -> None:
+        for blob in self.client.list_blobs(self.bucket_name, prefix=f".uploads/{upload_id}/"):
+            blob.delete()
     
     async def get_signed_url(
         self, 
@@ -221,7 +294,8 @@ class CloudTasksQueueAdapter(CloudTaskQueueBase):
     Google Cloud Tasks adapter for background task processing.
     
     Uses Cloud Tasks for reliable, scheduled task execution.
-    Tasks are delivered to a target HTTP endpoint.
+    Tasks are delivered to the /tasks/{task_name} receiver of the API
+    at CLOUD_TASKS_TARGET_URL.
     """
     
     provider = "gcp"
@@ -238,6 +312,7 @@ class CloudTasksQueueAdapter(CloudTaskQueueBase):
         self.location = location or os.getenv("CLOUD_TASKS_LOCATION", "asia-south2")
         self.queue_name = queue_name or os.getenv("CLOUD_TASKS_QUEUE", "default")
         self.target_url = target_url or os.getenv("CLOUD_TASKS_TARGET_URL", "")
+        self.auth_token = os.getenv("TASKS_AUTH_TOKEN")
         self._client = None
     
     @property
@@ -264,13 +339,16 @@ class CloudTasksQueueAdapter(CloudTaskQueueBase):
         
         queue_path = self._get_queue_path()
         
-        # Build the task
+        # Build the task; the receiver checks the shared token when one is configured
+        headers = {"Content-Type": "application/json"}
+        if self.auth_token:
+            headers["X-Task-Token"] = self.auth_token
         task = {
             "http_request": {
                 "http_method": tasks_v2.HttpMethod.POST,
                 "url": f"{self.target_url}/tasks/{task_name}",
-                "headers": {"Content-Type": "application/json"},
-                "body": json.dumps(payload).encode(),
+                "headers": headers,
+                "body": json.dumps(payload, default=str).encode(),
             }
         }
         
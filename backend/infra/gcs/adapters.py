@@ -5,6 +5,7 @@ This adapter implements the FileStoragePort interface using Google Cloud Storage
 Uses the temp-garbage bucket in asia-south2 region.
 """
 
+import asyncio
 import os
 from typing import Optional
 from google.cloud import storage
@@ -61,6 +62,28 @@ class GCSFileStorageAdapter(FileStoragePort):
         # Return the GCS URI
         return f"gs://{self.bucket_name}/{blob_path}"
     
+    async def upload_file(
+        self,
+        file_path: str,
+        local_path: str,
+        content_type: str = "application/octet-stream"
+    ) -> str:
+        """
+        Upload a local file to GCS without reading it into memory.
+        
+        Args:
+            file_path: The destination path within the bucket
+            local_path: Path of the file to upload
+            content_type: MIME type of the file
+            
+        Returns:
+            The GCS URI (gs://bucket-name/path/to/file)
+        """
+        blob_path = file_path.lstrip("/")
+        blob = self.bucket.blob(blob_path)
+        await asyncio.to_thread(blob.upload_from_filename, local_path, content_type=content_type)
+        return f"gs://{self.bucket_name}/{blob_path}"
+    
     async def download(self, storage_uri: str) -> bytes:
         """
         Download a file from GCS.
@@ -110,6 +133,84 @@ class GCSFileStorageAdapter(FileStoragePort):
         except NotFound:
             return False
     
+    async def download_to_file(self, storage_uri: str, local_path: str) -> None:
+        """
+        Stream a file from GCS to a local path without holding it in memory.
+        
+        Args:
+            storage_uri: The GCS URI (gs://bucket-name/path) or just the blob path
+            local_path: Destination file path
+        """
+        if storage_uri.startswith("gs://"):
+            parts = storage_uri.replace("gs://", "").split("/", 1)
+            if len(parts) < 2:
+                raise ValueError(f"Invalid GCS URI: {storage_uri}")
+            blob_path = parts[1]
+        else:
+            blob_path = storage_uri.lstrip("/")
+        
+        blob = self.bucket.blob(blob_path)
+        await asyncio.to_thread(blob.download_to_filename, local_path)
+    
+    async def upload_part(self, upload_id: str, part_number: int, content: bytes) -> None:
+        """
+        Upload one part of a multi-part upload as a temporary blob.
+        
+        Args:
+            upload_id: Identifier of the upload session
+            part_number: 1-based part index
+            content: The part content as bytes
+        """
+        blob = self.bucket.blob(f".uploads/{upload_id}/{part_number:06d}")
+        await asyncio.to_thread(blob.upload_from_string, content)
+    
+    async def complete_upload(
+        self,
+        upload_id: str,
+        file_path: str,
+        part_count: int,
+        content_type: str = "application/octet-stream"
+    ) -> str:
+        """
+        Compose uploaded parts into the destination blob.
+        
+        Returns:
+            The GCS URI of the assembled file
+        """
+        blob_path = file_path.lstrip("/")
+        await asyncio.to_thread(self._compose_parts, upload_id, blob_path, part_count, content_type)
+        await self.abort_upload(upload_id)
+        return f"gs://{self.bucket_name}/{blob_path}"
+    
+    def _compose_parts(self, upload_id: str, blob_path: str, part_count: int, content_type: str) -> None:
+        sources = [
+            self.bucket.blob(f".uploads/{upload_id}/{n:06d}")
+            for n in range(1, part_count + 1)
+        ]
+        
+        # GCS composes at most 32 sources per call
+        level = 0
+        while len(sources) > 32:
+            merged = []
+            for i in range(0, len(sources), 32):
+                target = self.bucket.blob(f".uploads/{upload_id}/compose-{level}-{i // 32:06d}")
+                target.compose(sources[i:i + 32])
+                merged.append(target)
+            sources = merged
+            level += 1
+        
+        destination = self.bucket.blob(blob_path)
+        destination.content_type = content_type
+        destination.compose(sources)
+    
+    async def abort_upload(self, upload_id: str) -> None:
+        """Delete all temporary part blobs of an upload."""
+        await asyncio.to_thread(self._delete_parts, upload_id)
+    
+    def _delete_parts(self, upload_id: str) -> None:
+        for blob in self.client.list_blobs(self.bucket_name, prefix=f".uploads/{upload_id}/"):
+            blob.delete()
+    
     async def get_signed_url(
         self, 
         storage_uri: str, 
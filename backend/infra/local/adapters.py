@@ -10,7 +10,10 @@ Set CLOUD_PROVIDER=local to use these adapters.
 
 import os
 import json
+import shutil
+import threading
 import aiofiles
+from concurrent.futures import ThreadPoolExecutor
 from typing import Any, Dict, Optional
 from datetime import datetime
 import logging
@@ -22,6 +25,7 @@ from backend.infra.adapters.base import (
     CloudEmailBase,
     CloudMalwareScannerBase,
 )
+from backend.core.tasks import run_task
 
 logger = logging.getLogger(__name__)
 
@@ -57,6 +61,25 @@ class LocalFileStorageAdapter(CloudFileStorageBase):
         
         return full_path
     
+    async def _do_upload_file(
+        self,
+        file_path: str,
+        local_path: str,
+        content_type: str
+    ) -> str:
+        """Copy a local file into the upload directory in fixed-size blocks."""
+        safe_filename = os.path.basename(file_path)
+        full_path = os.path.join(self.upload_dir, safe_filename)
+        
+        async with aiofiles.open(local_path, 'rb') as src, aiofiles.open(full_path, 'wb') as dst:
+            while True:
+                block = await src.read(1024 * 1024)
+                if not block:
+                    break
+                await dst.write(block)
+        
+        return full_path
+    
     async def _do_download(self, storage_uri: str) -> bytes:
         """Read file from local path."""
         # Handle both full paths and relative paths
@@ -68,6 +91,20 @@ class LocalFileStorageAdapter(CloudFileStorageBase):
         async with aiofiles.open(file_path, 'rb') as f:
             return await f.read()
     
+    async def _do_download_to_file(self, storage_uri: str, local_path: str) -> None:
+        """Copy file from local path in fixed-size blocks."""
+        if os.path.isabs(storage_uri):
+            file_path = storage_uri
+        else:
+            file_path = os.path.join(self.upload_dir, os.path.basename(storage_uri))
+        
+        async with aiofiles.open(file_path, 'rb') as src, aiofiles.open(local_path, 'wb') as dst:
+            while True:
+                block = await src.read(1024 * 1024)
+                if not block:
+                    break
+                await dst.write(block)
+    
     async def _do_delete(self, storage_uri: str) -> bool:
         """Delete file from local storage."""
         try:
@@ -81,6 +118,43 @@ class LocalFileStorageAdapter(CloudFileStorageBase):
         except FileNotFoundError:
             return False
 
+    def _parts_dir(self, upload_id: str) -> str:
+        return os.path.join(self.upload_dir, ".parts", os.path.basename(upload_id))
+
+    async def _do_upload_part(self, upload_id: str, part_number: int, content: bytes) -> None:
+        """Write one part to the upload's staging directory."""
+        parts_dir = self._parts_dir(upload_id)
+        os.makedirs(parts_dir, exist_ok=True)
+        async with aiofiles.open(os.path.join(parts_dir, f"{part_number:06d}"), 'wb') as f:
+            await f.write(content)
+
+    async def _do_complete_upload(
+        self,
+        upload_id: str,
+        file_path: str,
+        part_count: int,
+        content_type: str
+    ) -> str:
+        """Concatenate staged parts into the destination file."""
+        parts_dir = self._parts_dir(upload_id)
+        full_path = os.path.join(self.upload_dir, os.path.basename(file_path))
+
+        async with aiofiles.open(full_path, 'wb') as out:
+            for part_number in range(1, part_count + 1):
+                async with aiofiles.open(os.path.join(parts_dir, f"{part_number:06d}"), 'rb') as part:
+                    while True:
+                        block = await part.read(1024 * 1024)
+                        if not block:
+                            break
+                        await out.write(block)
+
+        await self._do_abort_upload(upload_id)
+        return full_path
+
+    async def _do_abort_upload(self, upload_id: str) -> None:
+        """Remove the upload's staging directory."""
+        shutil.rmtree(self._parts_dir(upload_id), ignore_errors=True)
+
 
 class LocalEventBusAdapter(CloudEventBusBase):
     """
@@ -118,17 +192,23 @@ class LocalEventBusAdapter(CloudEventBusBase):
 
 class LocalTaskQueueAdapter(CloudTaskQueueBase):
     """
-    Local task queue adapter (console logging).
+    Local task queue adapter (in-process worker pool).
     
-    For development, just logs tasks to console.
-    Tasks are not actually executed - use Celery for real background processing.
+    Tasks run on a thread pool in the API process through the handlers
+    registered in backend.core.tasks, so enqueueing returns immediately.
+    Payloads are round-tripped through JSON like a real queue would.
+    Delayed tasks wait on a timer. Tasks are lost if the process exits.
     """
     
     provider = "local"
     
-    def __init__(self):
+    def __init__(self, workers: Optional[int] = None):
         super().__init__()
         self._task_counter = 0
+        self._executor = ThreadPoolExecutor(
+            max_workers=workers or int(os.getenv("LOCAL_TASK_WORKERS", "4")),
+            thread_name_prefix="local-task",
+        )
     
     async def _do_enqueue(
         self, 
@@ -136,14 +216,35 @@ class LocalTaskQueueAdapter(CloudTaskQueueBase):
         payload: Dict[str, Any], 
         deploy_at: Optional[datetime]
     ) -> str:
-        """Log task and return stub ID."""
+        """Submit the task to the worker pool and return its ID."""
         self._task_counter += 1
         task_id = f"local-task-{self._task_counter}"
+        payload = json.loads(json.dumps(payload, default=str))
         
         schedule_info = f" (scheduled: {deploy_at.isoformat()})" if deploy_at else ""
-        logger.info(f"[LocalTaskQueue] Enqueued {task_name}{schedule_info}: {json.dumps(payload, default=str)}")
+        logger.info(f"[LocalTaskQueue] Enqueued {task_name}{schedule_info}: {json.dumps(payload)}")
+        
+        delay = (deploy_at - datetime.utcnow()).total_seconds() if deploy_at else 0
+        if delay > 0:
+            timer = threading.Timer(delay, self._submit, (task_id, task_name, payload))
+            timer.daemon = True
+            timer.start()
+        else:
+            self._submit(task_id, task_name, payload)
         
         return task_id
+    
+    def _submit(self, task_id: str, task_name: str, payload: Dict[str, Any]) -> None:
+        self._executor.submit(self._run, task_id, task_name, payload)
+    
+    @staticmethod
+    def _run(task_id: str, task_name: str, payload: Dict[str, Any]) -> None:
+        """Run a task, logging failures (there is no retry locally)."""
+        try:
+            run_task(task_name, payload)
+            logger.info(f"[LocalTaskQueue] Completed {task_name} ({task_id})")
+        except Exception:
+            logger.exception(f"[LocalTaskQueue] Task {task_name} ({task_id}) failed")
 
 
 class LocalEmailAdapter(CloudEmailBase):
@@ -5,10 +5,14 @@ FastAPI application with cloud-agnostic infrastructure.
 Configuration is loaded from environment variables via apps.api.core.config.
 """
 
+import hmac
+import json
 import logging
+import os
 from contextlib import asynccontextmanager
 
-from fastapi import FastAPI
+from fastapi import FastAPI, HTTPException, Request
+from fastapi.concurrency import run_in_threadpool
 from fastapi.middleware.cors import CORSMiddleware
 from dotenv import load_dotenv
 
@@ -17,6 +21,7 @@ load_dotenv()
 
 from backend.core.config import settings
 from backend.core.database import Base, engine
+from backend.core.tasks import get_task_handler, run_task
 
 # Import routers
 from backend.modules.auth.router import router as auth_router
@@ -41,6 +46,9 @@ from backend.modules.registry.models import RegistryReview, RegistryQuery, Issua
 from backend.modules.generation.models import *  # noqa
 from backend.modules.subscription.models import Subscription, TierFeature  # noqa
 
+# Import task handlers so they are registered for the task queue
+import backend.modules.generation.tasks  # noqa
+
 
 # Configure logging
 logging.basicConfig(
@@ -119,4 +127,39 @@ def health_check():
     }
 
 
+@app.post("/tasks/{task_name}")
+async def receive_task(task_name: str, request: Request):
+    """
+    Receiver for tasks delivered by Cloud Tasks.
+    
+    Runs the registered handler with the JSON body as payload. A non-2xx
+    response makes Cloud Tasks retry the task. Requests must carry the
+    X-Task-Token header matching TASKS_AUTH_TOKEN; without a configured
+    token every request is refused. The local queue runs tasks in-process
+    and never calls this endpoint.
+    """
+    token = os.getenv("TASKS_AUTH_TOKEN")
+    if not token:
+        raise HTTPException(status_code=403, detail="Task receiver requires TASKS_AUTH_TOKEN")
+    if not hmac.compare_digest(request.headers.get("X-Task-Token", ""), token):
+        raise HTTPException(status_code=403, detail="Invalid task token")
+    
+    if get_task_handler(task_name) is None:
+        raise HTTPException(status_code=404, detail=f"Unknown task: {task_name}")
+    
+    body = await request.body()
+    try:
+        payload = json.loads(body) if body else {}
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Task payload must be JSON")
+    
+    try:
+        await run_in_threadpool(run_task, task_name, payload)
+    except Exception as e:
+        logger.exception(f"Task {task_name} failed")
+        raise HTTPException(status_code=500, detail=f"Task failed: {e}")
+    
+    return {"task": task_name, "status": "completed"}
+
+
 # Run with: uvicorn apps.api.main:app --reload
@@ -3,7 +3,12 @@ Grid Emission Factor Database
 Pre-loaded emission factors from official sources worldwide
 """
 
-from typing import Dict, Optional, List
+import os
+import threading
+import time
+from bisect import bisect_right
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional, List, Tuple
 from dataclasses import dataclass
 
 
@@ -21,6 +26,9 @@ class GridEFData:
     data_year: int = 2023
     region_code: Optional[str] = None
     region_name: Optional[str] = None
+    valid_from: Optional[datetime] = None
+    valid_until: Optional[datetime] = None
+    is_official: bool = True
 
 
 # Pre-loaded Grid Emission Factors from official sources
@@ -662,34 +670,324 @@ US_REGIONAL_GRID_EFS: Dict[str, GridEFData] = {
 }
 
 
-def get_grid_ef(country_code: str, region_code: Optional[str] = None) -> Optional[GridEFData]:
+# Seconds between checks of the factor table for changes; 0 disables the check
+GRID_EF_REFRESH_SECONDS = float(os.environ.get("GRID_EF_REFRESH_SECONDS", "60"))
+
+# Margin types held in the (country, region, year, margin) index
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+MARGIN_TYPES = ("combined_margin", "operating_margin", "build_margin", "weighted_average")
+
+GridKey = Tuple[str, Optional[str]]
+
+
+class GridEFStore:
+    """
+    In-memory index of grid emission factors.
+    
+    Merges the pre-loaded factors above with the active rows of the
+    GridEmissionFactor table. Each grid (country, optional region) keeps
+    its factors ordered by preference: newest data year first, table rows
+    before pre-loaded ones of the same year, most recently updated first.
+    Lookups never touch the database; at most once per
+    GRID_EF_REFRESH_SECONDS a cheap (count, max(updated_at)) query checks
+    whether the table changed, and the index is rebuilt and swapped in
+    when it did.
+    
+    Usage:
+        ef = grid_ef_store.lookup("IN")
+        ef = grid_ef_store.lookup("US", "WECC", as_of=datetime(2021, 6, 1))
+        om = grid_ef_store.factor("IN", year=2024, margin="operating_margin")
+    """
+    
+    def __init__(self, refresh_seconds: float = GRID_EF_REFRESH_SECONDS):
+        self.refresh_seconds = refresh_seconds
+        self.version = 0
+        self._lock = threading.Lock()
+        self._records: Dict[GridKey, List[GridEFData]] = {}
+        self._index: Dict[Tuple[str, Optional[str], int, str], float] = {}
+        self._stamp: Optional[Tuple[Any, ...]] = None
+        self._checked_at = 0.0
+        self._loaded = False
+        # Validity window edges; passing one changes which factors are current
+        self._transitions: List[datetime] = []
+        self._next_transition: Optional[datetime] = None
+    
+    def lookup(
+        self,
+        country_code: str,
+        region_code: Optional[str] = None,
+        as_of: Optional[datetime] = None
+    ) -> Optional[GridEFData]:
+        """
+        Preferred factor for a grid at a point in time.
+        
+        Regions without factors of their own fall back to the national grid.
+        
+        Args:
+            country_code: ISO 3166-1 alpha-2 country code
+            region_code: Optional region code for sub-national grids
+            as_of: Date the factor must be valid on (default: now)
+        
+        Returns:
+            GridEFData or None if no factor is valid
+        """
+        self._ensure_current()
+        as_of = as_of or datetime.utcnow()
+        for key in self._keys(country_code, region_code):
+            for record in self._records.get(key, ()):
+                if (record.valid_from is None or record.valid_from <= as_of) and (
+                    record.valid_until is None or as_of <= record.valid_until
+                ):
+                    return record
+        return None
+    
+    def factor(
+        self,
+        country_code: str,
+        region_code: Optional[str] = None,
+        year: Optional[int] = None,
+        margin: str = "combined_margin"
+    ) -> Optional[float]:
+        """
+        One margin of a grid's factor for a data year.
+        
+        Args:
+            country_code: ISO 3166-1 alpha-2 country code
+            region_code: Optional region code for sub-national grids
+            year: Data year (default: the currently valid factor)
+            margin: One of MARGIN_TYPES
+        
+        Returns:
+            Factor in tCO2/MWh, or None if not published
+        """
+        if margin not in MARGIN_TYPES:
+            raise ValueError(f"Unknown margin type: {margin}")
+        if year is None:
+            record = self.lookup(country_code, region_code)
+            return getattr(record, margin) if record else None
+        
+        self._ensure_current()
+        for country, region in self._keys(country_code, region_code):
+            value = self._index.get((country, region, year, margin))
+            if value is not None:
+                return value
+        return None
+    
+    def grids(self) -> List[GridEFData]:
+        """Currently valid factor of every grid; national grids keep their pre-loaded order."""
+        self._ensure_current()
+        now = datetime.utcnow()
+        current = (self.lookup(country, region, now) for country, region in list(self._records))
+        return [record for record in current if record is not None]
+    
+    def current_version(self) -> int:
+        """
+        Index version after any pending refresh.
+        
+        Changes whenever the factors change or a validity window opens or
+        closes, so it can key caches of anything derived from current factors.
+        """
+        self._ensure_current()
+        return self.version
+    
+    def next_transition(self) -> Optional[datetime]:
+        """
+        Next instant a validity window opens or closes, or None.
+        
+        Caches of current factors key on it as well as current_version(),
+        so they turn over as soon as a window boundary passes.
+        """
+        self._ensure_current()
+        return self._next_transition
+    
+    def reload(self) -> None:
+        """Rebuild the index from the pre-loaded factors and the table."""
+        with self._lock:
+            rows, stamp = self._load_rows()
+            self._build(rows)
+            self._stamp = stamp
+            self._checked_at = time.monotonic()
+            self._loaded = True
+            self.version += 1
+    
+    def _ensure_current(self) -> None:
+        if not self._loaded:
+            self.reload()
+            return
+        if self._next_transition is not None and datetime.utcnow() >= self._next_transition:
+            self.version += 1
+            self._next_transition = self._transition_after(datetime.utcnow())
+        if self.refresh_seconds <= 0 or time.monotonic() - self._checked_at < self.refresh_seconds:
+            return
+        
+        self._checked_at = time.monotonic()
+        if self._table_stamp() != self._stamp:
+            self.reload()
+    
+    @staticmethod
+    def _keys(country_code: str, region_code: Optional[str]) -> List[GridKey]:
+        country = country_code.upper()
+        if region_code:
+            return [(country, region_code.upper()), (country, None)]
+        return [(country, None)]
+    
+    def _build(self, rows: List[Tuple[GridEFData, datetime]]) -> None:
+        # Pre-loaded factors rank after table rows of the same year
+        ranked = [(ef, 0, datetime.min) for ef in list(GRID_EMISSION_FACTORS.values()) + list(US_REGIONAL_GRID_EFS.values())]
+        ranked += [(ef, 1, updated_at or datetime.min) for ef, updated_at in rows]
+        
+        records: Dict[GridKey, List[Tuple[GridEFData, int, datetime]]] = {}
+        for entry in ranked:
+            ef = entry[0]
+            records.setdefault((ef.country_code.upper(), ef.region_code.upper() if ef.region_code else None), []).append(entry)
+        
+        index: Dict[Tuple[str, Optional[str], int, str], float] = {}
+        for key, entries in records.items():
+            entries.sort(key=lambda e: (e[0].data_year, e[1], e[2]), reverse=True)
+            for ef, _, _ in entries:
+                for margin in MARGIN_TYPES:
+                    value = getattr(ef, margin)
+                    if value is not None:
+                        index.setdefault((key[0], key[1], ef.data_year, margin), value)
+        
+        # Swap whole structures so concurrent lookups see one version or the other
+        self._records = {key: [e[0] for e in entries] for key, entries in records.items()}
+        self._index = index
+        # valid_until is inclusive, so a factor drops out just after it
+        self._transitions = sorted(
+            {ef.valid_from for ef, _, _ in ranked if ef.valid_from is not None}
+            | {ef.valid_until + ONE_MICROSECOND for ef, _, _ in ranked if ef.valid_until is not None}
+        )
+        self._next_transition = self._transition_after(datetime.utcnow())
+    
+    def _transition_after(self, now: datetime) -> Optional[datetime]:
+        i = bisect_right(self._transitions, now)
+        return self._transitions[i] if i < len(self._transitions) else None
+    
+    def _table_stamp(self) -> Optional[Tuple[Any, ...]]:
+        try:
+            from backend.core.database import SessionLocal
+            
+            db = SessionLocal()
+            try:
+                return _query_stamp(db)
+            finally:
+                db.close()
+        except Exception:
+            # Table unreachable: keep serving the factors already indexed
+            return self._stamp
+    
+    def _load_rows(self) -> Tuple[List[Tuple[GridEFData, datetime]], Optional[Tuple[Any, ...]]]:
+        try:
+            from backend.core.database import SessionLocal
+            from .models import GridEmissionFactor
+            
+            db = SessionLocal()
+            try:
+                stamp = _query_stamp(db)
+                rows = db.query(GridEmissionFactor).filter(GridEmissionFactor.is_active.isnot(False)).all()
+                return [(_grid_ef_from_row(row), row.updated_at) for row in rows if row.combined_margin is not None], stamp
+            finally:
+                db.close()
+        except Exception:
+            # No table (fresh database, worker without DB access): pre-loaded factors only
+            return [], None
+
+
+def _query_stamp(db: Any) -> Tuple[Any, ...]:
+    """Row count and last update of the factor table; changes whenever rows do."""
+    from sqlalchemy import func
+    from .models import GridEmissionFactor
+    
+    return tuple(db.query(func.count(GridEmissionFactor.id), func.max(GridEmissionFactor.updated_at)).one())
+
+
+def _grid_ef_from_row(row: Any) -> GridEFData:
+    """GridEFData from a GridEmissionFactor row."""
+    def number(value: Any) -> Optional[float]:
+        return float(value) if value is not None else None
+    
+    return GridEFData(
+        country_code=row.country_code.upper(),
+        country_name=row.country_name,
+        combined_margin=float(row.combined_margin),
+        operating_margin=number(row.operating_margin),
+        build_margin=number(row.build_margin),
+        weighted_average=number(row.average_ef),
+        source_name=row.source_name,
+        source_url=row.source_url,
+        data_year=row.data_year,
+        region_code=row.region_code.upper() if row.region_code else None,
+        region_name=row.region_name,
+        valid_from=row.valid_from,
+        valid_until=row.valid_until,
+        is_official=bool(row.is_official),
+    )
+
+
+grid_ef_store = GridEFStore()
+
+
+def add_grid_ef(db: Any, values: Dict[str, Any]) -> GridEFData:
+    """
+    Store a new grid emission factor and reindex.
+    
+    Other processes pick the factor up on their next table check.
+    
+    Args:
+        db: Database session
+        values: GridEmissionFactor fields; "weighted_average" maps to average_ef
+    
+    Returns:
+        The stored factor
+    """
+    from .models import GridEmissionFactor
+    
+    values = dict(values)
+    if values.get("valid_from") and values.get("valid_until") and values["valid_until"] < values["valid_from"]:
+        raise ValueError("valid_until must not be before valid_from")
+    values["country_code"] = values["country_code"].upper()
+    if values.get("region_code"):
+        values["region_code"] = values["region_code"].upper()
+    values["average_ef"] = values.pop("weighted_average", None)
+    
+    row = GridEmissionFactor(**values)
+    db.add(row)
+    db.commit()
+    db.refresh(row)
+    grid_ef_store.reload()
+    return _grid_ef_from_row(row)
+
+
+def get_grid_ef(
+    country_code: str,
+    region_code: Optional[str] = None,
+    as_of: Optional[datetime] = None
+) -> Optional[GridEFData]:
     """
     Get grid emission factor for a country/region
     
     Args:
         country_code: ISO 3166-1 alpha-2 country code
         region_code: Optional region code for sub-national grids
+        as_of: Date the factor must be valid on (default: now)
     
     Returns:
         GridEFData or None if not found
     """
-    if region_code and country_code == "US":
-        key = f"US_{region_code}"
-        return US_REGIONAL_GRID_EFS.get(key)
-    
-    return GRID_EMISSION_FACTORS.get(country_code.upper())
+    return grid_ef_store.lookup(country_code, region_code, as_of)
 
 
 def get_all_grid_efs() -> List[GridEFData]:
     """Get all grid emission factors"""
-    all_efs = list(GRID_EMISSION_FACTORS.values())
-    all_efs.extend(US_REGIONAL_GRID_EFS.values())
-    return all_efs
+    return grid_ef_store.grids()
 
 
 def get_countries_list() -> List[Dict[str, str]]:
     """Get list of countries with EF data for dropdown"""
     return [
         {"code": ef.country_code, "name": ef.country_name}
-        for ef in GRID_EMISSION_FACTORS.values()
+        for ef in grid_ef_store.grids()
+        if not ef.region_code
     ]
@@ -1,7 +1,7 @@
 # Methodology Library
 # Plugin system for carbon credit calculation methodologies
 
-from .base import BaseMethodology
+from .base import BaseMethodology, KernelResult
 from .registry import MethodologyRegistry
 from .cdm_ams_id import CDM_AMS_ID
 from .cdm_acm0002 import CDM_ACM0002
@@ -10,8 +10,12 @@ from .verra_am0123 import VERRA_AM0123
 from .gcc_gccm001 import GCC_GCCM001
 from .gold_standard import GoldStandard_RE
 
+# Build the shared instances and lookup indexes once, at import
+MethodologyRegistry._ensure_initialized()
+
 __all__ = [
     "BaseMethodology",
+    "KernelResult",
     "MethodologyRegistry",
     "CDM_AMS_ID",
     "CDM_ACM0002", 
@@ -3,9 +3,15 @@ Base Methodology Class
 Abstract interface for all carbon credit calculation methodologies
 """
 from abc import ABC, abstractmethod
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Union
 from dataclasses import dataclass, field
 
+import numpy as np
+
+
+# A kernel column: one value per scenario, or a scalar shared by all scenarios
+KernelColumn = Union[float, str, np.ndarray, List[Any]]
+
 
 @dataclass
 class MethodologyResult:
@@ -21,6 +27,15 @@ class MethodologyResult:
     registry: str = ""
 
 
+@dataclass
+class KernelResult:
+    """Column-wise result of a vectorized methodology kernel (one element per scenario)"""
+    baseline_emissions_tco2e: np.ndarray
+    project_emissions_tco2e: np.ndarray
+    leakage_tco2e: np.ndarray
+    total_er_tco2e: np.ndarray
+
+
 class BaseMethodology(ABC):
     """
     Abstract base class for carbon credit calculation methodologies.
@@ -93,6 +108,63 @@ class BaseMethodology(ABC):
         """
         pass
     
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized emission reductions for many scenarios at once (optional).
+        
+        Takes the same input names as compute_emission_reductions, but each
+        may be an array (one value per scenario) or a scalar broadcast to
+        all scenarios. Per-scenario dict building and validation are skipped;
+        only cheap whole-column checks run. Results are not rounded.
+        
+        Args:
+            columns: Input columns, e.g. {"generation_mwh": draws, "ef_grid": 0.757}
+            
+        Returns:
+            KernelResult with baseline, project, leakage and ER columns
+            
+        Raises:
+            NotImplementedError: If the methodology has no kernel
+            ValueError: If a column is missing or out of range
+        """
+        raise NotImplementedError(f"Methodology {self.id} has no vectorized kernel")
+    
+    @property
+    def has_kernel(self) -> bool:
+        """Whether the methodology implements compute_kernel."""
+        return type(self).compute_kernel is not BaseMethodology.compute_kernel
+    
+    @staticmethod
+    def _kernel_column(
+        columns: Dict[str, KernelColumn],
+        name: str,
+        default: Optional[float] = None,
+        non_negative: bool = False
+    ) -> np.ndarray:
+        """Fetch a numeric kernel column as a float array."""
+        value = columns.get(name, default)
+        if value is None:
+            raise ValueError(f"{name} is required")
+        array = np.asarray(value, dtype=np.float64)
+        if non_negative and (array < 0).any():
+            raise ValueError(f"{name} must be non-negative")
+        return array
+    
+    @staticmethod
+    def _kernel_result(baseline, project, leakage) -> KernelResult:
+        """Broadcast the emission components to a common shape and derive ER."""
+        baseline, project, leakage = np.broadcast_arrays(
+            np.asarray(baseline, dtype=np.float64),
+            np.asarray(project, dtype=np.float64),
+            np.asarray(leakage, dtype=np.float64),
+        )
+        return KernelResult(
+            baseline_emissions_tco2e=baseline,
+            project_emissions_tco2e=project,
+            leakage_tco2e=leakage,
+            total_er_tco2e=baseline - project - leakage,
+        )
+    
     def check_eligibility(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Check if project is eligible for this methodology.
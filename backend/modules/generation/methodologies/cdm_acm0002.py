@@ -6,7 +6,10 @@ Applicable to renewable energy projects > 15 MW supplying electricity to the gri
 Reference: https://cdm.unfccc.int/methodologies/DB/N8QWQBT0TP7HQV8W6YWSWGEO4FTRDT
 """
 from typing import Dict, List, Any
-from .base import BaseMethodology, MethodologyResult
+
+import numpy as np
+
+from .base import BaseMethodology, KernelColumn, KernelResult, MethodologyResult
 from .registry import MethodologyRegistry
 
 
@@ -185,6 +188,23 @@ class CDM_ACM0002(BaseMethodology):
             registry=self.registry,
         )
     
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized ACM0002: ER = EG × EF_grid - PE, with PE from auxiliary
+        grid power and fossil fuel consumption (LE = 0).
+        """
+        generation_mwh = self._kernel_column(columns, "generation_mwh", non_negative=True)
+        ef_grid = self._kernel_column(columns, "ef_grid", non_negative=True)
+        auxiliary_mwh = self._kernel_column(columns, "auxiliary_power_mwh", 0.0)
+        fossil_gj = self._kernel_column(columns, "fossil_fuel_consumption_gj", 0.0)
+        ef_fossil = self._kernel_column(columns, "ef_fossil_fuel", 0.074)
+        
+        project_emissions = (
+            np.where(auxiliary_mwh > 0, auxiliary_mwh * ef_grid, 0.0)
+            + np.where(fossil_gj > 0, fossil_gj * ef_fossil, 0.0)
+        )
+        return self._kernel_result(generation_mwh * ef_grid, project_emissions, 0.0)
+    
     def _calculate_project_emissions(self, inputs: Dict[str, Any]) -> float:
         """
         Calculate project emissions from auxiliary consumption and fossil fuels.
@@ -6,7 +6,7 @@ Applicable to renewable energy projects ≤ 15 MW supplying electricity to the g
 Reference: https://cdm.unfccc.int/methodologies/DB/GNFWB3Y5IZGG3SHZTJYF8OPHXOGW3U
 """
 from typing import Dict, List, Any
-from .base import BaseMethodology, MethodologyResult
+from .base import BaseMethodology, KernelColumn, KernelResult, MethodologyResult
 from .registry import MethodologyRegistry
 
 
@@ -169,3 +169,11 @@ class CDM_AMS_ID(BaseMethodology):
             methodology_id=self.id,
             registry=self.registry,
         )
+    
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized AMS-I.D: ER = EG × EF_grid (PE = LE = 0).
+        """
+        generation_mwh = self._kernel_column(columns, "generation_mwh", non_negative=True)
+        ef_grid = self._kernel_column(columns, "ef_grid", non_negative=True)
+        return self._kernel_result(generation_mwh * ef_grid, 0.0, 0.0)
@@ -6,7 +6,10 @@ Applicable to biogas projects recovering methane from livestock manure.
 Reference: https://cdm.unfccc.int/methodologies/DB/
 """
 from typing import Dict, List, Any
-from .base import BaseMethodology, MethodologyResult
+
+import numpy as np
+
+from .base import BaseMethodology, KernelColumn, KernelResult, MethodologyResult
 from .registry import MethodologyRegistry
 
 
@@ -185,6 +188,26 @@ class CDM_AMS_III_D(BaseMethodology):
             registry=self.registry,
         )
     
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized AMS-III.D: BE = CH4_captured × GWP_CH4, PE from physical
+        leakage and (when flared) flaring inefficiency (LE = 0).
+        """
+        biogas_m3 = self._kernel_column(columns, "biogas_captured_m3", non_negative=True)
+        ch4_fraction = self._kernel_column(columns, "methane_fraction", 0.60)
+        leakage_fraction = self._kernel_column(columns, "physical_leakage_fraction", 0.05)
+        flare_efficiency = self._kernel_column(columns, "flare_efficiency", 0.98)
+        flared = np.isin(np.asarray(columns.get("biogas_utilization", "flared")), ["flared", "combined"])
+        
+        ch4_captured_tonnes = biogas_m3 * ch4_fraction * self.CH4_DENSITY
+        baseline_emissions = ch4_captured_tonnes * self.GWP_CH4
+        project_emissions = ch4_captured_tonnes * leakage_fraction * self.GWP_CH4 + np.where(
+            flared,
+            ch4_captured_tonnes * (1 - leakage_fraction) * (1 - flare_efficiency) * self.GWP_CH4,
+            0.0,
+        )
+        return self._kernel_result(baseline_emissions, project_emissions, 0.0)
+    
     def _calculate_project_emissions(
         self, 
         inputs: Dict[str, Any],
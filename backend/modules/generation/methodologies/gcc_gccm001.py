@@ -6,7 +6,7 @@ Global Carbon Council methodology for grid-connected renewable energy.
 Reference: https://globalcarboncouncil.com/gcc-methodologies/
 """
 from typing import Dict, List, Any
-from .base import BaseMethodology, MethodologyResult
+from .base import BaseMethodology, KernelColumn, KernelResult, MethodologyResult
 from .registry import MethodologyRegistry
 
 
@@ -183,3 +183,12 @@ class GCC_GCCM001(BaseMethodology):
             methodology_id=self.id,
             registry=self.registry,
         )
+    
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized GCCM001: ER = EG × EF_grid - on-site consumption × EF_grid (LE = 0).
+        """
+        generation_mwh = self._kernel_column(columns, "generation_mwh", non_negative=True)
+        ef_grid = self._kernel_column(columns, "ef_grid", non_negative=True)
+        onsite_mwh = self._kernel_column(columns, "onsite_power_consumption_mwh", 0.0)
+        return self._kernel_result(generation_mwh * ef_grid, onsite_mwh * ef_grid, 0.0)
@@ -6,7 +6,10 @@ Gold Standard wrapper that uses CDM methodologies with additional SDG requiremen
 Reference: https://globalgoals.goldstandard.org/standards/
 """
 from typing import Dict, List, Any
-from .base import BaseMethodology, MethodologyResult
+
+import numpy as np
+
+from .base import BaseMethodology, KernelColumn, KernelResult, MethodologyResult
 from .registry import MethodologyRegistry
 from .cdm_ams_id import CDM_AMS_ID
 from .cdm_acm0002 import CDM_ACM0002
@@ -169,6 +172,27 @@ class GoldStandard_RE(BaseMethodology):
         
         return result
     
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized Gold Standard: each scenario runs the AMS-I.D kernel up to
+        15 MW and the ACM0002 kernel above, with the same inputs the scalar
+        path passes to the underlying CDM methodology.
+        """
+        capacity_mw = self._kernel_column(columns, "capacity_mw", 0.0)
+        cdm_columns = {
+            "generation_mwh": columns.get("generation_mwh"),
+            "ef_grid": columns.get("ef_grid"),
+        }
+        small = MethodologyRegistry.get(CDM_AMS_ID.id).compute_kernel(cdm_columns)
+        large = MethodologyRegistry.get(CDM_ACM0002.id).compute_kernel(cdm_columns)
+        
+        small_scale = capacity_mw <= 15
+        return self._kernel_result(
+            np.where(small_scale, small.baseline_emissions_tco2e, large.baseline_emissions_tco2e),
+            np.where(small_scale, small.project_emissions_tco2e, large.project_emissions_tco2e),
+            np.where(small_scale, small.leakage_tco2e, large.leakage_tco2e),
+        )
+    
     def check_eligibility(self, inputs: Dict[str, Any]) -> Dict[str, Any]:
         """
         Check Gold Standard eligibility including SDG requirements.
@@ -2,7 +2,9 @@
 Methodology Registry
 Central registry for all available carbon credit methodologies
 """
-from typing import Dict, List, Type, Optional
+from bisect import bisect_left
+from typing import Any, Dict, FrozenSet, List, Optional, Tuple, Type
+
 from .base import BaseMethodology
 
 
@@ -16,7 +18,7 @@ class MethodologyRegistry:
         class MyMethodology(BaseMethodology):
             ...
         
-        # Get a methodology instance
+        # Get the shared methodology instance
         methodology = MethodologyRegistry.get("MY_METHODOLOGY_ID")
         
         # List methodologies for a project type
@@ -26,6 +28,15 @@ class MethodologyRegistry:
     _methodologies: Dict[str, Type[BaseMethodology]] = {}
     _initialized: bool = False
     
+    # Built once by _build_indexes(); methodology instances are stateless
+    _instances: Dict[str, BaseMethodology] = {}
+    _info: Dict[str, Dict[str, Any]] = {}
+    _by_project_type: Dict[str, Tuple[str, ...]] = {}
+    _by_registry: Dict[str, Tuple[str, ...]] = {}
+    _capacity_breakpoints: List[float] = []
+    _capacity_at_point: List[FrozenSet[str]] = []
+    _capacity_between: List[FrozenSet[str]] = []
+    
     @classmethod
     def register(cls, methodology_class: Type[BaseMethodology]) -> Type[BaseMethodology]:
         """
@@ -41,12 +52,14 @@ class MethodologyRegistry:
             raise ValueError(f"Methodology class {methodology_class.__name__} must have an 'id' attribute")
         
         cls._methodologies[methodology_class.id] = methodology_class
+        if cls._initialized:
+            cls._build_indexes()
         return methodology_class
     
     @classmethod
     def get(cls, methodology_id: str) -> BaseMethodology:
         """
-        Get an instance of a registered methodology.
+        Get the shared instance of a registered methodology.
         
         Args:
             methodology_id: Unique identifier of the methodology
@@ -59,14 +72,15 @@ class MethodologyRegistry:
         """
         cls._ensure_initialized()
         
-        if methodology_id not in cls._methodologies:
+        instance = cls._instances.get(methodology_id)
+        if instance is None:
             available = ", ".join(cls._methodologies.keys())
             raise ValueError(
                 f"Unknown methodology: {methodology_id}. "
                 f"Available: {available}"
             )
         
-        return cls._methodologies[methodology_id]()
+        return instance
     
     @classmethod
     def list_all(cls) -> List[Dict]:
@@ -77,11 +91,7 @@ class MethodologyRegistry:
             List of methodology info dictionaries
         """
         cls._ensure_initialized()
-        
-        return [
-            cls._methodologies[m_id]().get_info()
-            for m_id in sorted(cls._methodologies.keys())
-        ]
+        return [dict(cls._info[m_id]) for m_id in sorted(cls._info)]
     
     @classmethod
     def list_for_project_type(cls, project_type: str) -> List[Dict]:
@@ -95,14 +105,7 @@ class MethodologyRegistry:
             List of applicable methodology info dictionaries
         """
         cls._ensure_initialized()
-        
-        result = []
-        for m_id, m_class in cls._methodologies.items():
-            instance = m_class()
-            if project_type.lower() in [t.lower() for t in instance.applicable_project_types]:
-                result.append(instance.get_info())
-        
-        return result
+        return [dict(cls._info[m_id]) for m_id in cls._by_project_type.get(project_type.lower(), ())]
     
     @classmethod
     def list_for_registry(cls, registry: str) -> List[Dict]:
@@ -116,14 +119,34 @@ class MethodologyRegistry:
             List of methodology info dictionaries for that registry
         """
         cls._ensure_initialized()
+        return [dict(cls._info[m_id]) for m_id in cls._by_registry.get(registry.upper(), ())]
+    
+    @classmethod
+    def ids_for_project_type(cls, project_type: str) -> Tuple[str, ...]:
+        """IDs of methodologies applicable to a project type, in registration order."""
+        cls._ensure_initialized()
+        return cls._by_project_type.get(project_type.lower(), ())
+    
+    @classmethod
+    def ids_for_registry(cls, registry: str) -> Tuple[str, ...]:
+        """IDs of methodologies of a registry, in registration order."""
+        cls._ensure_initialized()
+        return cls._by_registry.get(registry.upper(), ())
+    
+    @classmethod
+    def ids_for_capacity(cls, capacity_mw: float) -> FrozenSet[str]:
+        """
+        IDs of methodologies whose capacity limits admit a project size.
         
-        result = []
-        for m_id, m_class in cls._methodologies.items():
-            instance = m_class()
-            if instance.registry.upper() == registry.upper():
-                result.append(instance.get_info())
-        
-        return result
+        Limits are inclusive (min_capacity_mw <= capacity <= max_capacity_mw).
+        The answer is precomputed for every interval between limits, so the
+        lookup is one binary search.
+        """
+        cls._ensure_initialized()
+        i = bisect_left(cls._capacity_breakpoints, capacity_mw)
+        if i < len(cls._capacity_breakpoints) and cls._capacity_breakpoints[i] == capacity_mw:
+            return cls._capacity_at_point[i]
+        return cls._capacity_between[i]
     
     @classmethod
     def get_ids(cls) -> List[str]:
@@ -142,4 +165,50 @@ class MethodologyRegistry:
             from . import verra_am0123
             from . import gcc_gccm001
             from . import gold_standard
+            cls._build_indexes()
             cls._initialized = True
+    
+    @classmethod
+    def _build_indexes(cls):
+        """Instantiate each methodology once and precompute the lookup indexes."""
+        instances = {m_id: m_class() for m_id, m_class in cls._methodologies.items()}
+        
+        by_type: Dict[str, List[str]] = {}
+        by_registry: Dict[str, List[str]] = {}
+        for m_id, instance in instances.items():
+            for project_type in instance.applicable_project_types:
+                ids = by_type.setdefault(project_type.lower(), [])
+                if m_id not in ids:
+                    ids.append(m_id)
+            by_registry.setdefault(instance.registry.upper(), []).append(m_id)
+        
+        def admits(instance: BaseMethodology, capacity: float) -> bool:
+            return (
+                (instance.min_capacity_mw is None or capacity >= instance.min_capacity_mw)
+                and (instance.max_capacity_mw is None or capacity <= instance.max_capacity_mw)
+            )
+        
+        breakpoints = sorted({
+            limit
+            for instance in instances.values()
+            for limit in (instance.min_capacity_mw, instance.max_capacity_mw)
+            if limit is not None
+        })
+        # A probe strictly inside each open interval (and beyond both ends)
+        probes = (
+            [breakpoints[0] - 1 if breakpoints else 0.0]
+            + [(a + b) / 2 for a, b in zip(breakpoints, breakpoints[1:])]
+            + ([breakpoints[-1] + 1] if breakpoints else [])
+        )
+        
+        cls._instances = instances
+        cls._info = {m_id: instance.get_info() for m_id, instance in instances.items()}
+        cls._by_project_type = {t: tuple(ids) for t, ids in by_type.items()}
+        cls._by_registry = {r: tuple(ids) for r, ids in by_registry.items()}
+        cls._capacity_breakpoints = breakpoints
+        cls._capacity_at_point = [
+            frozenset(m_id for m_id, inst in instances.items() if admits(inst, b)) for b in breakpoints
+        ]
+        cls._capacity_between = [
+            frozenset(m_id for m_id, inst in instances.items() if admits(inst, p)) for p in probes
+        ]
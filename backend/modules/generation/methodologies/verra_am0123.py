@@ -6,7 +6,7 @@ Applicable to renewable energy projects supplying electricity to captive consume
 Reference: https://verra.org/methodologies/am0123-renewable-energy-generation-for-captive-use-v1-0/
 """
 from typing import Dict, List, Any
-from .base import BaseMethodology, MethodologyResult
+from .base import BaseMethodology, KernelColumn, KernelResult, MethodologyResult
 from .registry import MethodologyRegistry
 
 
@@ -168,3 +168,18 @@ class VERRA_AM0123(BaseMethodology):
             methodology_id=self.id,
             registry=self.registry,
         )
+    
+    def compute_kernel(self, columns: Dict[str, KernelColumn]) -> KernelResult:
+        """
+        Vectorized AM0123: ER = EG_captive × (1 - wheeling losses) × EF_baseline
+        (PE = LE = 0). Captive generation and baseline EF default to the
+        generation and grid EF columns.
+        """
+        captive_mwh = self._kernel_column(
+            columns, "captive_generation_mwh", columns.get("generation_mwh"), non_negative=True
+        )
+        ef_baseline = self._kernel_column(columns, "ef_baseline", columns.get("ef_grid"), non_negative=True)
+        wheeling_losses = self._kernel_column(columns, "wheeling_losses_percent", 0.0) / 100
+        
+        baseline_emissions = captive_mwh * (1 - wheeling_losses) * ef_baseline
+        return self._kernel_result(baseline_emissions, 0.0, 0.0)
@@ -1,7 +1,7 @@
 """
 Database models for Generation Data module
 """
-from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Text, Numeric, Boolean, JSON
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, ForeignKey, Text, Numeric, Boolean, JSON, UniqueConstraint
 from sqlalchemy.orm import relationship
 from datetime import datetime
 from backend.core.database import Base
@@ -23,8 +23,10 @@ class UploadedFile(Base):
     detected_columns = Column(JSON)  # [{name, type, sample_values}]
     uploaded_by = Column(Integer, ForeignKey("users.id"))
     uploaded_at = Column(DateTime, default=datetime.utcnow)
-    status = Column(String(20), default="pending")  # pending, parsed, mapped, processed, error
+    status = Column(String(20), default="pending")  # pending, parsed, mapped, processing, processed, error
     error_message = Column(Text)
+    rows_processed = Column(Integer, default=0)  # File rows read so far (progress against row_count)
+    processing_stats = Column(JSON)  # {rows_per_second, rows_written, batches, started_at, ...}
 
     # Relationships
     project = relationship("Project", backref="uploaded_files")
@@ -32,6 +34,24 @@ class UploadedFile(Base):
     timeseries = relationship("GenerationTimeseries", back_populates="file")
 
 
+class UploadSession(Base):
+    """Tracks a chunked, resumable upload until it is finalized into an UploadedFile"""
+    __tablename__ = "upload_sessions"
+
+    id = Column(String(32), primary_key=True)  # Opaque upload ID (uuid4 hex)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
+    original_filename = Column(String(255), nullable=False)
+    mime_type = Column(String(100), nullable=False)
+    total_bytes = Column(BigInteger)  # Declared by the client, optional
+    received_bytes = Column(BigInteger, default=0, nullable=False)
+    part_count = Column(Integer, default=0, nullable=False)
+    status = Column(String(20), default="open")  # open, completed, aborted, expired
+    file_id = Column(Integer, ForeignKey("uploaded_files.id"))  # Set on finalize
+    uploaded_by = Column(Integer, ForeignKey("users.id"))
+    created_at = Column(DateTime, default=datetime.utcnow)
+    updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
+
+
 class DatasetMapping(Base):
     """Stores user-defined column mapping configuration"""
     __tablename__ = "dataset_mappings"
@@ -45,6 +65,7 @@ class DatasetMapping(Base):
     value_semantics = Column(String(20), nullable=False)  # POWER or ENERGY_PER_INTERVAL
     frequency_seconds = Column(Integer, nullable=False)  # 3600 for hourly, 86400 for daily
     timezone = Column(String(50), default="UTC")
+    sheet_name = Column(String(100))  # Excel worksheet; NULL means the active sheet
     start_row = Column(Integer, default=1)  # Skip header rows
     missing_value_treatment = Column(String(20), default="interpolate")
     parse_warnings = Column(JSON, default=[])
@@ -57,6 +78,10 @@ class DatasetMapping(Base):
 class GenerationTimeseries(Base):
     """Canonical time-series storage (standardized to MWh)"""
     __tablename__ = "generation_timeseries"
+    __table_args__ = (
+        # One reading per project and interval; bulk writes upsert on this key
+        UniqueConstraint('project_id', 'ts_utc', name='uq_generation_timeseries_project_ts'),
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False)
@@ -74,6 +99,54 @@ class GenerationTimeseries(Base):
     file = relationship("UploadedFile", back_populates="timeseries")
 
 
+class GenerationArchive(Base):
+    """Columnar (Parquet) copy of one project-year of canonical time-series"""
+    __tablename__ = "generation_archives"
+    __table_args__ = (
+        UniqueConstraint('project_id', 'year', name='uq_generation_archive_project_year'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    year = Column(Integer, nullable=False)
+    storage_uri = Column(Text, nullable=False)  # Held through FileStoragePort
+    row_count = Column(Integer, nullable=False)
+    size_bytes = Column(BigInteger)
+    ts_min = Column(DateTime)
+    ts_max = Column(DateTime)
+    is_stale = Column(Boolean, default=False)  # Set when the project's rows change
+    built_at = Column(DateTime, default=datetime.utcnow)
+    last_error = Column(Text)  # Why the last rebuild failed; cleared by a successful one
+    failed_at = Column(DateTime)
+
+
+class GenerationMonth(Base):
+    """Calendar month of a project's time-series and when its rows last changed"""
+    __tablename__ = "generation_months"
+    __table_args__ = (
+        UniqueConstraint('project_id', 'month', name='uq_generation_month_project_month'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    month = Column(String(7), nullable=False)  # YYYY-MM (UTC)
+    changed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
+class EstimationMonthAggregate(Base):
+    """Per-month generation total reused by every credit estimation of a project"""
+    __tablename__ = "estimation_month_aggregates"
+    __table_args__ = (
+        UniqueConstraint('project_id', 'month', name='uq_estimation_month_aggregate'),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    project_id = Column(Integer, ForeignKey("projects.id", ondelete="CASCADE"), nullable=False, index=True)
+    month = Column(String(7), nullable=False)  # YYYY-MM (UTC)
+    generation_mwh = Column(Numeric(16, 6), nullable=False)
+    computed_at = Column(DateTime, default=datetime.utcnow, nullable=False)
+
+
 class CreditEstimation(Base):
     """Stores results of credit calculations"""
     __tablename__ = "credit_estimations"
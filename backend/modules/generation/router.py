@@ -2,22 +2,29 @@
 Generation Data API Router
 Endpoints for file upload, data processing, and credit estimation
 """
-import os
 import hashlib
-import csv
-import io
+import json
+import os
 from datetime import datetime
-from typing import List, Optional, Any
-from fastapi import APIRouter, Depends, HTTPException, UploadFile, File, Form, Query
+from functools import lru_cache
+from typing import List, Optional, Any, Tuple
+from fastapi import APIRouter, Depends, HTTPException, Request, UploadFile, File, Form, Query
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import JSONResponse, Response, StreamingResponse
 from sqlalchemy.orm import Session
 
+from backend.core.container import get_file_storage, get_task_queue
 from backend.core.database import get_db
+from backend.core.ports import FileStoragePort, TaskQueuePort
+from backend.modules.admin.dependencies import get_current_admin
 from backend.modules.auth.dependencies import get_current_user
 from backend.core.models import User, Project
 
-from .models import UploadedFile, DatasetMapping, GenerationTimeseries, CreditEstimation
+from .models import UploadedFile, UploadSession, DatasetMapping, CreditEstimation
 from .schemas import (
     FileUploadResponse,
+    UploadSessionCreate,
+    UploadSessionResponse,
     FilePreviewResponse,
     ColumnInfo,
     DatasetMappingCreate,
@@ -25,29 +32,40 @@ from .schemas import (
     MappingValidationResult,
     MethodologyInfo,
     MethodologyListResponse,
+    MethodologyMatchResponse,
     GridEFInfo,
+    GridEFCreate,
     GridEFListResponse,
     EstimationRequest,
+    PortfolioEstimationRequest,
+    UncertaintyRequest,
+    UncertaintyResponse,
     EstimationResponse,
     MonthlyBreakdown,
     AnnualBreakdown,
     ProcessingStatusResponse,
 )
 from .methodologies.registry import MethodologyRegistry
-from .grid_ef_database import get_grid_ef, get_all_grid_efs, get_countries_list
+from .grid_ef_database import GridEFData, add_grid_ef, get_grid_ef, get_all_grid_efs, get_countries_list, grid_ef_store
 from .services.credit_calculator import CreditCalculator
+from .services.conversion import convert_to_mwh
+from .services.estimate_cache import quick_estimate_cache
+from .services.frequency import detect_file_frequency
+from .services.portfolio import stream_portfolio
+from .services.quality import project_capacity_mw
+from .services.profile_cache import FileProfile, get_file_profile
+from .services.aggregation import monthly_generation, monthly_generation_by_project
+from .services.archive import archive_available
+from .services.estimation import estimate_project_credits
+from .services.matcher import match_methodologies
+from .services.uncertainty import simulate_uncertainty
+from .services.uploads import CHUNK_SIZE, MAX_CHUNK_BYTES, ChunkedUploadService
+from .tasks import ESTIMATE_TASK, PROCESS_FILE_TASK, PROFILE_FILE_TASK, REBUILD_ARCHIVE_TASK
 
 router = APIRouter(prefix="/generation", tags=["Generation Data"])
 
-# File upload directory - use /tmp for Cloud Run compatibility
-UPLOAD_DIR = os.environ.get("UPLOAD_DIR", "/tmp/uploads/generation")
-try:
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-except PermissionError:
-    # Fallback for restricted environments
-    UPLOAD_DIR = "/tmp/uploads/generation"
-    os.makedirs(UPLOAD_DIR, exist_ok=True)
-
+# Grid EF listings can change when admins add factors, so clients revalidate sooner
+GRID_EF_MAX_AGE = 300
 
 # ============ File Upload Endpoints ============
 
@@ -56,87 +74,156 @@ async def upload_file(
     project_id: int = Form(...),
     file: UploadFile = File(...),
     db: Session = Depends(get_db),
+    storage: FileStoragePort = Depends(get_file_storage),
+    task_queue: TaskQueuePort = Depends(get_task_queue),
     current_user: User = Depends(get_current_user)
 ):
     """
     Upload a generation data file (CSV or Excel).
     
     Accepts CSV, XLSX, and XLS files containing generation data.
-    Returns file metadata and detected columns for mapping.
+    Returns file metadata. Columns of new content are detected by a
+    background task; the file moves from "pending" to "parsed" and the
+    preview endpoint returns them either way.
     """
-    # Validate file type
-    allowed_types = [
-        "text/csv",
-        "application/vnd.openxmlformats-officedocument.spreadsheetml.sheet",
-        "application/vnd.ms-excel",
-    ]
-    allowed_extensions = [".csv", ".xlsx", ".xls"]
+    _validate_upload_target(db, project_id, file.filename, current_user)
+    
+    # Stream the upload to storage in chunks instead of reading it into memory
+    service = ChunkedUploadService(db, storage)
+    session = service.start(project_id, file.filename, file.content_type, None, current_user.id)
+    offset = 0
+    while True:
+        chunk = await file.read(CHUNK_SIZE)
+        if not chunk:
+            break
+        await service.append(session, offset, chunk)
+        offset += len(chunk)
     
-    file_ext = os.path.splitext(file.filename)[1].lower()
-    if file_ext not in allowed_extensions:
-        raise HTTPException(
-            status_code=400,
-            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
-        )
+    try:
+        uploaded_file = await service.finalize(session)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await _enqueue_profile(task_queue, uploaded_file)
     
-    # Verify project exists and user has access
-    project = db.query(Project).filter(
-        Project.id == project_id,
-        Project.developer_id == current_user.id
-    ).first()
+    return FileUploadResponse(
+        id=uploaded_file.id,
+        original_filename=uploaded_file.original_filename,
+        mime_type=uploaded_file.mime_type,
+        file_size_bytes=uploaded_file.file_size_bytes,
+        status=uploaded_file.status,
+        detected_columns=uploaded_file.detected_columns,
+        uploaded_at=uploaded_file.uploaded_at
+    )
+
+
+# ============ Chunked Upload Endpoints ============
+
+@router.post("/uploads", response_model=UploadSessionResponse)
+async def start_chunked_upload(
+    request: UploadSessionCreate,
+    db: Session = Depends(get_db),
+    storage: FileStoragePort = Depends(get_file_storage),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Start a resumable chunked upload.
     
-    if not project:
-        raise HTTPException(status_code=404, detail="Project not found")
+    Send the file with PUT /uploads/{upload_id}?offset=N (raw bytes in the
+    body), then POST /uploads/{upload_id}/finalize. After a dropped
+    connection, GET the session and resume from `received_bytes`.
     
-    # Read file content
-    content = await file.read()
-    file_size = len(content)
+    If `checksum` and `total_bytes` match a file already uploaded to one of
+    the user's projects, the session is returned completed with `file_id`
+    set and nothing needs to be sent.
+    """
+    _validate_upload_target(db, request.project_id, request.filename, current_user)
+    
+    service = ChunkedUploadService(db, storage)
+    await service.expire_stale()
+    session = service.start(
+        request.project_id,
+        request.filename,
+        request.content_type,
+        request.total_bytes,
+        current_user.id,
+        request.checksum,
+    )
+    return _upload_session_response(session)
+
+
+@router.get("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def get_chunked_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get the state of a chunked upload, including the offset to resume from."""
+    session = _get_owned_upload_session(db, upload_id, current_user)
+    return _upload_session_response(session)
+
+
+@router.put("/uploads/{upload_id}", response_model=UploadSessionResponse)
+async def append_upload_chunk(
+    upload_id: str,
+    request: Request,
+    offset: int = Query(..., ge=0),
+    db: Session = Depends(get_db),
+    storage: FileStoragePort = Depends(get_file_storage),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Append a chunk of raw bytes at the given offset.
     
-    # Calculate checksum
-    checksum = hashlib.sha256(content).hexdigest()
+    The offset must equal the session's `received_bytes`; a mismatch
+    returns 409 with the expected offset so the client can resume.
+    """
+    session = _get_owned_upload_session(db, upload_id, current_user)
+    if session.status != "open":
+        raise HTTPException(status_code=409, detail=f"Upload is {session.status}")
+    if offset != session.received_bytes:
+        raise HTTPException(
+            status_code=409,
+            detail=f"Offset mismatch: expected {session.received_bytes}"
+        )
     
-    # Generate storage path
-    timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
-    storage_filename = f"{project_id}_{timestamp}_{file.filename}"
-    storage_path = os.path.join(UPLOAD_DIR, storage_filename)
+    content = bytearray()
+    async for block in request.stream():
+        content.extend(block)
+        if len(content) > MAX_CHUNK_BYTES:
+            raise HTTPException(
+                status_code=413,
+                detail=f"Chunk exceeds {MAX_CHUNK_BYTES} bytes"
+            )
     
-    # Save file
-    with open(storage_path, "wb") as f:
-        f.write(content)
+    try:
+        session = await ChunkedUploadService(db, storage).append(session, offset, bytes(content))
+    except ValueError as e:
+        raise HTTPException(status_code=409, detail=str(e))
     
-    # Parse file to detect columns
-    detected_columns = None
-    row_count = 0
-    column_count = 0
+    return _upload_session_response(session)
+
+
+@router.post("/uploads/{upload_id}/finalize", response_model=FileUploadResponse)
+async def finalize_chunked_upload(
+    upload_id: str,
+    checksum: Optional[str] = Query(None, description="Expected SHA-256 of the whole file"),
+    db: Session = Depends(get_db),
+    storage: FileStoragePort = Depends(get_file_storage),
+    task_queue: TaskQueuePort = Depends(get_task_queue),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Assemble the uploaded chunks into a file and queue column detection.
     
-    try:
-        if file_ext == ".csv":
-            detected_columns, row_count, column_count = _parse_csv_columns(content)
-        elif file_ext in [".xlsx", ".xls"]:
-            # For Excel, parse after saving since openpyxl needs a file path
-            pass  # Will be parsed in preview endpoint or below
-    except Exception as e:
-        # File saved but couldn't parse - will handle in preview
-        pass
-    
-    # Create database record
-    uploaded_file = UploadedFile(
-        project_id=project_id,
-        original_filename=file.filename,
-        mime_type=file.content_type or "application/octet-stream",
-        storage_uri=storage_path,
-        file_size_bytes=file_size,
-        checksum=checksum,
-        row_count=row_count,
-        column_count=column_count,
-        detected_columns=detected_columns,
-        uploaded_by=current_user.id,
-        status="parsed" if detected_columns else "pending"
-    )
+    Returns the same response as a single-request upload.
+    """
+    session = _get_owned_upload_session(db, upload_id, current_user)
     
-    db.add(uploaded_file)
-    db.commit()
-    db.refresh(uploaded_file)
+    try:
+        uploaded_file = await ChunkedUploadService(db, storage).finalize(session, checksum)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    await _enqueue_profile(task_queue, uploaded_file)
     
     return FileUploadResponse(
         id=uploaded_file.id,
@@ -149,67 +236,85 @@ async def upload_file(
     )
 
 
-def _parse_csv_columns(content: bytes) -> tuple:
-    """Parse CSV to detect columns and infer types."""
-    try:
-        # Try to decode as UTF-8
-        text = content.decode("utf-8")
-    except UnicodeDecodeError:
-        text = content.decode("latin-1")
+@router.delete("/uploads/{upload_id}")
+async def abort_chunked_upload(
+    upload_id: str,
+    db: Session = Depends(get_db),
+    storage: FileStoragePort = Depends(get_file_storage),
+    current_user: User = Depends(get_current_user)
+):
+    """Abort a chunked upload and discard its stored chunks."""
+    session = _get_owned_upload_session(db, upload_id, current_user)
+    await ChunkedUploadService(db, storage).abort(session)
+    return {"upload_id": session.id, "status": session.status}
+
+
+async def _enqueue_profile(task_queue: TaskQueuePort, uploaded_file: UploadedFile):
+    """Queue column detection for a file whose columns are not known yet."""
+    if uploaded_file.status == "pending":
+        await task_queue.enqueue(PROFILE_FILE_TASK, {"file_id": uploaded_file.id})
+
+
+def _validate_upload_target(db: Session, project_id: int, filename: str, current_user: User):
+    """Check the file extension and that the user owns the target project."""
+    allowed_extensions = [".csv", ".xlsx", ".xls"]
     
-    reader = csv.reader(io.StringIO(text))
-    rows = list(reader)
+    file_ext = os.path.splitext(filename or "")[1].lower()
+    if file_ext not in allowed_extensions:
+        raise HTTPException(
+            status_code=400,
+            detail=f"Invalid file type. Allowed: {', '.join(allowed_extensions)}"
+        )
     
-    if not rows:
-        return None, 0, 0
+    # Verify project exists and user has access
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.developer_id == current_user.id
+    ).first()
     
-    headers = rows[0]
-    data_rows = rows[1:100]  # Sample first 100 rows
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+
+
+def _get_owned_upload_session(db: Session, upload_id: str, current_user: User) -> UploadSession:
+    """Load an upload session and verify the user owns its project."""
+    session = db.query(UploadSession).filter(UploadSession.id == upload_id).first()
     
-    columns = []
-    for i, header in enumerate(headers):
-        sample_values = [row[i] if i < len(row) else None for row in data_rows[:5]]
-        inferred_type = _infer_column_type(sample_values)
-        null_count = sum(1 for row in data_rows if i >= len(row) or not row[i])
-        
-        columns.append({
-            "name": header,
-            "inferred_type": inferred_type,
-            "sample_values": sample_values,
-            "null_count": null_count
-        })
+    if not session:
+        raise HTTPException(status_code=404, detail="Upload not found")
+    
+    project = db.query(Project).filter(
+        Project.id == session.project_id,
+        Project.developer_id == current_user.id
+    ).first()
     
-    return columns, len(rows) - 1, len(headers)
+    if not project:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return session
 
 
-def _infer_column_type(sample_values: List[Any]) -> str:
-    """Infer column type from sample values."""
-    for value in sample_values:
-        if not value:
-            continue
-        
-        # Try datetime
-        try:
-            from dateutil import parser
-            parser.parse(str(value))
-            return "datetime"
-        except:
-            pass
-        
-        # Try numeric
-        try:
-            float(str(value).replace(",", ""))
-            return "numeric"
-        except:
-            pass
-    
-    return "string"
+def _upload_session_response(session: UploadSession) -> UploadSessionResponse:
+    return UploadSessionResponse(
+        upload_id=session.id,
+        project_id=session.project_id,
+        filename=session.original_filename,
+        status=session.status,
+        received_bytes=session.received_bytes,
+        total_bytes=session.total_bytes,
+        part_count=session.part_count,
+        chunk_size=CHUNK_SIZE,
+        file_id=session.file_id,
+    )
 
 
+# Profile handlers are plain functions so FastAPI runs them in its thread
+# pool: on a cache miss the file is downloaded and parsed in full
 @router.get("/{file_id}/preview", response_model=FilePreviewResponse)
-async def get_file_preview(
+def get_file_preview(
     file_id: int,
     rows: int = Query(50, ge=1, le=100),
+    sheet: Optional[str] = Query(None, description="Worksheet to preview (Excel only)"),
     db: Session = Depends(get_db),
     current_user: User = Depends(get_current_user)
 ):
@@ -217,6 +322,7 @@ async def get_file_preview(
     Get preview of uploaded file.
     
     Returns first N rows and column metadata for mapping configuration.
+    For workbooks, `sheets` lists all worksheets and `sheet` selects one.
     """
     uploaded_file = db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
     
@@ -232,20 +338,14 @@ async def get_file_preview(
     if not project:
         raise HTTPException(status_code=403, detail="Access denied")
     
-    # Read and parse file
-    with open(uploaded_file.storage_uri, "rb") as f:
-        content = f.read()
-    
-    filename_lower = uploaded_file.original_filename.lower()
-    if filename_lower.endswith(".csv"):
-        columns, preview_rows, total_rows = _parse_csv_preview(content, rows)
-    elif filename_lower.endswith(".xlsx") or filename_lower.endswith(".xls"):
-        columns, preview_rows, total_rows = _parse_excel_preview(uploaded_file.storage_uri, rows)
-    else:
-        raise HTTPException(status_code=400, detail="Unsupported file format")
+    # Served from the checksum-keyed profile; the file is parsed only once
+    profile = _load_file_profile(uploaded_file, sheet)
+    columns = profile.columns
+    preview_rows = profile.preview_rows[:rows]
+    total_rows = profile.total_rows
     
     # Update file status if it was pending
-    if uploaded_file.status == "pending":
+    if uploaded_file.status == "pending" and sheet is None:
         uploaded_file.status = "parsed"
         uploaded_file.detected_columns = columns
         uploaded_file.row_count = total_rows
@@ -258,96 +358,64 @@ async def get_file_preview(
         columns=[ColumnInfo(**col) for col in columns],
         preview_rows=preview_rows,
         total_rows=total_rows,
-        total_columns=len(columns)
+        total_columns=len(columns),
+        sheets=profile.metadata.get("sheets"),
+        sheet_name=sheet
     )
 
 
-def _parse_csv_preview(content: bytes, num_rows: int) -> tuple:
-    """Parse CSV for preview display."""
-    try:
-        text = content.decode("utf-8")
-    except UnicodeDecodeError:
-        text = content.decode("latin-1")
-    
-    reader = csv.reader(io.StringIO(text))
-    rows = list(reader)
-    
-    if not rows:
-        return [], [], 0
-    
-    headers = rows[0]
-    data_rows = rows[1:num_rows + 1]
-    all_data_rows = rows[1:]
-    
-    columns = []
-    for i, header in enumerate(headers):
-        sample_values = [row[i] if i < len(row) else None for row in data_rows[:5]]
-        null_count = sum(1 for row in all_data_rows if i >= len(row) or not row[i])
-        
-        columns.append({
-            "name": header,
-            "inferred_type": _infer_column_type(sample_values),
-            "sample_values": sample_values,
-            "null_count": null_count
-        })
+def _load_file_profile(uploaded_file: UploadedFile, sheet_name: Optional[str] = None) -> FileProfile:
+    """Load the column profile for a file, mapping parse errors to HTTP errors."""
+    filename_lower = uploaded_file.original_filename.lower()
+    is_excel = filename_lower.endswith(".xlsx") or filename_lower.endswith(".xls")
+    if not (filename_lower.endswith(".csv") or is_excel):
+        raise HTTPException(status_code=400, detail="Unsupported file format")
     
-    return columns, data_rows, len(all_data_rows)
-
-
-def _parse_excel_preview(file_path: str, num_rows: int) -> tuple:
-    """Parse Excel file for preview display using openpyxl."""
     try:
-        import openpyxl
+        return get_file_profile(uploaded_file, sheet_name)
     except ImportError:
         raise HTTPException(
             status_code=500,
-            detail="openpyxl is required for Excel parsing. Install with: pip install openpyxl"
+            detail="openpyxl and xlrd are required for Excel parsing. Install with: pip install openpyxl xlrd"
         )
-    
-    try:
-        wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
-        ws = wb.active
-        
-        rows = []
-        for i, row in enumerate(ws.iter_rows(values_only=True)):
-            if i > num_rows + 1:  # Header + preview rows
-                break
-            # Convert None values to empty strings for consistency
-            rows.append([str(cell) if cell is not None else "" for cell in row])
-        
-        if not rows:
-            wb.close()
-            return [], [], 0
-        
-        headers = rows[0]
-        data_rows = rows[1:num_rows + 1]
-        
-        # Count total rows (approximate for large files)
-        total_rows = ws.max_row - 1 if ws.max_row else 0
-        
-        columns = []
-        for i, header in enumerate(headers):
-            sample_values = [row[i] if i < len(row) else "" for row in data_rows[:5]]
-            null_count = sum(1 for row in data_rows if i >= len(row) or not row[i])
-            
-            columns.append({
-                "name": header if header else f"Column_{i+1}",
-                "inferred_type": _infer_column_type(sample_values),
-                "sample_values": sample_values,
-                "null_count": null_count
-            })
-        
-        wb.close()
-        return columns, data_rows, total_rows
-        
     except Exception as e:
-        raise HTTPException(status_code=400, detail=f"Error parsing Excel file: {str(e)}")
+        if is_excel:
+            raise HTTPException(status_code=400, detail=f"Error parsing Excel file: {str(e)}")
+        raise HTTPException(status_code=400, detail=f"Error parsing file: {str(e)}")
+
+
+def _file_columns(uploaded_file: UploadedFile, sheet_name: Optional[str] = None) -> Optional[List[dict]]:
+    """Profiled columns of a file (or one of its sheets), from the record or the cache."""
+    if sheet_name is None and uploaded_file.detected_columns:
+        return uploaded_file.detected_columns
+    try:
+        return get_file_profile(uploaded_file, sheet_name).columns
+    except Exception:
+        return None
+
+
+def _file_column_names(uploaded_file: UploadedFile, sheet_name: Optional[str] = None) -> Optional[List[str]]:
+    """Column names for mapping checks."""
+    columns = _file_columns(uploaded_file, sheet_name)
+    return [col["name"] for col in columns] if columns else None
+
+
+def _detected_timestamp_format(
+    uploaded_file: UploadedFile,
+    column_name: str,
+    sheet_name: Optional[str] = None,
+) -> Optional[str]:
+    """Timestamp format inferred for a column during profiling, if any."""
+    for col in _file_columns(uploaded_file, sheet_name) or []:
+        if col["name"] == column_name:
+            return col.get("timestamp_format")
+    return None
 
 
 # ============ Column Mapping Endpoints ============
 
 @router.post("/{file_id}/mapping", response_model=DatasetMappingResponse)
-async def save_column_mapping(
+def save_column_mapping(
     file_id: int,
     mapping: DatasetMappingCreate,
     db: Session = Depends(get_db),
@@ -374,8 +442,8 @@ async def save_column_mapping(
         raise HTTPException(status_code=403, detail="Access denied")
     
     # Validate mapping against file columns
-    if uploaded_file.detected_columns:
-        column_names = [col["name"] for col in uploaded_file.detected_columns]
+    column_names = _file_column_names(uploaded_file, mapping.sheet_name)
+    if column_names:
         if mapping.timestamp_column not in column_names:
             raise HTTPException(
                 status_code=400,
@@ -387,11 +455,18 @@ async def save_column_mapping(
                 detail=f"Value column '{mapping.value_column}' not found in file"
             )
     
+    mapping_data = mapping.dict()
+    if not mapping_data.get("timestamp_format"):
+        # Reuse the format learned at upload so ingestion parses with it directly
+        mapping_data["timestamp_format"] = _detected_timestamp_format(
+            uploaded_file, mapping.timestamp_column, mapping.sheet_name
+        )
+    
     # Check if mapping already exists
     existing = db.query(DatasetMapping).filter(DatasetMapping.file_id == file_id).first()
     if existing:
         # Update existing
-        for key, value in mapping.dict().items():
+        for key, value in mapping_data.items():
             setattr(existing, key, value)
         db.commit()
         db.refresh(existing)
@@ -400,12 +475,16 @@ async def save_column_mapping(
         # Create new
         dataset_mapping = DatasetMapping(
             file_id=file_id,
-            **mapping.dict()
+            **mapping_data
         )
         db.add(dataset_mapping)
         db.commit()
         db.refresh(dataset_mapping)
     
+    # Progress is reported against the row count of the mapped sheet
+    if mapping.sheet_name is not None and column_names:
+        uploaded_file.row_count = get_file_profile(uploaded_file, mapping.sheet_name).total_rows
+    
     # Update file status
     uploaded_file.status = "mapped"
     db.commit()
@@ -414,7 +493,7 @@ async def save_column_mapping(
 
 
 @router.post("/{file_id}/validate-mapping", response_model=MappingValidationResult)
-async def validate_mapping(
+def validate_mapping(
     file_id: int,
     mapping: DatasetMappingCreate,
     db: Session = Depends(get_db),
@@ -425,28 +504,52 @@ async def validate_mapping(
     
     Returns validation results including warnings and a sample conversion.
     """
-    uploaded_file = db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
-    
-    if not uploaded_file:
-        raise HTTPException(status_code=404, detail="File not found")
+    uploaded_file = _get_owned_file(db, file_id, current_user)
     
     errors = []
     warnings = []
     sample_conversion = None
     detected_frequency = None
+    frequency = None
     
     # Check columns exist
-    if uploaded_file.detected_columns:
-        column_names = [col["name"] for col in uploaded_file.detected_columns]
-        
+    column_names = _file_column_names(uploaded_file, mapping.sheet_name)
+    if column_names:
         if mapping.timestamp_column not in column_names:
             errors.append(f"Timestamp column '{mapping.timestamp_column}' not found")
         
         if mapping.value_column not in column_names:
             errors.append(f"Value column '{mapping.value_column}' not found")
         
-        # Try to detect frequency from sample timestamps
-        # (Would need to parse actual file data for this)
+        # Detect frequency from a bounded sample of the timestamp column
+        if mapping.timestamp_column in column_names:
+            try:
+                frequency = detect_file_frequency(
+                    uploaded_file,
+                    mapping.timestamp_column,
+                    mapping.sheet_name,
+                    mapping.timestamp_format or _detected_timestamp_format(
+                        uploaded_file, mapping.timestamp_column, mapping.sheet_name
+                    ),
+                    mapping.timezone,
+                )
+            except Exception:
+                frequency = None
+        if frequency:
+            detected_frequency = frequency["frequency_seconds"]
+            if detected_frequency != mapping.frequency_seconds:
+                warnings.append(
+                    f"Timestamps are {detected_frequency}s apart but frequency_seconds is "
+                    f"{mapping.frequency_seconds}"
+                )
+            if frequency["gap_ratio"] > 0:
+                warnings.append(
+                    f"{frequency['gap_ratio']:.1%} of sampled intervals are gaps longer than the detected frequency"
+                )
+            if frequency["duplicate_ratio"] > 0:
+                warnings.append(
+                    f"{frequency['duplicate_ratio']:.1%} of sampled timestamps are duplicates"
+                )
     
     # Unit validation
     if mapping.unit not in ["kW", "MW", "kWh", "MWh"]:
@@ -474,7 +577,7 @@ async def validate_mapping(
         sample_conversion = {
             "original_value": 1000,
             "original_unit": mapping.unit,
-            "converted_value": _convert_to_mwh(1000, mapping.unit, mapping.value_semantics, mapping.frequency_seconds),
+            "converted_value": convert_to_mwh(1000, mapping.unit, mapping.value_semantics, mapping.frequency_seconds),
             "converted_unit": "MWh",
             "interval_seconds": mapping.frequency_seconds
         }
@@ -484,43 +587,146 @@ async def validate_mapping(
         warnings=warnings,
         errors=errors,
         sample_conversion=sample_conversion,
-        detected_frequency=detected_frequency
+        detected_frequency=detected_frequency,
+        gap_ratio=frequency["gap_ratio"] if frequency else None,
+        timezone_hints=frequency["timezone_hints"] if frequency else [],
     )
 
 
-def _convert_to_mwh(value: float, unit: str, semantics: str, frequency_seconds: int) -> float:
-    """Convert value to MWh based on unit and semantics."""
-    if semantics == "ENERGY_PER_INTERVAL":
-        # Value is already energy
-        if unit == "kWh":
-            return value / 1000
-        elif unit == "MWh":
-            return value
-        elif unit == "kW":
-            # Treat as kWh if semantics says energy
-            return value / 1000
-        elif unit == "MW":
-            return value
-    else:
-        # Value is power, need to convert to energy
-        hours = frequency_seconds / 3600
-        if unit == "kW":
-            return (value / 1000) * hours
-        elif unit == "MW":
-            return value * hours
-        elif unit == "kWh":
-            # Already energy, just convert
-            return value / 1000
-        elif unit == "MWh":
-            return value
+# ============ Processing Endpoints ============
+
+@router.post("/{file_id}/process", response_model=ProcessingStatusResponse)
+async def process_file(
+    file_id: int,
+    db: Session = Depends(get_db),
+    task_queue: TaskQueuePort = Depends(get_task_queue),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Convert a mapped file into canonical generation timeseries.
+    
+    The file is streamed by a background task; poll the status endpoint
+    for rows processed and throughput.
+    """
+    uploaded_file = _get_owned_file(db, file_id, current_user)
+    
+    if not uploaded_file.mapping:
+        raise HTTPException(
+            status_code=400,
+            detail="File has no column mapping. Save a mapping before processing."
+        )
+    
+    if uploaded_file.status == "processing":
+        raise HTTPException(status_code=409, detail="File is already being processed")
+    
+    uploaded_file.status = "processing"
+    uploaded_file.error_message = None
+    uploaded_file.rows_processed = 0
+    uploaded_file.processing_stats = None
+    db.commit()
     
-    return value
+    try:
+        await task_queue.enqueue(PROCESS_FILE_TASK, {"file_id": file_id})
+    except Exception:
+        uploaded_file.status = "error"
+        uploaded_file.error_message = "Could not queue processing"
+        db.commit()
+        raise HTTPException(status_code=503, detail="Could not queue processing")
+    
+    return _processing_status(uploaded_file)
+
+
+@router.get("/{file_id}/status", response_model=ProcessingStatusResponse)
+async def get_processing_status(
+    file_id: int,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """Get processing progress for a file."""
+    uploaded_file = _get_owned_file(db, file_id, current_user)
+    return _processing_status(uploaded_file)
+
+
+@router.post("/projects/{project_id}/archive")
+async def rebuild_archive(
+    project_id: int,
+    db: Session = Depends(get_db),
+    task_queue: TaskQueuePort = Depends(get_task_queue),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Refresh the project's Parquet archive of generation timeseries.
+    
+    Only stale or missing years are rewritten. Estimation reads the
+    archive once it is current and the database until then.
+    """
+    project = db.query(Project).filter(
+        Project.id == project_id,
+        Project.developer_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    if not archive_available():
+        raise HTTPException(
+            status_code=400,
+            detail="Generation archive is disabled. Set GENERATION_ARCHIVE=true and install pyarrow."
+        )
+    
+    await task_queue.enqueue(REBUILD_ARCHIVE_TASK, {"project_id": project_id})
+    
+    return {"project_id": project_id, "status": "rebuilding"}
+
+
+def _get_owned_file(db: Session, file_id: int, current_user: User) -> UploadedFile:
+    """Load an uploaded file and verify the user owns its project."""
+    uploaded_file = db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
+    
+    if not uploaded_file:
+        raise HTTPException(status_code=404, detail="File not found")
+    
+    project = db.query(Project).filter(
+        Project.id == uploaded_file.project_id,
+        Project.developer_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=403, detail="Access denied")
+    
+    return uploaded_file
+
+
+def _processing_status(uploaded_file: UploadedFile) -> ProcessingStatusResponse:
+    """Build processing status from the file record."""
+    stats = uploaded_file.processing_stats or {}
+    rows_processed = uploaded_file.rows_processed or 0
+    total_rows = uploaded_file.row_count or None
+    
+    progress_percent = None
+    if uploaded_file.status == "processed":
+        progress_percent = 100
+    elif total_rows:
+        progress_percent = min(99, int(rows_processed * 100 / total_rows))
+    
+    return ProcessingStatusResponse(
+        file_id=uploaded_file.id,
+        status=uploaded_file.status,
+        progress_percent=progress_percent,
+        rows_processed=rows_processed,
+        total_rows=total_rows,
+        rows_written=stats.get("rows_written"),
+        rows_per_second=stats.get("rows_per_second"),
+        quality=stats.get("quality"),
+        error_message=uploaded_file.error_message
+    )
 
 
 # ============ Methodology Endpoints ============
 
 @router.get("/methodologies", response_model=MethodologyListResponse)
 async def list_methodologies(
+    request: Request,
     project_type: Optional[str] = None,
     registry: Optional[str] = None
 ):
@@ -529,7 +735,20 @@ async def list_methodologies(
     
     Can be filtered by project type (solar, wind, hydro, biogas, etc.)
     or by registry (CDM, VERRA, GOLD_STANDARD, GCC).
+    
+    The registry never changes at runtime, so each listing is serialized
+    once and served with an ETag; a matching If-None-Match gets a 304.
     """
+    payload = _methodology_list_payload(
+        project_type.lower() if project_type else None,
+        registry.upper() if registry and not project_type else None
+    )
+    return _conditional_response(request, payload, max_age=3600)
+
+
+@lru_cache(maxsize=256)
+def _methodology_list_payload(project_type: Optional[str], registry: Optional[str]) -> Tuple[bytes, str]:
+    """Serialized methodology listing and its ETag."""
     if project_type:
         methodologies = MethodologyRegistry.list_for_project_type(project_type)
     elif registry:
@@ -537,9 +756,52 @@ async def list_methodologies(
     else:
         methodologies = MethodologyRegistry.list_all()
     
-    return MethodologyListResponse(
+    return _payload(MethodologyListResponse(
         methodologies=[MethodologyInfo(**m) for m in methodologies]
-    )
+    ).model_dump_json().encode())
+
+
+def _payload(body: bytes) -> Tuple[bytes, str]:
+    """A serialized response body with its strong ETag."""
+    return body, f'"{hashlib.sha256(body).hexdigest()[:32]}"'
+
+
+def _conditional_response(request: Request, payload: Tuple[bytes, str], max_age: int) -> Response:
+    """Serve a pre-serialized JSON body, or 304 when If-None-Match carries its ETag."""
+    body, etag = payload
+    headers = {"ETag": etag, "Cache-Control": f"public, max-age={max_age}"}
+    
+    if etag in request.headers.get("if-none-match", ""):
+        return Response(status_code=304, headers=headers)
+    return Response(content=body, media_type="application/json", headers=headers)
+
+
+@router.get("/methodologies/match", response_model=MethodologyMatchResponse)
+async def match_project_methodologies(
+    project_type: str,
+    capacity_mw: float = Query(..., ge=0),
+    country_code: str = Query(..., min_length=2, max_length=2),
+    registry: Optional[str] = None,
+    region_code: Optional[str] = None
+):
+    """
+    Eligible methodologies for a project, ranked by estimated annual ER.
+    
+    Eligibility is resolved from the registry's project type and capacity
+    indexes instead of per-methodology checks. The ranking uses an
+    indicative annual generation (capacity × typical capacity factor)
+    and the grid's combined margin.
+    """
+    try:
+        return match_methodologies(
+            project_type=project_type,
+            capacity_mw=capacity_mw,
+            country_code=country_code,
+            registry=registry,
+            region_code=region_code,
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
 
 
 @router.get("/methodologies/{methodology_id}")
@@ -556,55 +818,107 @@ async def get_methodology(methodology_id: str):
 
 @router.get("/grid-ef", response_model=GridEFListResponse)
 async def list_grid_emission_factors(
+    request: Request,
     country_code: Optional[str] = None
 ):
     """
     List grid emission factors.
     
     Returns emission factors for all countries, or a specific country if provided.
+    
+    Listings are serialized once per version of the factor store and
+    served with an ETag; a matching If-None-Match gets a 304.
+    """
+    payload = _grid_ef_list_payload(
+        country_code.upper() if country_code else None,
+        grid_ef_store.current_version(),
+        grid_ef_store.next_transition()
+    )
+    if payload is None:
+        raise HTTPException(
+            status_code=404,
+            detail=f"No emission factor data for country: {country_code}"
+        )
+    return _conditional_response(request, payload, max_age=GRID_EF_MAX_AGE)
+
+
+@lru_cache(maxsize=512)
+def _grid_ef_list_payload(
+    country_code: Optional[str],
+    store_version: int,
+    next_transition: Optional[datetime],
+) -> Optional[Tuple[bytes, str]]:
+    """
+    Serialized factor listing and its ETag.
+    
+    store_version and next_transition only key the cache: the listing
+    changes when the factors do or when a validity window opens or closes.
     """
     if country_code:
         ef = get_grid_ef(country_code)
         if not ef:
-            raise HTTPException(
-                status_code=404,
-                detail=f"No emission factor data for country: {country_code}"
-            )
-        return GridEFListResponse(emission_factors=[GridEFInfo(
-            country_code=ef.country_code,
-            country_name=ef.country_name,
-            region_code=ef.region_code,
-            region_name=ef.region_name,
-            combined_margin=ef.combined_margin,
-            operating_margin=ef.operating_margin,
-            build_margin=ef.build_margin,
-            source_name=ef.source_name,
-            data_year=ef.data_year,
-            source_url=ef.source_url
-        )])
-    
-    all_efs = get_all_grid_efs()
-    return GridEFListResponse(emission_factors=[
-        GridEFInfo(
-            country_code=ef.country_code,
-            country_name=ef.country_name,
-            region_code=ef.region_code,
-            region_name=ef.region_name,
-            combined_margin=ef.combined_margin,
-            operating_margin=ef.operating_margin,
-            build_margin=ef.build_margin,
-            source_name=ef.source_name,
-            data_year=ef.data_year,
-            source_url=ef.source_url
-        )
-        for ef in all_efs
-    ])
+            return None
+        efs = [ef]
+    else:
+        efs = get_all_grid_efs()
+    
+    return _payload(GridEFListResponse(
+        emission_factors=[_grid_ef_info(ef) for ef in efs]
+    ).model_dump_json().encode())
+
+
+@router.post("/grid-ef", response_model=GridEFInfo)
+async def add_grid_emission_factor(
+    request: GridEFCreate,
+    db: Session = Depends(get_db),
+    admin: User = Depends(get_current_admin)
+):
+    """
+    Add an official or user-supplied grid emission factor.
+    
+    The factor is used by estimations as soon as its validity window
+    starts; this process reindexes immediately and the others within
+    GRID_EF_REFRESH_SECONDS.
+    """
+    try:
+        ef = add_grid_ef(db, request.model_dump())
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return _grid_ef_info(ef)
+
+
+def _grid_ef_info(ef: GridEFData) -> GridEFInfo:
+    return GridEFInfo(
+        country_code=ef.country_code,
+        country_name=ef.country_name,
+        region_code=ef.region_code,
+        region_name=ef.region_name,
+        combined_margin=ef.combined_margin,
+        operating_margin=ef.operating_margin,
+        build_margin=ef.build_margin,
+        source_name=ef.source_name,
+        data_year=ef.data_year,
+        source_url=ef.source_url,
+        valid_from=ef.valid_from,
+        valid_until=ef.valid_until,
+        is_official=ef.is_official
+    )
 
 
 @router.get("/grid-ef/countries")
-async def list_countries():
+async def list_countries(request: Request):
     """List all countries with available emission factor data."""
-    return get_countries_list()
+    return _conditional_response(
+        request,
+        _countries_payload(grid_ef_store.current_version(), grid_ef_store.next_transition()),
+        max_age=GRID_EF_MAX_AGE
+    )
+
+
+@lru_cache(maxsize=4)
+def _countries_payload(store_version: int, next_transition: Optional[datetime]) -> Tuple[bytes, str]:
+    """Serialized country list and its ETag; the arguments only key the cache."""
+    return _payload(json.dumps(get_countries_list(), separators=(",", ":")).encode())
 
 
 # ============ Credit Estimation Endpoints ============
@@ -612,14 +926,18 @@ async def list_countries():
 @router.post("/estimate", response_model=EstimationResponse)
 async def estimate_credits(
     request: EstimationRequest,
+    background: bool = Query(False, description="Queue the estimation and return 202 instead of waiting"),
     db: Session = Depends(get_db),
+    task_queue: TaskQueuePort = Depends(get_task_queue),
     current_user: User = Depends(get_current_user)
 ):
     """
     Calculate carbon credit estimation for a project.
     
     Uses uploaded generation data and selected methodology to calculate
-    emission reductions. Results are saved to the database.
+    emission reductions. Results are saved to the database. With
+    `background=true` the estimation runs as a task and appears under
+    the project's estimations when done.
     """
     # Verify project exists and user has access
     project = db.query(Project).filter(
@@ -630,72 +948,39 @@ async def estimate_credits(
     if not project:
         raise HTTPException(status_code=404, detail="Project not found")
     
-    # Get generation data
-    timeseries = db.query(GenerationTimeseries).filter(
-        GenerationTimeseries.project_id == request.project_id
-    )
-    
-    if request.period_start:
-        timeseries = timeseries.filter(GenerationTimeseries.ts_utc >= request.period_start)
-    if request.period_end:
-        timeseries = timeseries.filter(GenerationTimeseries.ts_utc <= request.period_end)
-    
-    timeseries = timeseries.all()
-    
-    # If no timeseries data, check for uploaded files with mappings
-    if not timeseries:
-        # Try to get data from wizard_data or use sample calculation
-        raise HTTPException(
-            status_code=400,
-            detail="No generation data found. Please upload and process data first."
+    if background:
+        try:
+            CreditCalculator(request.methodology_id)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        task_id = await task_queue.enqueue(ESTIMATE_TASK, {
+            "user_id": current_user.id,
+            "request": request.model_dump(mode="json"),
+        })
+        return JSONResponse(
+            status_code=202,
+            content={"project_id": project.id, "status": "queued", "task_id": task_id}
         )
     
-    # Prepare generation data for calculator
-    generation_data = [
-        {"timestamp": ts.ts_utc, "energy_mwh": float(ts.energy_mwh)}
-        for ts in timeseries
-    ]
-    
-    # Run calculation
     try:
-        calculator = CreditCalculator(request.methodology_id)
-        result = calculator.calculate(
-            generation_data=generation_data,
-            country_code=request.country_code,
-            project_type=project.project_type,
-            ef_override=request.ef_value,
-            additional_inputs=request.additional_inputs
+        # Runs off the event loop: archive scans fetch files through storage
+        estimation = await run_in_threadpool(
+            estimate_project_credits,
+            db,
+            project.id,
+            project.project_type,
+            request.methodology_id,
+            request.country_code,
+            ef_value=request.ef_value,
+            ef_timeseries=[(p.period, p.ef) for p in request.ef_timeseries or []],
+            period_start=request.period_start,
+            period_end=request.period_end,
+            additional_inputs=request.additional_inputs,
+            created_by=current_user.id,
         )
     except ValueError as e:
         raise HTTPException(status_code=400, detail=str(e))
     
-    # Save estimation to database
-    estimation = CreditEstimation(
-        project_id=request.project_id,
-        methodology_id=request.methodology_id,
-        registry=result["registry"],
-        country_code=request.country_code,
-        grid_ef_value=result["ef_value"],
-        grid_ef_source=result["ef_source"],
-        grid_ef_year=result["ef_year"],
-        total_generation_mwh=result["total_generation_mwh"],
-        total_er_tco2e=result["total_er_tco2e"],
-        baseline_emissions_tco2e=result["baseline_emissions_tco2e"],
-        project_emissions_tco2e=result["project_emissions_tco2e"],
-        leakage_tco2e=result["leakage_tco2e"],
-        monthly_breakdown=result["monthly_breakdown"],
-        annual_breakdown=result["annual_breakdown"],
-        calculation_inputs=request.additional_inputs,
-        assumptions=result["assumptions"],
-        period_start=request.period_start,
-        period_end=request.period_end,
-        created_by=current_user.id
-    )
-    
-    db.add(estimation)
-    db.commit()
-    db.refresh(estimation)
-    
     return EstimationResponse(
         id=estimation.id,
         project_id=estimation.project_id,
@@ -717,6 +1002,106 @@ async def estimate_credits(
     )
 
 
+@router.post("/estimate/batch")
+async def estimate_portfolio(
+    request: PortfolioEstimationRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Estimate many projects against every applicable methodology.
+    
+    Each project's monthly generation is loaded once and fanned out to
+    the methodologies registered for its project type (optionally limited
+    to `methodology_ids`). Results stream back as NDJSON, one line per
+    project and methodology, in completion order. Nothing is saved.
+    """
+    project_ids = list(dict.fromkeys(request.project_ids))
+    projects = db.query(Project.id, Project.project_type).filter(
+        Project.id.in_(project_ids),
+        Project.developer_id == current_user.id
+    ).all()
+    
+    missing = set(project_ids) - {p.id for p in projects}
+    if missing:
+        raise HTTPException(
+            status_code=404,
+            detail=f"Projects not found: {', '.join(str(p) for p in sorted(missing))}"
+        )
+    
+    if request.methodology_ids:
+        known = set(MethodologyRegistry.get_ids())
+        unknown = [m for m in request.methodology_ids if m not in known]
+        if unknown:
+            raise HTTPException(status_code=400, detail=f"Unknown methodologies: {', '.join(unknown)}")
+    
+    monthly_by_project = monthly_generation_by_project(
+        db, project_ids, request.period_start, request.period_end
+    )
+    
+    order = {project_id: i for i, project_id in enumerate(project_ids)}
+    return StreamingResponse(
+        stream_portfolio(
+            [(p.id, p.project_type) for p in sorted(projects, key=lambda p: order[p.id])],
+            monthly_by_project,
+            request.country_code,
+            methodology_ids=request.methodology_ids,
+            ef_override=request.ef_value,
+            additional_inputs=request.additional_inputs,
+        ),
+        media_type="application/x-ndjson"
+    )
+
+
+@router.post("/estimate/uncertainty", response_model=UncertaintyResponse)
+async def estimate_uncertainty(
+    request: UncertaintyRequest,
+    db: Session = Depends(get_db),
+    current_user: User = Depends(get_current_user)
+):
+    """
+    Monte-Carlo P50/P90 credit forecast per vintage.
+    
+    Samples annual generation variability, the grid EF between its
+    operating and build margins, and any methodology parameter ranges,
+    then reports percentile bands of emission reductions. Nothing is saved.
+    """
+    project = db.query(Project).filter(
+        Project.id == request.project_id,
+        Project.developer_id == current_user.id
+    ).first()
+    
+    if not project:
+        raise HTTPException(status_code=404, detail="Project not found")
+    
+    monthly = monthly_generation(db, request.project_id, request.period_start, request.period_end)
+    if not monthly:
+        raise HTTPException(
+            status_code=400,
+            detail="No generation data found. Please upload and process data first."
+        )
+    
+    try:
+        result = await simulate_uncertainty(
+            request.methodology_id,
+            monthly,
+            request.country_code,
+            project.project_type,
+            draws=request.draws,
+            generation_cv=request.generation_cv,
+            ef_override=request.ef_value,
+            ef_uncertainty=request.ef_uncertainty,
+            parameter_ranges=request.parameter_ranges,
+            additional_inputs=request.additional_inputs,
+            seed=request.seed,
+            capacity_mw=project_capacity_mw(project),
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    
+    return UncertaintyResponse(project_id=request.project_id, **result)
+
+
 @router.post("/quick-estimate")
 async def quick_estimate(
     generation_mwh: float = Form(...),
@@ -741,6 +1126,12 @@ async def quick_estimate(
         raise HTTPException(status_code=400, detail=str(e))
 
 
+@router.get("/quick-estimate/cache")
+async def quick_estimate_cache_stats(admin: User = Depends(get_current_admin)):
+    """Hit/miss counters of the quick-estimate result cache."""
+    return quick_estimate_cache.stats()
+
+
 @router.get("/estimations/{project_id}")
 async def list_estimations(
     project_id: int,
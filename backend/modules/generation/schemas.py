@@ -25,6 +25,7 @@ class FileUploadResponse(BaseModel):
 class ColumnInfo(BaseModel):
     name: str
     inferred_type: str  # datetime, numeric, string
+    timestamp_format: Optional[str] = None  # strptime format for datetime columns
     sample_values: List[Any]
     null_count: int = 0
 
@@ -36,6 +37,28 @@ class FilePreviewResponse(BaseModel):
     preview_rows: List[List[Any]]
     total_rows: int
     total_columns: int
+    sheets: Optional[List[str]] = None  # Worksheet names (Excel only)
+    sheet_name: Optional[str] = None  # Previewed worksheet; None is the default sheet
+
+
+class UploadSessionCreate(BaseModel):
+    project_id: int
+    filename: str
+    content_type: Optional[str] = None
+    total_bytes: Optional[int] = Field(None, ge=0)
+    checksum: Optional[str] = Field(None, pattern="^[0-9a-fA-F]{64}$")  # SHA-256, enables dedup at init
+
+
+class UploadSessionResponse(BaseModel):
+    upload_id: str
+    project_id: int
+    filename: str
+    status: str  # open, completed, aborted, expired
+    received_bytes: int
+    total_bytes: Optional[int] = None
+    part_count: int
+    chunk_size: int  # Recommended chunk size in bytes
+    file_id: Optional[int] = None
 
 
 # ============ Column Mapping Schemas ============
@@ -48,6 +71,7 @@ class DatasetMappingCreate(BaseModel):
     frequency_seconds: int = Field(..., gt=0)
     timezone: str = "UTC"
     timestamp_format: Optional[str] = None
+    sheet_name: Optional[str] = None  # Excel worksheet; defaults to the active sheet
 
 
 class DatasetMappingResponse(BaseModel):
@@ -59,6 +83,8 @@ class DatasetMappingResponse(BaseModel):
     value_semantics: str
     frequency_seconds: int
     timezone: str
+    timestamp_format: Optional[str] = None
+    sheet_name: Optional[str] = None
     created_at: datetime
 
     class Config:
@@ -71,6 +97,8 @@ class MappingValidationResult(BaseModel):
     errors: List[str] = []
     sample_conversion: Optional[Dict[str, Any]] = None
     detected_frequency: Optional[int] = None
+    gap_ratio: Optional[float] = None
+    timezone_hints: List[str] = []
 
 
 # ============ Methodology Schemas ============
@@ -90,6 +118,21 @@ class MethodologyListResponse(BaseModel):
     methodologies: List[MethodologyInfo]
 
 
+class MethodologyMatch(MethodologyInfo):
+    estimated_er_tco2e: Optional[float] = None
+
+
+class MethodologyMatchResponse(BaseModel):
+    project_type: str
+    capacity_mw: float
+    country_code: str
+    registry: Optional[str] = None
+    ef_value: float
+    capacity_factor: float
+    estimated_generation_mwh: float
+    methodologies: List[MethodologyMatch]
+
+
 # ============ Grid Emission Factor Schemas ============
 
 class GridEFInfo(BaseModel):
@@ -103,6 +146,27 @@ class GridEFInfo(BaseModel):
     source_name: str
     data_year: int
     source_url: Optional[str] = None
+    valid_from: Optional[datetime] = None
+    valid_until: Optional[datetime] = None
+    is_official: bool = True
+
+
+class GridEFCreate(BaseModel):
+    country_code: str = Field(..., min_length=2, max_length=2)
+    country_name: str
+    region_code: Optional[str] = None
+    region_name: Optional[str] = None
+    combined_margin: float = Field(..., ge=0)
+    operating_margin: Optional[float] = Field(None, ge=0)
+    build_margin: Optional[float] = Field(None, ge=0)
+    weighted_average: Optional[float] = Field(None, ge=0)
+    source_name: str
+    source_url: Optional[str] = None
+    data_year: int
+    methodology_ref: Optional[str] = None
+    valid_from: Optional[datetime] = None
+    valid_until: Optional[datetime] = None
+    is_official: bool = False
 
 
 class GridEFListResponse(BaseModel):
@@ -111,11 +175,42 @@ class GridEFListResponse(BaseModel):
 
 # ============ Credit Estimation Schemas ============
 
+class EFTimeseriesPoint(BaseModel):
+    period: str  # "YYYY", "YYYY-MM" or ISO timestamp the factor applies from
+    ef: float = Field(..., ge=0)
+
+
 class EstimationRequest(BaseModel):
     project_id: int
     methodology_id: str
     country_code: str
     ef_value: Optional[float] = None  # Uses published if not provided
+    ef_timeseries: Optional[List[EFTimeseriesPoint]] = None  # Time-varying EF; replaces ef_value
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+    additional_inputs: Optional[Dict[str, Any]] = None
+
+
+class PortfolioEstimationRequest(BaseModel):
+    project_ids: List[int] = Field(..., min_length=1, max_length=500)
+    methodology_ids: Optional[List[str]] = None  # Default: every methodology applicable to each project
+    country_code: str
+    ef_value: Optional[float] = None  # Uses published if not provided
+    period_start: Optional[datetime] = None
+    period_end: Optional[datetime] = None
+    additional_inputs: Optional[Dict[str, Any]] = None
+
+
+class UncertaintyRequest(BaseModel):
+    project_id: int
+    methodology_id: str
+    country_code: str
+    ef_value: Optional[float] = None  # Distribution mode; uses published if not provided
+    ef_uncertainty: Optional[float] = Field(None, ge=0, le=1)  # Relative spread; default uses OM/BM range
+    generation_cv: float = Field(0.1, ge=0, le=1)  # Relative std of annual generation
+    parameter_ranges: Optional[Dict[str, List[float]]] = None  # {input: [low, high] or [low, mode, high]}
+    draws: int = Field(10000, ge=100, le=200000)
+    seed: Optional[int] = None
     period_start: Optional[datetime] = None
     period_end: Optional[datetime] = None
     additional_inputs: Optional[Dict[str, Any]] = None
@@ -133,6 +228,36 @@ class AnnualBreakdown(BaseModel):
     emission_reductions_tco2e: float
 
 
+class UncertaintyBand(BaseModel):
+    mean: float
+    std: float
+    p10: float  # Exceeded in 10% of draws
+    p50: float
+    p90: float  # Exceeded in 90% of draws
+
+
+class VintageUncertainty(UncertaintyBand):
+    vintage: int
+    generation_mwh: float
+
+
+class EFRange(BaseModel):
+    low: float
+    mode: float
+    high: float
+
+
+class UncertaintyResponse(BaseModel):
+    project_id: int
+    methodology_id: str
+    draws: int
+    ef_range: EFRange
+    deterministic_er_tco2e: float
+    total_generation_mwh: float
+    vintages: List[VintageUncertainty]
+    total: UncertaintyBand
+
+
 class EstimationResponse(BaseModel):
     id: int
     project_id: int
@@ -174,4 +299,7 @@ class ProcessingStatusResponse(BaseModel):
     progress_percent: Optional[int] = None
     rows_processed: Optional[int] = None
     total_rows: Optional[int] = None
+    rows_written: Optional[int] = None
+    rows_per_second: Optional[float] = None
+    quality: Optional[Dict[str, Any]] = None
     error_message: Optional[str] = None
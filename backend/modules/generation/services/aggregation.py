@@ -0,0 +1,147 @@
+"""
+Generation Aggregation
+Monthly energy buckets for credit estimation, grouped in the database or in one vectorized pass
+"""
+from datetime import datetime
+from itertools import groupby
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import GenerationTimeseries
+from .archive import TimeseriesArchive, archive_available
+
+
+def bucket_by_month(timestamps: np.ndarray, energy: np.ndarray) -> Dict[str, float]:
+    """
+    Sum energy per calendar month.
+
+    Args:
+        timestamps: datetime64 array
+        energy: MWh per timestamp
+
+    Returns:
+        {"YYYY-MM": MWh} in chronological order
+    """
+    if not len(timestamps):
+        return {}
+    months = timestamps.astype("datetime64[M]")
+    keys, inverse = np.unique(months, return_inverse=True)
+    sums = np.bincount(inverse, weights=energy, minlength=len(keys))
+    return {str(key): float(total) for key, total in zip(keys, sums)}
+
+
+def bucket_generation_data(generation_data: List[Dict[str, Any]]) -> Dict[str, float]:
+    """
+    Monthly buckets from a list of {"timestamp", "energy_mwh"} dicts.
+
+    Items without a timestamp count towards the current month.
+    """
+    monthly: Dict[str, float] = {}
+    for item in generation_data:
+        ts = item.get("timestamp")
+        if ts:
+            if isinstance(ts, str):
+                ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
+            key = ts.strftime("%Y-%m")
+        else:
+            key = datetime.utcnow().strftime("%Y-%m")
+        monthly[key] = monthly.get(key, 0.0) + item.get("energy_mwh", 0)
+    return dict(sorted(monthly.items()))
+
+
+def monthly_generation(
+    db: Session,
+    project_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Dict[str, float]:
+    """
+    Generation per month for a project period.
+
+    A current Parquet archive is scanned and bucketed with numpy.
+    Otherwise PostgreSQL and SQLite group by month themselves and only
+    one row per month crosses the wire; other databases return the two
+    raw columns, bucketed in a single vectorized pass. Bounds are plain
+    ts_utc range predicates, so a month-partitioned table is pruned to
+    the partitions in range.
+
+    Returns:
+        {"YYYY-MM": MWh} in chronological order; empty when there is no data
+    """
+    return monthly_generation_by_project(db, [project_id], start, end).get(project_id, {})
+
+
+def monthly_generation_by_project(
+    db: Session,
+    project_ids: List[int],
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Dict[int, Dict[str, float]]:
+    """
+    Generation per month for several projects in one grouped query.
+
+    Projects with a current Parquet archive are read from it instead.
+    See monthly_generation() for how the database path groups.
+
+    Returns:
+        {project_id: {"YYYY-MM": MWh}}; projects without data are omitted
+    """
+    result: Dict[int, Dict[str, float]] = {}
+    remaining = list(project_ids)
+    if archive_available():
+        from backend.core.container import container
+
+        archive = TimeseriesArchive(db, container.file_storage)
+        remaining = []
+        for project_id in project_ids:
+            series = archive.scan(project_id, start, end)
+            if series is None:
+                remaining.append(project_id)
+            elif len(series[0]):
+                result[project_id] = bucket_by_month(*series)
+    if not remaining:
+        return result
+
+    ts = GenerationTimeseries.ts_utc
+    dialect = db.get_bind().dialect.name
+    if dialect == "postgresql":
+        month = func.date_trunc("month", ts)
+    elif dialect == "sqlite":
+        month = func.strftime("%Y-%m", ts)
+    else:
+        month = None
+
+    filters = [GenerationTimeseries.project_id.in_(remaining)]
+    if start is not None:
+        filters.append(ts >= start)
+    if end is not None:
+        filters.append(ts <= end)
+
+    if month is None:
+        rows = (
+            db.query(GenerationTimeseries.project_id, ts, GenerationTimeseries.energy_mwh)
+            .filter(*filters)
+            .order_by(GenerationTimeseries.project_id)
+            .all()
+        )
+        for project_id, group in groupby(rows, key=lambda r: r[0]):
+            group = list(group)
+            result[project_id] = bucket_by_month(
+                np.array([r[1] for r in group], dtype="datetime64[us]"),
+                np.array([float(r[2]) for r in group], dtype=np.float64),
+            )
+        return result
+
+    rows = (
+        db.query(GenerationTimeseries.project_id, month, func.sum(GenerationTimeseries.energy_mwh))
+        .filter(*filters)
+        .group_by(GenerationTimeseries.project_id, month)
+        .order_by(GenerationTimeseries.project_id, month)
+        .all()
+    )
+    for project_id, key, total in rows:
+        result.setdefault(project_id, {})[key if isinstance(key, str) else key.strftime("%Y-%m")] = float(total)
+    return result
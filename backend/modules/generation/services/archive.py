@@ -0,0 +1,313 @@
+"""
+Generation Timeseries Archive
+Columnar (Parquet) copies of canonical time-series, one file per project and year
+"""
+import logging
+import os
+import tempfile
+from datetime import datetime
+from typing import List, Optional, Tuple
+
+import numpy as np
+from sqlalchemy import extract
+from sqlalchemy.orm import Session
+
+from backend.core.ports import FileStoragePort
+
+from ..models import GenerationArchive, GenerationTimeseries
+from .storage import fetch_local_copy, run_sync
+
+
+logger = logging.getLogger(__name__)
+
+# The archive is opt-in; estimation reads the database when it is disabled
+ARCHIVE_ENABLED = os.environ.get("GENERATION_ARCHIVE", "false").lower() == "true"
+
+# Rows fetched per round trip while exporting a year from the database
+EXPORT_FETCH_SIZE = 50000
+
+ARCHIVE_COLUMNS = ["ts_utc", "energy_mwh", "power_mw", "quality_flag", "file_id"]
+
+
+def archive_available() -> bool:
+    """True when the archive is enabled and pyarrow is installed."""
+    if not ARCHIVE_ENABLED:
+        return False
+    try:
+        import pyarrow  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def mark_archives_stale(db: Session, project_id: int) -> None:
+    """Flag every archive of a project as out of date (not committed)."""
+    db.query(GenerationArchive).filter(
+        GenerationArchive.project_id == project_id
+    ).update({GenerationArchive.is_stale: True}, synchronize_session=False)
+
+
+class TimeseriesArchive:
+    """
+    Parquet store of GenerationTimeseries, held through FileStoragePort.
+
+    Each project-year is one file with one row group per calendar month,
+    so row-group statistics on ts_utc let a period scan skip whole months.
+    Ingestion marks a project's archives stale; scans refuse stale
+    archives and callers fall back to the database until the next rebuild.
+
+    Usage:
+        archive = TimeseriesArchive(db, storage)
+        archive.rebuild(project_id)
+        series = archive.scan(project_id, start, end)  # None -> query the database
+    """
+
+    def __init__(self, db: Session, storage: FileStoragePort):
+        self.db = db
+        self.storage = storage
+
+    def rebuild(self, project_id: int, only_stale: bool = False) -> List[GenerationArchive]:
+        """
+        Export a project's time-series to Parquet, one file per year.
+
+        Years that no longer have rows lose their archive.
+
+        Args:
+            project_id: Project to export
+            only_stale: Skip years whose archive is still current
+
+        Returns:
+            The archive records written
+        """
+        existing = {
+            a.year: a
+            for a in self.db.query(GenerationArchive).filter(GenerationArchive.project_id == project_id)
+        }
+        years = [
+            int(y)
+            for (y,) in self.db.query(extract("year", GenerationTimeseries.ts_utc))
+            .filter(GenerationTimeseries.project_id == project_id)
+            .distinct()
+        ]
+
+        written = []
+        for year in sorted(years):
+            archive = existing.pop(year, None)
+            if only_stale and archive is not None and not archive.is_stale:
+                continue
+            written.append(self._export_year(project_id, year, archive))
+
+        for archive in existing.values():
+            run_sync(self.storage.delete(archive.storage_uri))
+            self.db.delete(archive)
+        self.db.commit()
+        return written
+
+    def scan(
+        self,
+        project_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Optional[Tuple[np.ndarray, np.ndarray]]:
+        """
+        Read ts_utc and energy_mwh for a period from the archive.
+
+        Only files overlapping the period are opened, and within them only
+        the row groups whose ts_utc range matches the filter are decoded.
+
+        Returns:
+            (timestamps as datetime64[us], energy in MWh), ordered by time,
+            or None when the project has no current archive
+        """
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        archives = self.db.query(GenerationArchive).filter(
+            GenerationArchive.project_id == project_id
+        ).order_by(GenerationArchive.year).all()
+        if not archives or any(a.is_stale for a in archives):
+            return None
+
+        filters = []
+        if start is not None:
+            filters.append(("ts_utc", ">=", start))
+        if end is not None:
+            filters.append(("ts_utc", "<=", end))
+
+        tables = []
+        for archive in archives:
+            if start is not None and archive.ts_max is not None and archive.ts_max < start:
+                continue
+            if end is not None and archive.ts_min is not None and archive.ts_min > end:
+                continue
+            local_path = run_sync(fetch_local_copy(self.storage, archive.storage_uri))
+            tables.append(pq.read_table(
+                local_path,
+                columns=["ts_utc", "energy_mwh"],
+                filters=filters or None,
+            ))
+
+        if not tables:
+            return np.array([], dtype="datetime64[us]"), np.array([], dtype=np.float64)
+
+        table = pa.concat_tables(tables)
+        timestamps = table.column("ts_utc").to_numpy().astype("datetime64[us]")
+        energy = table.column("energy_mwh").to_numpy(zero_copy_only=False).astype(np.float64)
+        return timestamps, energy
+
+    def _export_year(
+        self,
+        project_id: int,
+        year: int,
+        archive: Optional[GenerationArchive],
+    ) -> GenerationArchive:
+        """Stream one year from the database into a Parquet file and store it."""
+        import pyarrow as pa
+        import pyarrow.parquet as pq
+
+        schema = pa.schema([
+            ("ts_utc", pa.timestamp("us")),
+            ("energy_mwh", pa.float64()),
+            ("power_mw", pa.float64()),
+            ("quality_flag", pa.string()),
+            ("file_id", pa.int32()),
+        ])
+        rows = (
+            self.db.query(*(getattr(GenerationTimeseries, c) for c in ARCHIVE_COLUMNS))
+            .filter(
+                GenerationTimeseries.project_id == project_id,
+                GenerationTimeseries.ts_utc >= datetime(year, 1, 1),
+                GenerationTimeseries.ts_utc < datetime(year + 1, 1, 1),
+            )
+            .order_by(GenerationTimeseries.ts_utc)
+            .yield_per(EXPORT_FETCH_SIZE)
+        )
+
+        fd, tmp_path = tempfile.mkstemp(suffix=".parquet")
+        os.close(fd)
+        row_count = 0
+        ts_min = ts_max = None
+        try:
+            with pq.ParquetWriter(tmp_path, schema, compression="zstd") as writer:
+                month_rows: List[tuple] = []
+
+                def write_month():
+                    # One write per month -> one row group per month
+                    columns = list(zip(*month_rows))
+                    writer.write_table(pa.Table.from_arrays(
+                        [
+                            pa.array(columns[0], type=pa.timestamp("us")),
+                            pa.array([float(v) for v in columns[1]], type=pa.float64()),
+                            pa.array([float(v) if v is not None else None for v in columns[2]], type=pa.float64()),
+                            pa.array(columns[3], type=pa.string()),
+                            pa.array(columns[4], type=pa.int32()),
+                        ],
+                        schema=schema,
+                    ))
+                    month_rows.clear()
+
+                for row in rows:
+                    if month_rows and row[0].month != month_rows[-1][0].month:
+                        write_month()
+                    month_rows.append(tuple(row))
+                    row_count += 1
+                    ts_min = ts_min or row[0]
+                    ts_max = row[0]
+                if month_rows:
+                    write_month()
+
+            # Versioned object names: cached local copies never serve an old build
+            built_at = datetime.utcnow()
+            storage_name = f"generation/archive_{project_id}_{year}_{built_at.strftime('%Y%m%d%H%M%S%f')}.parquet"
+            size_bytes = os.path.getsize(tmp_path)
+            storage_uri = run_sync(self.storage.upload_file(storage_name, tmp_path, "application/vnd.apache.parquet"))
+        finally:
+            os.remove(tmp_path)
+
+        if archive is None:
+            archive = GenerationArchive(project_id=project_id, year=year)
+            self.db.add(archive)
+        elif archive.storage_uri != storage_uri:
+            run_sync(self.storage.delete(archive.storage_uri))
+
+        archive.storage_uri = storage_uri
+        archive.row_count = row_count
+        archive.size_bytes = size_bytes
+        archive.ts_min = ts_min
+        archive.ts_max = ts_max
+        archive.is_stale = False
+        archive.built_at = built_at
+        archive.last_error = None
+        archive.failed_at = None
+        self.db.flush()
+        return archive
+
+
+def rebuild_project_archive(project_id: int) -> None:
+    """
+    Refresh a project's stale or missing archives in its own database session.
+
+    Intended for background execution; failures are logged and recorded
+    on the project's archives, which stay stale so readers keep using the
+    database until the next rebuild.
+    """
+    from backend.core.container import container
+    from backend.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        TimeseriesArchive(db, container.file_storage).rebuild(project_id, only_stale=True)
+    except Exception as e:
+        logger.exception(f"Archive rebuild failed for project {project_id}")
+        db.rollback()
+        record_archive_failure(db, project_id, e)
+    finally:
+        db.close()
+
+
+def record_archive_failure(db: Session, project_id: int, error: Exception) -> None:
+    """Store a failed rebuild on the project's archives (committed)."""
+    try:
+        db.query(GenerationArchive).filter(
+            GenerationArchive.project_id == project_id
+        ).update(
+            {GenerationArchive.last_error: str(error)[:2000], GenerationArchive.failed_at: datetime.utcnow()},
+            synchronize_session=False,
+        )
+        db.commit()
+    except Exception:
+        logger.exception(f"Could not record archive failure for project {project_id}")
+        db.rollback()
+
+
+def load_generation_series(
+    db: Session,
+    project_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+) -> Tuple[np.ndarray, np.ndarray]:
+    """
+    Timestamps and energy (MWh) for a project period, ordered by time.
+
+    Reads the Parquet archive when it is enabled and current, otherwise
+    selects the two columns from the timeseries table.
+    """
+    if archive_available():
+        from backend.core.container import container
+
+        series = TimeseriesArchive(db, container.file_storage).scan(project_id, start, end)
+        if series is not None:
+            return series
+
+    query = db.query(GenerationTimeseries.ts_utc, GenerationTimeseries.energy_mwh).filter(
+        GenerationTimeseries.project_id == project_id
+    )
+    if start is not None:
+        query = query.filter(GenerationTimeseries.ts_utc >= start)
+    if end is not None:
+        query = query.filter(GenerationTimeseries.ts_utc <= end)
+
+    rows = query.order_by(GenerationTimeseries.ts_utc).all()
+    timestamps = np.array([r[0] for r in rows], dtype="datetime64[us]")
+    energy = np.array([float(r[1]) for r in rows], dtype=np.float64)
+    return timestamps, energy
@@ -0,0 +1,370 @@
+"""
+Generation Conversion Engine
+Vectorized unit conversion, resampling and gap treatment for generation data
+"""
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+import numpy as np
+
+
+# Multiplier from the source unit to MW (power) or MWh (energy)
+UNIT_FACTORS: Dict[str, float] = {
+    "kW": 0.001,
+    "MW": 1.0,
+    "kWh": 0.001,
+    "MWh": 1.0,
+}
+
+ENERGY_UNITS = ("kWh", "MWh")
+
+# Quality flag codes used in converted arrays
+FLAG_OK = 0
+FLAG_MISSING = 1
+FLAG_INTERPOLATED = 2
+FLAG_OUTLIER = 3
+
+QUALITY_FLAGS = {
+    FLAG_OK: "OK",
+    FLAG_MISSING: "MISSING",
+    FLAG_INTERPOLATED: "INTERPOLATED",
+    FLAG_OUTLIER: "OUTLIER",
+}
+
+MISSING_VALUE_TREATMENTS = ("interpolate", "zero", "drop")
+
+
+def _is_power(unit: str, semantics: str) -> bool:
+    """Whether values must be integrated over time to become energy."""
+    # Energy units are always energy; power units given as
+    # ENERGY_PER_INTERVAL are read as their energy counterpart (kW -> kWh).
+    return semantics == "POWER" and unit not in ENERGY_UNITS
+
+
+def convert_to_mwh(value: float, unit: str, semantics: str, frequency_seconds: int) -> float:
+    """Convert a single value to MWh based on unit and semantics."""
+    factor = UNIT_FACTORS.get(unit, 1.0)
+    if _is_power(unit, semantics):
+        return value * factor * (frequency_seconds / 3600)
+    return value * factor
+
+
+def convert_to_mwh_array(
+    values: np.ndarray,
+    unit: str,
+    semantics: str,
+    interval_seconds: Any,
+) -> np.ndarray:
+    """
+    Convert a column of values to MWh.
+
+    Args:
+        values: Raw values (NaN marks missing)
+        unit: kW, MW, kWh or MWh
+        semantics: POWER or ENERGY_PER_INTERVAL
+        interval_seconds: Scalar interval or per-value interval array,
+            used only when power must be integrated to energy
+
+    Returns:
+        Array of energy values in MWh
+    """
+    values = np.asarray(values, dtype=np.float64)
+    factor = UNIT_FACTORS.get(unit, 1.0)
+    if _is_power(unit, semantics):
+        return values * (factor / 3600.0) * np.asarray(interval_seconds, dtype=np.float64)
+    return values * factor
+
+
+def datetimes_to_epoch(timestamps: List[datetime]) -> np.ndarray:
+    """Convert naive UTC datetimes to float epoch seconds."""
+    return np.array(timestamps, dtype="datetime64[us]").astype(np.int64) / 1e6
+
+
+def epoch_to_datetimes(epoch_seconds: np.ndarray) -> List[datetime]:
+    """Convert epoch seconds back to naive UTC datetimes."""
+    return np.asarray(epoch_seconds, dtype=np.int64).astype("datetime64[s]").astype(datetime).tolist()
+
+
+@dataclass
+class ConvertedSeries:
+    """Regular-interval series produced by the conversion engine"""
+    ts_epoch: np.ndarray
+    energy_mwh: np.ndarray
+    power_mw: Optional[np.ndarray]
+    original_value: np.ndarray
+    quality_flag: np.ndarray
+    counts: Dict[str, int] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.ts_epoch)
+
+    @classmethod
+    def empty(cls, with_power: bool = False) -> "ConvertedSeries":
+        return cls(
+            ts_epoch=np.empty(0, dtype=np.float64),
+            energy_mwh=np.empty(0, dtype=np.float64),
+            power_mw=np.empty(0, dtype=np.float64) if with_power else None,
+            original_value=np.empty(0, dtype=np.float64),
+            quality_flag=np.empty(0, dtype=np.int8),
+        )
+
+    def to_records(self) -> List[Dict[str, Any]]:
+        """Row dictionaries for bulk insertion."""
+        timestamps = epoch_to_datetimes(self.ts_epoch)
+        energy = self.energy_mwh.tolist()
+        original = [None if np.isnan(v) else v for v in self.original_value.tolist()]
+        power = self.power_mw.tolist() if self.power_mw is not None else [None] * len(timestamps)
+        flags = [QUALITY_FLAGS[f] for f in self.quality_flag.tolist()]
+        return [
+            {
+                "ts_utc": ts,
+                "energy_mwh": e,
+                "power_mw": None if flag == "MISSING" else p,
+                "original_value": o,
+                "quality_flag": flag,
+            }
+            for ts, e, p, o, flag in zip(timestamps, energy, power, original, flags)
+        ]
+
+
+class GenerationConverter:
+    """
+    Vectorized conversion of raw generation columns to a regular MWh series.
+
+    A single pass converts units, sums raw samples into buckets of
+    ``frequency_seconds`` (integrating power over each sample's own
+    interval), lays the buckets on a regular grid and applies the
+    missing-value treatment.
+
+    Data can be pushed in chunks. Rows in the last, possibly incomplete,
+    bucket and any trailing gap are carried over to the next push so
+    chunk boundaries do not change the result. Rows arriving after their
+    bucket was emitted are dropped and counted in ``late_rows``, since
+    re-emitting the bucket would overwrite the rows already written.
+
+    Usage:
+        converter = GenerationConverter("kW", "POWER", 900, "interpolate")
+        series = converter.push(ts_epoch, values)
+        tail = converter.finish()
+    """
+
+    def __init__(
+        self,
+        unit: str,
+        semantics: str,
+        frequency_seconds: int,
+        missing_value_treatment: str = "interpolate",
+    ):
+        if frequency_seconds <= 0:
+            raise ValueError("frequency_seconds must be positive")
+        if missing_value_treatment not in MISSING_VALUE_TREATMENTS:
+            raise ValueError(f"Invalid missing_value_treatment: {missing_value_treatment}")
+
+        self.unit = unit
+        self.semantics = semantics
+        self.frequency = float(frequency_seconds)
+        self.treatment = missing_value_treatment
+        self.is_power = _is_power(unit, semantics)
+
+        # Raw rows held back for the next push
+        self._carry_ts = np.empty(0, dtype=np.float64)
+        self._carry_values = np.empty(0, dtype=np.float64)
+
+        # Last bucket emitted and last valid (bucket, mwh) for interpolation
+        self._last_bucket: Optional[float] = None
+        self._last_valid: Optional[tuple] = None
+
+        # Rows dropped because their bucket had already been emitted
+        self.late_rows = 0
+
+        # Median spacing of the raw samples, kept for chunks too short to measure it
+        self._source_interval: Optional[float] = None
+
+    def push(self, ts_epoch: np.ndarray, values: np.ndarray) -> ConvertedSeries:
+        """Convert a chunk, returning the buckets that are final."""
+        ts = np.concatenate([self._carry_ts, np.asarray(ts_epoch, dtype=np.float64)])
+        vals = np.concatenate([self._carry_values, np.asarray(values, dtype=np.float64)])
+        return self._convert(ts, vals, final=False)
+
+    def finish(self) -> ConvertedSeries:
+        """Flush all carried rows at end of input."""
+        return self._convert(self._carry_ts, self._carry_values, final=True)
+
+    def convert(self, ts_epoch: np.ndarray, values: np.ndarray) -> ConvertedSeries:
+        """Convert a complete column in one call."""
+        head = self.push(ts_epoch, values)
+        tail = self.finish()
+        return _concat_series(head, tail)
+
+    def _convert(self, ts: np.ndarray, vals: np.ndarray, final: bool) -> ConvertedSeries:
+        if len(ts) == 0:
+            return ConvertedSeries.empty(self.is_power)
+
+        order = np.argsort(ts, kind="stable")
+        ts = ts[order]
+        vals = vals[order]
+        buckets = np.floor(ts / self.frequency) * self.frequency
+
+        # Buckets up to _last_bucket are final; drop rows that arrive for them
+        if self._last_bucket is not None and buckets[0] <= self._last_bucket:
+            late = int(np.searchsorted(buckets, self._last_bucket, side="right"))
+            self.late_rows += late
+            ts, vals, buckets = ts[late:], vals[late:], buckets[late:]
+            if len(ts) == 0:
+                self._carry_ts, self._carry_values = ts, vals
+                return ConvertedSeries.empty(self.is_power)
+
+        # Hold back the last bucket: more samples for it may follow
+        if final:
+            cut = len(ts)
+        else:
+            cut = int(np.searchsorted(buckets, buckets[-1], side="left"))
+
+        # Power samples are integrated over the time to the next sample,
+        # capped at the sample spacing so gaps do not smear energy across
+        # them; the last sample covers one spacing as well
+        if self.is_power:
+            diffs = np.diff(ts)
+            steps = diffs[diffs > 0]
+            if len(steps):
+                self._source_interval = float(np.median(steps))
+            cap = min(self._source_interval or self.frequency, self.frequency)
+            dt = np.empty(len(ts), dtype=np.float64)
+            dt[:-1] = np.minimum(diffs, cap)
+            dt[-1] = cap
+            energy = convert_to_mwh_array(vals, self.unit, self.semantics, dt)
+        else:
+            energy = convert_to_mwh_array(vals, self.unit, self.semantics, self.frequency)
+
+        self._carry_ts = ts[cut:]
+        self._carry_values = vals[cut:]
+        if cut == 0:
+            return ConvertedSeries.empty(self.is_power)
+
+        buckets, energy, vals = buckets[:cut], energy[:cut], vals[:cut]
+
+        # Sum samples per bucket; a bucket with no valid samples is missing
+        unique_buckets, inverse = np.unique(buckets, return_inverse=True)
+        valid = ~np.isnan(vals)
+        bucket_energy = np.bincount(inverse, weights=np.where(valid, energy, 0.0), minlength=len(unique_buckets))
+        bucket_raw = np.bincount(inverse, weights=np.where(valid, vals, 0.0), minlength=len(unique_buckets))
+        valid_count = np.bincount(inverse, weights=valid.astype(np.float64), minlength=len(unique_buckets))
+        has_data = valid_count > 0
+        bucket_energy[~has_data] = np.nan
+
+        # Power is reported as the mean sample; energy as the interval total
+        if self.is_power:
+            bucket_raw = np.divide(bucket_raw, valid_count, out=np.full_like(bucket_raw, np.nan), where=has_data)
+        else:
+            bucket_raw[~has_data] = np.nan
+
+        if self.treatment == "drop":
+            grid = unique_buckets[has_data]
+            grid_energy = bucket_energy[has_data]
+            grid_raw = bucket_raw[has_data]
+        else:
+            start = unique_buckets[0] if self._last_bucket is None else self._last_bucket + self.frequency
+            grid = np.arange(start, unique_buckets[-1] + self.frequency / 2, self.frequency)
+            slot = np.rint((unique_buckets - grid[0]) / self.frequency).astype(np.int64)
+            grid_energy = np.full(len(grid), np.nan)
+            grid_raw = np.full(len(grid), np.nan)
+            grid_energy[slot] = bucket_energy
+            grid_raw[slot] = bucket_raw
+
+        series = self._treat_missing(grid, grid_energy, grid_raw, final)
+        if len(series):
+            self._last_bucket = float(series.ts_epoch[-1])
+        return series
+
+    def _treat_missing(self, grid, energy, raw, final: bool) -> ConvertedSeries:
+        """Apply the missing-value treatment to a regular grid."""
+        missing = np.isnan(energy)
+        flags = np.where(missing, FLAG_MISSING, FLAG_OK).astype(np.int8)
+        counts = {"missing": int(missing.sum()), "interpolated": 0}
+
+        if self.treatment == "interpolate" and missing.any():
+            valid_idx = np.flatnonzero(~missing)
+            if not final and len(valid_idx):
+                # A trailing gap waits for its right-hand neighbour
+                keep = valid_idx[-1] + 1
+                grid, energy, raw, flags, missing = grid[:keep], energy[:keep], raw[:keep], flags[:keep], missing[:keep]
+                counts["missing"] = int(missing.sum())
+            elif not final:
+                grid = grid[:0]
+                energy, raw, flags, missing = energy[:0], raw[:0], flags[:0], missing[:0]
+                counts["missing"] = 0
+
+            xp = grid[~missing]
+            fp = energy[~missing]
+            if self._last_valid is not None:
+                xp = np.concatenate([[self._last_valid[0]], xp])
+                fp = np.concatenate([[self._last_valid[1]], fp])
+
+            if len(xp):
+                # Only gaps with neighbours on both sides are interpolated
+                inside = missing & (grid > xp[0]) & (grid < xp[-1])
+                energy[inside] = np.interp(grid[inside], xp, fp)
+                flags[inside] = FLAG_INTERPOLATED
+                counts["interpolated"] = int(inside.sum())
+
+        valid_now = flags != FLAG_MISSING
+        if valid_now.any():
+            last = np.flatnonzero(valid_now)[-1]
+            self._last_valid = (float(grid[last]), float(energy[last]))
+
+        energy = np.where(flags == FLAG_MISSING, 0.0, energy)
+        power = energy * (3600.0 / self.frequency) if self.is_power else None
+
+        return ConvertedSeries(
+            ts_epoch=grid,
+            energy_mwh=energy,
+            power_mw=power,
+            original_value=raw,
+            quality_flag=flags,
+            counts=counts,
+        )
+
+
+def _concat_series(*parts: ConvertedSeries) -> ConvertedSeries:
+    """Join converted chunks into one series."""
+    parts = [p for p in parts if len(p)] or [parts[0]]
+    with_power = parts[0].power_mw is not None
+    counts: Dict[str, int] = {}
+    for p in parts:
+        for key, value in p.counts.items():
+            counts[key] = counts.get(key, 0) + value
+    return ConvertedSeries(
+        ts_epoch=np.concatenate([p.ts_epoch for p in parts]),
+        energy_mwh=np.concatenate([p.energy_mwh for p in parts]),
+        power_mw=np.concatenate([p.power_mw for p in parts]) if with_power else None,
+        original_value=np.concatenate([p.original_value for p in parts]),
+        quality_flag=np.concatenate([p.quality_flag for p in parts]),
+        counts=counts,
+    )
+
+
+def convert_series(
+    ts_epoch: np.ndarray,
+    values: np.ndarray,
+    unit: str,
+    semantics: str,
+    frequency_seconds: int,
+    missing_value_treatment: str = "interpolate",
+) -> ConvertedSeries:
+    """
+    Convert a whole generation column to a regular MWh series.
+
+    Args:
+        ts_epoch: UTC timestamps as epoch seconds
+        values: Raw values (NaN marks missing)
+        unit: kW, MW, kWh or MWh
+        semantics: POWER or ENERGY_PER_INTERVAL
+        frequency_seconds: Target interval
+        missing_value_treatment: interpolate, zero or drop
+
+    Returns:
+        ConvertedSeries on a regular grid
+    """
+    converter = GenerationConverter(unit, semantics, frequency_seconds, missing_value_treatment)
+    return converter.convert(ts_epoch, values)
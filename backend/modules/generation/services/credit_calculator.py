@@ -2,13 +2,20 @@
 Credit Calculator Service
 Core calculation engine for carbon credit estimation
 """
-from typing import List, Dict, Any, Optional
+import copy
+from typing import List, Dict, Any, Optional, Tuple
 from datetime import datetime
 from collections import defaultdict
 
+import numpy as np
+
 from ..methodologies.registry import MethodologyRegistry
 from ..methodologies.base import MethodologyResult
 from ..grid_ef_database import get_grid_ef, GridEFData
+from .aggregation import bucket_by_month, bucket_generation_data
+from .ef_series import EFSeries
+from .estimate_cache import quantize, quick_estimate_cache
+from .incremental import ef_version
 
 
 class CreditCalculator:
@@ -56,21 +63,119 @@ class CreditCalculator:
         Returns:
             Dictionary with estimation results, breakdowns, and metadata
         """
-        # Get grid emission factor
-        if ef_override is not None:
-            ef_grid = ef_override
-            ef_source = "Manual override"
-            ef_year = datetime.now().year
-        else:
-            ef_data = get_grid_ef(country_code, region_code)
-            if not ef_data:
-                raise ValueError(f"No emission factor data for country: {country_code}")
-            ef_grid = ef_data.combined_margin
-            ef_source = ef_data.source_name
-            ef_year = ef_data.data_year
+        return self.calculate_from_monthly(
+            monthly_generation=bucket_generation_data(generation_data),
+            country_code=country_code,
+            project_type=project_type,
+            ef_override=ef_override,
+            region_code=region_code,
+            additional_inputs=additional_inputs,
+        )
+    
+    def calculate_from_monthly(
+        self,
+        monthly_generation: Dict[str, float],
+        country_code: str,
+        project_type: str,
+        ef_override: Optional[float] = None,
+        region_code: Optional[str] = None,
+        additional_inputs: Optional[Dict[str, Any]] = None,
+        ef_series: Optional[EFSeries] = None,
+        grid_ef: Optional[Tuple[float, str, int]] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate emission reductions from pre-aggregated monthly generation.
+        
+        The cost of this step depends on the number of months, not on the
+        number of raw timeseries rows behind them.
         
+        Args:
+            monthly_generation: {"YYYY-MM": MWh}, e.g. from monthly_generation()
+            country_code: ISO country code for grid EF lookup
+            project_type: Type of renewable energy project
+            ef_override: Optional manual EF value (overrides database lookup)
+            region_code: Optional region code for sub-national grids
+            additional_inputs: Additional methodology-specific inputs
+            ef_series: Optional time-varying EF; each month uses the factor
+                in effect at its start (use calculate_from_series() for
+                factors that change within a month)
+            grid_ef: Optional (EF, source, year) from resolve_grid_ef(),
+                so worker processes need no database lookup
+            
+        Returns:
+            Dictionary with estimation results, breakdowns, and metadata
+        """
+        monthly_ef = ef_series.monthly_factors(list(monthly_generation)) if ef_series else None
+        return self._calculate(
+            monthly_generation, monthly_ef, ef_series, country_code, project_type,
+            ef_override, region_code, additional_inputs, grid_ef,
+        )
+    
+    def calculate_from_series(
+        self,
+        timestamps: Any,
+        energy: Any,
+        country_code: str,
+        project_type: str,
+        ef_override: Optional[float] = None,
+        region_code: Optional[str] = None,
+        additional_inputs: Optional[Dict[str, Any]] = None,
+        ef_series: Optional[EFSeries] = None
+    ) -> Dict[str, Any]:
+        """
+        Calculate emission reductions from a raw generation timeseries.
+        
+        With an EF series, every reading is as-of merged with the factor in
+        effect at its timestamp before monthly aggregation, so hourly
+        marginal factors are applied exactly without a Python loop.
+        
+        Args:
+            timestamps: datetime64 array, e.g. from load_generation_series()
+            energy: MWh per timestamp
+            country_code: ISO country code for grid EF lookup
+            project_type: Type of renewable energy project
+            ef_override: Optional manual EF value (overrides database lookup)
+            region_code: Optional region code for sub-national grids
+            additional_inputs: Additional methodology-specific inputs
+            ef_series: Optional time-varying EF (annual, monthly or hourly)
+            
+        Returns:
+            Dictionary with estimation results, breakdowns, and metadata
+        """
+        if ef_series is None:
+            monthly_generation, monthly_ef = bucket_by_month(timestamps, energy), None
+        else:
+            monthly_generation, monthly_ef = ef_series.weighted_monthly(timestamps, energy)
+        return self._calculate(
+            monthly_generation, monthly_ef, ef_series, country_code, project_type,
+            ef_override, region_code, additional_inputs,
+        )
+    
+    def _calculate(
+        self,
+        monthly_generation: Dict[str, float],
+        monthly_ef: Optional[Dict[str, float]],
+        ef_series: Optional[EFSeries],
+        country_code: str,
+        project_type: str,
+        ef_override: Optional[float],
+        region_code: Optional[str],
+        additional_inputs: Optional[Dict[str, Any]],
+        grid_ef: Optional[Tuple[float, str, int]] = None
+    ) -> Dict[str, Any]:
+        """Shared calculation for a single EF or per-month factors."""
         # Calculate total generation
-        total_generation = sum(item.get("energy_mwh", 0) for item in generation_data)
+        total_generation = sum(monthly_generation.values())
+        
+        # Get grid emission factor; a varying EF enters the methodology as its generation-weighted mean
+        if monthly_ef:
+            ef_grid = self._weighted_ef(monthly_generation, monthly_ef)
+            ef_source = ef_series.source
+            ef_year = ef_series.year_at(np.datetime64(max(monthly_generation), "us"))
+        elif ef_series is not None:
+            ef_grid, ef_source, ef_year = float(ef_series.values[-1]), ef_series.source, ef_series.year_at(ef_series.starts[-1])
+        else:
+            ef_grid, ef_source, ef_year = grid_ef or self.resolve_grid_ef(country_code, region_code, ef_override)
         
         # Prepare inputs for methodology with sensible defaults for all methodologies
         inputs = {
@@ -93,10 +198,10 @@ class CreditCalculator:
         result = self.methodology.compute_emission_reductions(inputs)
         
         # Calculate monthly breakdown
-        monthly_breakdown = self._calculate_monthly_breakdown(generation_data, ef_grid)
+        monthly_breakdown = self._calculate_monthly_breakdown(monthly_generation, ef_grid, monthly_ef)
         
         # Calculate annual breakdown
-        annual_breakdown = self._calculate_annual_breakdown(generation_data, ef_grid)
+        annual_breakdown = self._calculate_annual_breakdown(monthly_generation, ef_grid, monthly_ef)
         
         # Build comprehensive result
         return {
@@ -131,6 +236,26 @@ class CreditCalculator:
             "methodology_info": self.methodology.get_info(),
         }
     
+    @staticmethod
+    def resolve_grid_ef(
+        country_code: str,
+        region_code: Optional[str] = None,
+        ef_override: Optional[float] = None
+    ) -> Tuple[float, str, int]:
+        """
+        Grid emission factor used for a calculation.
+        
+        Returns:
+            Tuple of (EF in tCO2/MWh, source name, data year)
+        """
+        if ef_override is not None:
+            return ef_override, "Manual override", datetime.now().year
+        
+        ef_data = get_grid_ef(country_code, region_code)
+        if not ef_data:
+            raise ValueError(f"No emission factor data for country: {country_code}")
+        return ef_data.combined_margin, ef_data.source_name, ef_data.data_year
+    
     def calculate_simple(
         self,
         total_generation_mwh: float,
@@ -141,6 +266,10 @@ class CreditCalculator:
         """
         Simple calculation from total generation (no monthly breakdown).
         
+        Results are cached per (generation, country, project type,
+        methodology, EF version); generation values that agree to
+        QUICK_ESTIMATE_SIGNIFICANT_DIGITS share an entry.
+        
         Args:
             total_generation_mwh: Total electricity generated (MWh)
             country_code: ISO country code
@@ -150,69 +279,69 @@ class CreditCalculator:
         Returns:
             Dictionary with estimation results
         """
-        generation_data = [
-            {"timestamp": datetime.utcnow().isoformat(), "energy_mwh": total_generation_mwh}
-        ]
-        return self.calculate(
-            generation_data=generation_data,
+        key = (
+            quantize(total_generation_mwh),
+            country_code,
+            project_type,
+            self.methodology.id,
+            ef_version(*self.resolve_grid_ef(country_code, ef_override=ef_override)),
+        )
+        result = quick_estimate_cache.get_or_compute(key, lambda: self.calculate(
+            generation_data=[
+                {"timestamp": datetime.utcnow().isoformat(), "energy_mwh": total_generation_mwh}
+            ],
             country_code=country_code,
             project_type=project_type,
             ef_override=ef_override
-        )
+        ))
+        result = copy.deepcopy(result)
+        # Cached results are stamped with the time they are served
+        result["calculation_date"] = datetime.utcnow().isoformat()
+        return result
+    
+    @staticmethod
+    def _weighted_ef(monthly_generation: Dict[str, float], monthly_ef: Dict[str, float]) -> float:
+        """Generation-weighted mean of per-month factors (plain mean without generation)."""
+        total_generation = sum(monthly_generation.values())
+        if total_generation > 0:
+            return sum(gen * monthly_ef[month] for month, gen in monthly_generation.items()) / total_generation
+        return sum(monthly_ef.values()) / len(monthly_ef)
     
     def _calculate_monthly_breakdown(
         self,
-        generation_data: List[Dict[str, Any]],
-        ef_grid: float
+        monthly_generation: Dict[str, float],
+        ef_grid: float,
+        monthly_ef: Optional[Dict[str, float]] = None
     ) -> List[Dict[str, Any]]:
         """Calculate emission reductions by month."""
-        monthly = defaultdict(float)
-        
-        for item in generation_data:
-            ts = item.get("timestamp")
-            if ts:
-                if isinstance(ts, str):
-                    ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                key = ts.strftime("%Y-%m")
-            else:
-                # If no timestamp, use current month
-                key = datetime.utcnow().strftime("%Y-%m")
-            
-            monthly[key] += item.get("energy_mwh", 0)
-        
         return [
             {
                 "month": month,
                 "generation_mwh": round(gen, 4),
-                "emission_reductions_tco2e": round(gen * ef_grid, 4)
+                "emission_reductions_tco2e": round(gen * (monthly_ef[month] if monthly_ef else ef_grid), 4)
             }
-            for month, gen in sorted(monthly.items())
+            for month, gen in sorted(monthly_generation.items())
         ]
     
     def _calculate_annual_breakdown(
         self,
-        generation_data: List[Dict[str, Any]],
-        ef_grid: float
+        monthly_generation: Dict[str, float],
+        ef_grid: float,
+        monthly_ef: Optional[Dict[str, float]] = None
     ) -> List[Dict[str, Any]]:
         """Calculate emission reductions by year (vintage)."""
         annual = defaultdict(float)
+        reductions = defaultdict(float)
         
-        for item in generation_data:
-            ts = item.get("timestamp")
-            if ts:
-                if isinstance(ts, str):
-                    ts = datetime.fromisoformat(ts.replace("Z", "+00:00"))
-                year = ts.year
-            else:
-                year = datetime.utcnow().year
-            
-            annual[year] += item.get("energy_mwh", 0)
+        for month, gen in monthly_generation.items():
+            annual[int(month[:4])] += gen
+            reductions[int(month[:4])] += gen * (monthly_ef[month] if monthly_ef else ef_grid)
         
         return [
             {
                 "vintage": year,
                 "generation_mwh": round(gen, 4),
-                "emission_reductions_tco2e": round(gen * ef_grid, 4)
+                "emission_reductions_tco2e": round(reductions[year], 4)
             }
             for year, gen in sorted(annual.items())
         ]
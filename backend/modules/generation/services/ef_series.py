@@ -0,0 +1,124 @@
+"""
+Time-Varying Grid Emission Factors
+Annual, monthly or hourly grid EF series joined against generation with a vectorized as-of merge
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Sequence, Tuple, Union
+
+import numpy as np
+
+
+class EFSeries:
+    """
+    Grid emission factor that changes over time.
+
+    Each value holds from its start until the next value's start; the
+    first value also covers anything before it. Starts may be years
+    ("2024"), months ("2024-03") or timestamps ("2024-03-01T13:00").
+
+    Usage:
+        series = EFSeries.from_points([("2023", 0.74), ("2024", 0.71)])
+        factors = series.at(timestamps)
+        monthly, monthly_ef = series.weighted_monthly(timestamps, energy)
+    """
+
+    def __init__(self, starts: np.ndarray, values: np.ndarray, source: str = "Time-varying grid EF"):
+        order = np.argsort(starts, kind="stable")
+        self.starts = starts[order].astype("datetime64[us]")
+        self.values = values[order].astype(np.float64)
+        self.source = source
+
+    @classmethod
+    def from_points(
+        cls,
+        points: Sequence[Tuple[Union[str, datetime], float]],
+        source: str = "Time-varying grid EF",
+    ) -> "EFSeries":
+        """
+        Build a series from (start, EF in tCO2/MWh) pairs.
+
+        Raises:
+            ValueError: For an empty series, unparseable or duplicate starts,
+                or negative factors
+        """
+        if not points:
+            raise ValueError("EF timeseries must contain at least one value")
+        starts = np.array([_parse_start(start) for start, _ in points], dtype="datetime64[us]")
+        values = np.array([float(value) for _, value in points], dtype=np.float64)
+        if (values < 0).any():
+            raise ValueError("EF timeseries values must be non-negative")
+        if len(np.unique(starts)) != len(starts):
+            raise ValueError("EF timeseries contains duplicate periods")
+        return cls(starts, values, source)
+
+    @property
+    def is_sub_monthly(self) -> bool:
+        """True when some value starts inside a month, so monthly totals cannot be weighted exactly."""
+        return bool((self.starts != self.starts.astype("datetime64[M]").astype("datetime64[us]")).any())
+
+    def at(self, timestamps: np.ndarray) -> np.ndarray:
+        """Factor in effect at each timestamp (as-of merge)."""
+        index = np.searchsorted(self.starts, timestamps.astype("datetime64[us]"), side="right") - 1
+        return self.values[np.maximum(index, 0)]
+
+    def year_at(self, timestamp: np.datetime64) -> int:
+        """Calendar year of the value in effect at a timestamp."""
+        index = max(int(np.searchsorted(self.starts, timestamp, side="right")) - 1, 0)
+        return int(self.starts[index].astype("datetime64[Y]").astype(int)) + 1970
+
+    def monthly_factors(self, months: List[str]) -> Dict[str, float]:
+        """Factor in effect at the start of each "YYYY-MM" month."""
+        if not months:
+            return {}
+        factors = self.at(np.array(months, dtype="datetime64[M]"))
+        return {month: float(ef) for month, ef in zip(months, factors)}
+
+    def weighted_monthly(
+        self,
+        timestamps: np.ndarray,
+        energy: np.ndarray,
+    ) -> Tuple[Dict[str, float], Dict[str, float]]:
+        """
+        Monthly generation and generation-weighted monthly factors.
+
+        Every reading is matched to the factor in effect at its timestamp,
+        then generation and generation × EF are summed per month in one
+        pass, so hourly factors are applied exactly.
+
+        Returns:
+            ({"YYYY-MM": MWh}, {"YYYY-MM": tCO2/MWh}) in chronological order
+        """
+        if not len(timestamps):
+            return {}, {}
+        months = timestamps.astype("datetime64[M]")
+        keys, inverse = np.unique(months, return_inverse=True)
+        generation = np.bincount(inverse, weights=energy, minlength=len(keys))
+        emissions = np.bincount(inverse, weights=energy * self.at(timestamps), minlength=len(keys))
+        # Months without generation keep the factor in effect at their start
+        factors = np.where(
+            generation > 0,
+            emissions / np.where(generation > 0, generation, 1.0),
+            self.at(keys),
+        )
+        labels = [str(key) for key in keys]
+        return (
+            {label: float(g) for label, g in zip(labels, generation)},
+            {label: float(f) for label, f in zip(labels, factors)},
+        )
+
+
+def _parse_start(start: Union[str, datetime]) -> np.datetime64:
+    """Start of a period given as "YYYY", "YYYY-MM", an ISO timestamp or a datetime (naive = UTC)."""
+    if not isinstance(start, datetime):
+        text = str(start).strip()
+        try:
+            if len(text) == 4:
+                return np.datetime64(f"{text}-01-01", "us")
+            if len(text) == 7:
+                return np.datetime64(f"{text}-01", "us")
+            start = datetime.fromisoformat(text.replace("Z", "+00:00"))
+        except ValueError:
+            raise ValueError(f"Invalid EF timeseries period: {start}")
+    if start.tzinfo is not None:
+        start = start.astimezone(timezone.utc).replace(tzinfo=None)
+    return np.datetime64(start, "us")
@@ -0,0 +1,86 @@
+"""
+Estimate Cache
+In-process LRU/TTL cache for repeated preview estimations
+"""
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable
+
+
+QUICK_ESTIMATE_CACHE_SIZE = int(os.environ.get("QUICK_ESTIMATE_CACHE_SIZE", "2048"))
+QUICK_ESTIMATE_CACHE_TTL = float(os.environ.get("QUICK_ESTIMATE_CACHE_TTL", "600"))
+
+# Generation values agreeing to this many significant digits share a cache entry
+QUICK_ESTIMATE_SIGNIFICANT_DIGITS = int(os.environ.get("QUICK_ESTIMATE_SIGNIFICANT_DIGITS", "6"))
+
+
+class TTLCache:
+    """
+    Thread-safe LRU cache whose entries also expire after a fixed time.
+
+    Usage:
+        cache = TTLCache(maxsize=1024, ttl=600)
+        value = cache.get_or_compute(key, lambda: expensive(...))
+        cache.stats()  # {"hits": ..., "misses": ..., ...}
+    """
+
+    def __init__(self, maxsize: int, ttl: float):
+        self.maxsize = maxsize
+        self.ttl = ttl
+        self.hits = 0
+        self.misses = 0
+        self._entries: "OrderedDict[Hashable, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get_or_compute(self, key: Hashable, compute: Callable[[], Any]) -> Any:
+        """
+        Cached value for a key, computing and storing it on a miss.
+
+        Exceptions from compute propagate and nothing is stored.
+        """
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[0] > now:
+                self._entries.move_to_end(key)
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+
+        # Computed outside the lock; concurrent misses for one key may both compute
+        value = compute()
+        with self._lock:
+            self._entries[key] = (now + self.ttl, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+        return value
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.hits = 0
+            self.misses = 0
+
+    def stats(self) -> Dict[str, Any]:
+        """Hit/miss counters and occupancy."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else None,
+                "size": len(self._entries),
+                "maxsize": self.maxsize,
+                "ttl_seconds": self.ttl,
+            }
+
+
+def quantize(value: float, digits: int = QUICK_ESTIMATE_SIGNIFICANT_DIGITS) -> float:
+    """Round to significant digits, so nearly identical inputs share a cache key."""
+    return float(f"{value:.{digits}g}")
+
+
+quick_estimate_cache = TTLCache(QUICK_ESTIMATE_CACHE_SIZE, QUICK_ESTIMATE_CACHE_TTL)
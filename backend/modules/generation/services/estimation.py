@@ -0,0 +1,107 @@
+"""
+Credit Estimation Service
+Runs a project's credit estimation and stores the result, for requests and background tasks
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from ..models import CreditEstimation
+from .archive import load_generation_series
+from .credit_calculator import CreditCalculator
+from .ef_series import EFSeries
+from .incremental import IncrementalEstimator
+
+
+NO_DATA_MESSAGE = "No generation data found. Please upload and process data first."
+
+
+def estimate_project_credits(
+    db: Session,
+    project_id: int,
+    project_type: str,
+    methodology_id: str,
+    country_code: str,
+    ef_value: Optional[float] = None,
+    ef_timeseries: Optional[List[Tuple[str, float]]] = None,
+    period_start: Optional[datetime] = None,
+    period_end: Optional[datetime] = None,
+    additional_inputs: Optional[Dict[str, Any]] = None,
+    created_by: Optional[int] = None,
+) -> CreditEstimation:
+    """
+    Estimate credits from a project's processed generation and save the result.
+
+    Monthly totals come from the incremental estimator, so only months
+    changed since the last run are read again. A time-varying EF that
+    changes within months is merged against the raw readings instead.
+
+    Args:
+        db: Database session
+        project_id: Project to estimate
+        project_type: The project's type, for methodology applicability
+        methodology_id: Methodology to apply
+        country_code: ISO country code for grid EF lookup
+        ef_value: Optional EF override (tCO2/MWh)
+        ef_timeseries: Optional (period, EF) pairs; replaces ef_value
+        period_start: Optional start of the crediting period
+        period_end: Optional end of the crediting period
+        additional_inputs: Methodology-specific inputs
+        created_by: ID of the requesting user
+
+    Returns:
+        The stored CreditEstimation
+
+    Raises:
+        ValueError: For invalid inputs or when there is no generation data
+    """
+    calculator = CreditCalculator(methodology_id)
+    ef_series = EFSeries.from_points(ef_timeseries) if ef_timeseries else None
+
+    calculation_args = dict(
+        country_code=country_code,
+        project_type=project_type,
+        ef_override=ef_value,
+        additional_inputs=additional_inputs,
+        ef_series=ef_series,
+    )
+
+    if ef_series is not None and ef_series.is_sub_monthly:
+        # Factors change within months: merge them against the raw readings
+        timestamps, energy = load_generation_series(db, project_id, period_start, period_end)
+        if not len(timestamps):
+            raise ValueError(NO_DATA_MESSAGE)
+        result = calculator.calculate_from_series(timestamps, energy, **calculation_args)
+    else:
+        # Monthly generation totals; only months changed since the last run are recomputed
+        monthly = IncrementalEstimator(db).monthly_generation(project_id, period_start, period_end)
+        if not monthly:
+            raise ValueError(NO_DATA_MESSAGE)
+        result = calculator.calculate_from_monthly(monthly_generation=monthly, **calculation_args)
+
+    estimation = CreditEstimation(
+        project_id=project_id,
+        methodology_id=methodology_id,
+        registry=result["registry"],
+        country_code=country_code,
+        grid_ef_value=result["ef_value"],
+        grid_ef_source=result["ef_source"],
+        grid_ef_year=result["ef_year"],
+        total_generation_mwh=result["total_generation_mwh"],
+        total_er_tco2e=result["total_er_tco2e"],
+        baseline_emissions_tco2e=result["baseline_emissions_tco2e"],
+        project_emissions_tco2e=result["project_emissions_tco2e"],
+        leakage_tco2e=result["leakage_tco2e"],
+        monthly_breakdown=result["monthly_breakdown"],
+        annual_breakdown=result["annual_breakdown"],
+        calculation_inputs=additional_inputs,
+        assumptions=result["assumptions"],
+        period_start=period_start,
+        period_end=period_end,
+        created_by=created_by,
+    )
+    db.add(estimation)
+    db.commit()
+    db.refresh(estimation)
+    return estimation
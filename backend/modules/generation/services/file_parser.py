@@ -0,0 +1,515 @@
+"""
+Generation File Parser
+Bounded-memory readers and column profiling for uploaded generation files
+"""
+import csv
+import codecs
+import io
+import zipfile
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from xml.etree import ElementTree
+
+import numpy as np
+
+from .type_inference import infer_column
+
+
+# Bytes sampled from the head of a file to pick encoding and delimiter
+HEAD_SAMPLE_BYTES = 64 * 1024
+
+# Block size for the raw byte scan that counts rows and nulls
+SCAN_BLOCK_BYTES = 4 * 1024 * 1024
+
+# Data rows kept in a column profile
+PROFILE_PREVIEW_ROWS = 100
+
+# Sample values shown per column
+SAMPLE_VALUES = 5
+
+CSV_DELIMITERS = ",;\t|"
+
+_XLSX_NS = "http://schemas.openxmlformats.org/spreadsheetml/2006/main"
+_XLSX_REL_NS = "http://schemas.openxmlformats.org/officeDocument/2006/relationships"
+_OLE2_SIGNATURE = b"\xd0\xcf\x11\xe0\xa1\xb1\x1a\xe1"
+
+_NEWLINE = ord("\n")
+_CR = ord("\r")
+
+
+def _read_head(file_path: str) -> bytes:
+    with open(file_path, "rb") as f:
+        return f.read(HEAD_SAMPLE_BYTES)
+
+
+def detect_encoding(file_path: str, head: Optional[bytes] = None) -> str:
+    """Pick a text encoding from a bounded sample of the file head."""
+    sample = head if head is not None else _read_head(file_path)
+
+    if sample.startswith(codecs.BOM_UTF8):
+        return "utf-8-sig"
+    try:
+        # final=False tolerates a multi-byte character cut at the sample edge
+        codecs.getincrementaldecoder("utf-8")().decode(sample, final=False)
+        return "utf-8"
+    except UnicodeDecodeError:
+        return "latin-1"
+
+
+def detect_delimiter(file_path: str, head: Optional[bytes] = None) -> str:
+    """Sniff the CSV delimiter from the file head, defaulting to a comma."""
+    sample = head if head is not None else _read_head(file_path)
+    text = sample.decode("latin-1")
+    # Only sniff whole lines so a truncated last line does not skew the result
+    if "\n" in text:
+        text = text[:text.rfind("\n")]
+    try:
+        return csv.Sniffer().sniff(text, delimiters=CSV_DELIMITERS).delimiter
+    except csv.Error:
+        return ","
+
+
+def iter_csv_rows(file_path: str) -> Iterator[List[Any]]:
+    """Yield CSV rows one at a time without reading the whole file."""
+    head = _read_head(file_path)
+    encoding = detect_encoding(file_path, head)
+    delimiter = detect_delimiter(file_path, head)
+    with open(file_path, "r", encoding=encoding, errors="replace", newline="") as f:
+        for row in csv.reader(f, delimiter=delimiter):
+            yield row
+
+
+def is_excel_file(filename: str) -> bool:
+    filename_lower = filename.lower()
+    return filename_lower.endswith(".xlsx") or filename_lower.endswith(".xls")
+
+
+def list_excel_sheets(file_path: str) -> List[str]:
+    """Sheet names of a workbook in file order, without loading any cells."""
+    if _is_legacy_xls(file_path):
+        import xlrd
+
+        book = xlrd.open_workbook(file_path, on_demand=True)
+        try:
+            return book.sheet_names()
+        finally:
+            book.release_resources()
+
+    with zipfile.ZipFile(file_path) as zf:
+        return [name for name, _ in _xlsx_sheet_parts(zf)]
+
+
+def iter_excel_rows(file_path: str, sheet_name: Optional[str] = None) -> Iterator[List[Any]]:
+    """
+    Yield worksheet rows one at a time, starting at the first non-empty row.
+
+    XLSX is streamed with openpyxl read-only mode. Legacy XLS goes through
+    xlrd, loading only the selected sheet.
+
+    Args:
+        file_path: Path to the workbook
+        sheet_name: Sheet to read; defaults to the active (XLSX) or first (XLS) sheet
+    """
+    if _is_legacy_xls(file_path):
+        rows = _iter_xls_rows(file_path, sheet_name)
+    else:
+        rows = _iter_xlsx_rows(file_path, sheet_name)
+
+    started = False
+    for row in rows:
+        if not started:
+            if all(cell in (None, "") for cell in row):
+                continue
+            started = True
+        yield row
+
+
+def _iter_xlsx_rows(file_path: str, sheet_name: Optional[str]) -> Iterator[List[Any]]:
+    import openpyxl
+
+    wb = openpyxl.load_workbook(file_path, read_only=True, data_only=True)
+    try:
+        if sheet_name is None:
+            ws = wb.active
+        elif sheet_name in wb.sheetnames:
+            ws = wb[sheet_name]
+        else:
+            raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+        for row in ws.iter_rows(values_only=True):
+            yield list(row)
+    finally:
+        wb.close()
+
+
+def _iter_xls_rows(file_path: str, sheet_name: Optional[str]) -> Iterator[List[Any]]:
+    import xlrd
+
+    book = xlrd.open_workbook(file_path, on_demand=True)
+    try:
+        if sheet_name is None:
+            sheet = book.sheet_by_index(0)
+        elif sheet_name in book.sheet_names():
+            sheet = book.sheet_by_name(sheet_name)
+        else:
+            raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+
+        for r in range(sheet.nrows):
+            row = []
+            for cell in sheet.row(r):
+                if cell.ctype in (xlrd.XL_CELL_EMPTY, xlrd.XL_CELL_BLANK):
+                    row.append(None)
+                elif cell.ctype == xlrd.XL_CELL_DATE:
+                    row.append(xlrd.xldate.xldate_as_datetime(cell.value, book.datemode))
+                else:
+                    row.append(cell.value)
+            yield row
+    finally:
+        book.release_resources()
+
+
+def _is_legacy_xls(file_path: str) -> bool:
+    """True for BIFF (.xls) workbooks, identified by the OLE2 signature."""
+    with open(file_path, "rb") as f:
+        return f.read(8) == _OLE2_SIGNATURE
+
+
+def iter_file_rows(file_path: str, filename: str, sheet_name: Optional[str] = None) -> Iterator[List[Any]]:
+    """Yield raw rows (header included) from a CSV or Excel upload."""
+    if filename.lower().endswith(".csv"):
+        return iter_csv_rows(file_path)
+    if is_excel_file(filename):
+        return iter_excel_rows(file_path, sheet_name)
+    raise ValueError(f"Unsupported file format: {filename}")
+
+
+def profile_csv(file_path: str, preview_rows: int = PROFILE_PREVIEW_ROWS) -> Tuple[List[Dict[str, Any]], List[List[Any]], int]:
+    """
+    Profile a CSV file with bounded memory.
+
+    The header and the first rows are read through the csv module. Row and
+    null counts for the whole file come from a block-wise scan of the raw
+    bytes, which needs no decoding because delimiters and newlines are
+    ASCII in every supported encoding. Files containing quoted fields fall
+    back to a streaming csv.reader from the first block with a quote.
+
+    Args:
+        file_path: Path to the CSV file
+        preview_rows: Number of data rows to return
+
+    Returns:
+        Tuple of (columns, preview_rows, total_rows)
+    """
+    head = _read_head(file_path)
+    if not head.strip():
+        return [], [], 0
+
+    encoding = detect_encoding(file_path, head)
+    delimiter = detect_delimiter(file_path, head)
+
+    with open(file_path, "rb") as f:
+        text = io.TextIOWrapper(f, encoding=encoding, errors="replace", newline="")
+        reader = csv.reader(text, delimiter=delimiter)
+        headers = next(reader, [])
+        data_rows = []
+        for row in reader:
+            if not row:
+                continue
+            data_rows.append(row)
+            if len(data_rows) >= preview_rows:
+                break
+        text.detach()
+
+    num_columns = len(headers)
+    header_end = head.find(b"\n") + 1
+    if header_end == 0 or b'"' in head[:header_end]:
+        # Quoted or oversized header: its byte extent is unknown, use csv throughout
+        total_rows, null_counts = _count_with_csv(file_path, 0, encoding, delimiter, num_columns, skip_header=True)
+    else:
+        total_rows, null_counts = _count_with_bytes(file_path, header_end, encoding, delimiter, num_columns)
+
+    columns = []
+    for i, header in enumerate(headers):
+        values = [row[i] if i < len(row) else None for row in data_rows]
+        inferred_type, timestamp_format = infer_column(values)
+        columns.append({
+            "name": header,
+            "inferred_type": inferred_type,
+            "timestamp_format": timestamp_format,
+            "sample_values": values[:SAMPLE_VALUES],
+            "null_count": int(null_counts[i]),
+        })
+
+    return columns, data_rows, total_rows
+
+
+def profile_excel(
+    file_path: str,
+    preview_rows: int = PROFILE_PREVIEW_ROWS,
+    sheet_name: Optional[str] = None,
+) -> Tuple[List[Dict[str, Any]], List[List[Any]], int]:
+    """
+    Profile one worksheet of an Excel file with bounded memory.
+
+    Preview rows come from the streaming row reader. Row and null counts
+    are exact: XLSX sheet XML is scanned with iterparse, without building
+    cell objects; XLS sheets are counted from the loaded sheet.
+
+    Args:
+        file_path: Path to the workbook
+        preview_rows: Number of data rows to return
+        sheet_name: Sheet to profile; defaults to the active/first sheet
+
+    Returns:
+        Tuple of (columns, preview_rows, total_rows)
+    """
+    rows = []
+    row_iter = iter_excel_rows(file_path, sheet_name)
+    try:
+        for row in row_iter:
+            # Convert None values to empty strings for consistency
+            rows.append([str(cell) if cell is not None else "" for cell in row])
+            if len(rows) > preview_rows:  # Header + preview rows
+                break
+    finally:
+        row_iter.close()
+
+    if not rows:
+        return [], [], 0
+
+    headers = rows[0]
+    data_rows = rows[1:preview_rows + 1]
+
+    if _is_legacy_xls(file_path):
+        total_rows, null_counts = _count_xls_rows(file_path, sheet_name, len(headers))
+    else:
+        total_rows, null_counts = _count_xlsx_rows(file_path, sheet_name, len(headers))
+
+    columns = []
+    for i, header in enumerate(headers):
+        values = [row[i] if i < len(row) else "" for row in data_rows]
+        inferred_type, timestamp_format = infer_column(values)
+
+        columns.append({
+            "name": header if header else f"Column_{i+1}",
+            "inferred_type": inferred_type,
+            "timestamp_format": timestamp_format,
+            "sample_values": values[:SAMPLE_VALUES],
+            "null_count": int(null_counts[i]),
+        })
+
+    return columns, data_rows, total_rows
+
+
+def _xlsx_sheet_parts(zf: zipfile.ZipFile) -> List[Tuple[str, str]]:
+    """(sheet name, XML part path) pairs from the workbook manifest."""
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    rels = ElementTree.fromstring(zf.read("xl/_rels/workbook.xml.rels"))
+    targets = {rel.get("Id"): rel.get("Target") for rel in rels}
+
+    parts = []
+    for sheet in workbook.iter(f"{{{_XLSX_NS}}}sheet"):
+        target = targets.get(sheet.get(f"{{{_XLSX_REL_NS}}}id"), "")
+        path = target.lstrip("/") if target.startswith("/") else f"xl/{target}"
+        parts.append((sheet.get("name"), path))
+    return parts
+
+
+def _xlsx_active_sheet(zf: zipfile.ZipFile) -> int:
+    """Index of the active sheet as stored in the workbook view."""
+    workbook = ElementTree.fromstring(zf.read("xl/workbook.xml"))
+    view = workbook.find(f"{{{_XLSX_NS}}}bookViews/{{{_XLSX_NS}}}workbookView")
+    return int(view.get("activeTab", 0)) if view is not None else 0
+
+
+def _count_xlsx_rows(file_path: str, sheet_name: Optional[str], num_columns: int) -> Tuple[int, np.ndarray]:
+    """
+    Count data rows and empty cells by streaming the sheet XML.
+
+    The first non-empty row is the header, matching iter_excel_rows.
+    """
+    null_counts = np.zeros(num_columns, dtype=np.int64)
+    total_rows = 0
+    header_seen = False
+
+    with zipfile.ZipFile(file_path) as zf:
+        parts = _xlsx_sheet_parts(zf)
+        if sheet_name is None:
+            part = parts[min(_xlsx_active_sheet(zf), len(parts) - 1)][1]
+        else:
+            matches = [path for name, path in parts if name == sheet_name]
+            if not matches:
+                raise ValueError(f"Sheet '{sheet_name}' not found in workbook")
+            part = matches[0]
+
+        cell_tag = f"{{{_XLSX_NS}}}c"
+        row_tag = f"{{{_XLSX_NS}}}row"
+        value_tag = f"{{{_XLSX_NS}}}v"
+        text_tag = f"{{{_XLSX_NS}}}t"
+        sheet_data_tag = f"{{{_XLSX_NS}}}sheetData"
+        sheet_data = None
+        filled: List[int] = []
+        col = -1
+
+        with zf.open(part) as f:
+            for event, elem in ElementTree.iterparse(f, events=("start", "end")):
+                if event == "start":
+                    if elem.tag == sheet_data_tag:
+                        sheet_data = elem
+                    continue
+
+                if elem.tag == cell_tag:
+                    ref = elem.get("r")
+                    col = _column_index(ref) if ref else col + 1
+                    value = elem.find(value_tag)
+                    if (value is not None and value.text) or any(t.text for t in elem.iter(text_tag)):
+                        filled.append(col)
+                elif elem.tag == row_tag:
+                    if filled:
+                        if header_seen:
+                            total_rows += 1
+                            null_counts += 1
+                            present = [c for c in filled if c < num_columns]
+                            null_counts[present] -= 1
+                        header_seen = True
+                    filled = []
+                    col = -1
+                    # Drop processed rows so memory stays flat on large sheets
+                    if sheet_data is not None:
+                        sheet_data.clear()
+
+    return total_rows, null_counts
+
+
+def _column_index(ref: str) -> int:
+    """Zero-based column index from a cell reference such as 'AB12'."""
+    index = 0
+    for char in ref:
+        if char.isdigit():
+            break
+        index = index * 26 + (ord(char.upper()) - 64)
+    return index - 1
+
+
+def _count_xls_rows(file_path: str, sheet_name: Optional[str], num_columns: int) -> Tuple[int, np.ndarray]:
+    """Count data rows and empty cells of a legacy XLS sheet."""
+    null_counts = np.zeros(num_columns, dtype=np.int64)
+    total_rows = 0
+    header_seen = False
+
+    for row in _iter_xls_rows(file_path, sheet_name):
+        if all(cell in (None, "") for cell in row):
+            continue
+        if not header_seen:
+            header_seen = True
+            continue
+        total_rows += 1
+        for i in range(num_columns):
+            if i >= len(row) or row[i] in (None, ""):
+                null_counts[i] += 1
+
+    return total_rows, null_counts
+
+
+def _count_with_bytes(
+    file_path: str,
+    offset: int,
+    encoding: str,
+    delimiter: str,
+    num_columns: int,
+) -> Tuple[int, np.ndarray]:
+    """Count rows and empty fields by scanning raw byte blocks."""
+    delim = ord(delimiter)
+    total_rows = 0
+    null_counts = np.zeros(num_columns, dtype=np.int64)
+
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        remainder = b""
+        while True:
+            block = f.read(SCAN_BLOCK_BYTES)
+            if block:
+                data = remainder + block
+                cut = data.rfind(b"\n") + 1
+                if cut == 0:
+                    remainder = data
+                    continue
+                lines, remainder = data[:cut], data[cut:]
+            elif remainder:
+                # Last line without a trailing newline
+                lines, remainder = remainder + b"\n", b""
+            else:
+                break
+
+            if b'"' in lines:
+                # Quoted fields may hide delimiters; hand the rest to csv
+                rows, nulls = _count_with_csv(file_path, offset, encoding, delimiter, num_columns)
+                return total_rows + rows, null_counts + nulls
+
+            rows, nulls = _scan_block(lines, delim, num_columns)
+            total_rows += rows
+            null_counts += nulls
+            offset += len(lines)
+
+    return total_rows, null_counts
+
+
+def _scan_block(chunk: bytes, delim: int, num_columns: int) -> Tuple[int, np.ndarray]:
+    """Vectorized row and empty-field count for a block of whole lines."""
+    arr = np.frombuffer(chunk, dtype=np.uint8)
+    seps = np.flatnonzero((arr == delim) | (arr == _NEWLINE))
+    if len(seps) == 0:
+        return 0, np.zeros(num_columns, dtype=np.int64)
+
+    is_newline = arr[seps] == _NEWLINE
+    starts = np.empty_like(seps)
+    starts[0] = 0
+    starts[1:] = seps[:-1] + 1
+    lengths = seps - starts
+    # A field ending in \r before the newline is empty if only \r remains
+    has_cr = is_newline & (lengths > 0) & (arr[np.maximum(seps - 1, 0)] == _CR)
+    lengths = lengths - has_cr
+
+    line_starts = np.flatnonzero(np.concatenate([[True], is_newline[:-1]]))
+    line_id = np.cumsum(np.concatenate([[0], is_newline[:-1]]))
+    fields_per_line = np.diff(np.append(line_starts, len(seps)))
+    blank = (fields_per_line == 1) & (lengths[line_starts] == 0)
+
+    col = np.arange(len(seps)) - line_starts[line_id]
+    empty = (lengths == 0) & ~blank[line_id] & (col < num_columns)
+    null_counts = np.bincount(col[empty], minlength=num_columns)[:num_columns]
+
+    # Rows with fewer fields than the header have nulls in the missing columns
+    field_counts = np.minimum(fields_per_line[~blank], num_columns)
+    short = np.bincount(field_counts, minlength=num_columns + 1)
+    null_counts = null_counts + np.cumsum(short[:num_columns])
+
+    return int((~blank).sum()), null_counts
+
+
+def _count_with_csv(
+    file_path: str,
+    offset: int,
+    encoding: str,
+    delimiter: str,
+    num_columns: int,
+    skip_header: bool = False,
+) -> Tuple[int, np.ndarray]:
+    """Count rows and empty fields with a streaming csv.reader from an offset."""
+    total_rows = 0
+    null_counts = np.zeros(num_columns, dtype=np.int64)
+
+    with open(file_path, "rb") as f:
+        f.seek(offset)
+        text = io.TextIOWrapper(f, encoding=encoding, errors="replace", newline="")
+        reader = csv.reader(text, delimiter=delimiter)
+        if skip_header:
+            next(reader, None)
+        for row in reader:
+            if not row:
+                continue
+            total_rows += 1
+            for i in range(num_columns):
+                if i >= len(row) or not row[i]:
+                    null_counts[i] += 1
+        text.detach()
+
+    return total_rows, null_counts
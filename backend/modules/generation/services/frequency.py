@@ -0,0 +1,178 @@
+"""
+Frequency Detection
+Interval, gap ratio and timezone hints from a bounded sample of a timestamp column
+"""
+import re
+from datetime import datetime, timezone
+from itertools import islice
+from typing import Any, Dict, List, Optional, Sequence
+
+import numpy as np
+
+from ..models import UploadedFile
+from .estimate_cache import TTLCache
+from .file_parser import iter_file_rows
+from .profile_cache import get_file_profile
+from .storage import local_file_path
+from .type_inference import detect_timestamp_format, parse_timestamp_column
+
+
+# Data rows read when the cached profile preview does not cover the whole file
+FREQUENCY_SAMPLE_ROWS = 2000
+
+# Intervals the modal difference is snapped to when within SNAP_TOLERANCE
+COMMON_INTERVALS = (60, 300, 600, 900, 1800, 3600, 7200, 10800, 21600, 43200, 86400, 604800)
+SNAP_TOLERANCE = 0.02
+
+_OFFSET_PATTERN = re.compile(r"(Z|[+-]\d{2}:?\d{2})$")
+
+# Keyed by file content and mapping inputs; uploads are immutable, so entries only age out
+_frequency_cache = TTLCache(maxsize=512, ttl=3600)
+
+
+def detect_frequency(ts_epoch: np.ndarray) -> Optional[Dict[str, Any]]:
+    """
+    Modal sampling interval of a timestamp sample.
+
+    Args:
+        ts_epoch: UTC epoch seconds, NaN where unparseable
+
+    Returns:
+        frequency_seconds, gap_ratio (share of steps longer than 1.5
+        intervals), duplicate_ratio and the number of timestamps used;
+        None with fewer than two distinct timestamps
+    """
+    ts = np.sort(ts_epoch[~np.isnan(ts_epoch)])
+    if len(ts) < 2:
+        return None
+    steps = np.diff(ts)
+    positive = steps[steps > 0]
+    if not len(positive):
+        return None
+
+    values, counts = np.unique(np.rint(positive), return_counts=True)
+    modal = float(values[np.argmax(counts)])
+    for interval in COMMON_INTERVALS:
+        if abs(modal - interval) <= interval * SNAP_TOLERANCE:
+            modal = float(interval)
+            break
+
+    return {
+        "frequency_seconds": int(modal),
+        "gap_ratio": round(float((positive > modal * 1.5).mean()), 4),
+        "duplicate_ratio": round(float((steps == 0).mean()), 4),
+        "sample_size": int(len(ts)),
+    }
+
+
+def timezone_hints(texts: Sequence[str], ts_epoch: np.ndarray, tz_name: Optional[str]) -> List[str]:
+    """
+    Hints about how the sampled timestamps relate to the mapping's timezone.
+
+    Looks for explicit UTC offsets in the text and, for naive local
+    timestamps read as UTC, for the skipped or repeated hour of a
+    daylight-saving change.
+    """
+    hints = []
+    offsets = {m.group(1) for m in (_OFFSET_PATTERN.search(t) for t in texts if t) if m}
+    if offsets:
+        hints.append(f"Timestamps carry UTC offsets ({', '.join(sorted(offsets))})")
+
+    if not offsets and (not tz_name or tz_name in ("UTC", "Etc/UTC", "GMT")):
+        ts = np.sort(ts_epoch[~np.isnan(ts_epoch)])
+        if len(ts) > 2:
+            steps = np.diff(ts)
+            modal = np.median(steps[steps > 0]) if (steps > 0).any() else 0
+            suspicious = (steps == 0) | ((steps == modal + 3600) & (modal <= 3600))
+            months = {
+                datetime.fromtimestamp(t, timezone.utc).month
+                for t in ts[1:][suspicious]
+            }
+            if months & {3, 4, 10, 11}:
+                hints.append(
+                    "A skipped or repeated hour in spring or autumn suggests local time with daylight saving; "
+                    "set the mapping timezone"
+                )
+    return hints
+
+
+def sample_timestamp_cells(
+    uploaded_file: UploadedFile,
+    column_name: str,
+    sheet_name: Optional[str] = None,
+    limit: int = FREQUENCY_SAMPLE_ROWS,
+) -> List[Any]:
+    """
+    Up to `limit` raw cells of a timestamp column.
+
+    Served from the cached profile preview when it covers the whole file;
+    otherwise only the first rows are streamed, so the cost does not grow
+    with file size.
+
+    Raises:
+        ValueError: If the column is not in the file
+    """
+    profile = get_file_profile(uploaded_file, sheet_name)
+    names = profile.column_names
+    if column_name not in names:
+        raise ValueError(f"Timestamp column '{column_name}' not found")
+    index = names.index(column_name)
+    if profile.total_rows <= len(profile.preview_rows):
+        rows = iter(profile.preview_rows)
+    else:
+        rows = iter_file_rows(local_file_path(uploaded_file.storage_uri), uploaded_file.original_filename, sheet_name)
+        next(rows, None)  # Header
+    return [row[index] if index < len(row) else None for row in islice(rows, limit) if row]
+
+
+def detect_file_frequency(
+    uploaded_file: UploadedFile,
+    column_name: str,
+    sheet_name: Optional[str] = None,
+    timestamp_format: Optional[str] = None,
+    tz_name: Optional[str] = "UTC",
+) -> Optional[Dict[str, Any]]:
+    """
+    Frequency, gap ratio and timezone hints for a file's timestamp column.
+
+    Results are memoized per file content and mapping inputs, so repeated
+    validations of the same mapping do not touch the file.
+
+    Returns:
+        detect_frequency() result plus "timezone_hints"; None if the
+        sample holds fewer than two distinct parseable timestamps
+
+    Raises:
+        ValueError: If the column is not in the file
+    """
+    key = (
+        uploaded_file.checksum or f"{uploaded_file.id}:{uploaded_file.storage_uri}",
+        sheet_name,
+        column_name,
+        timestamp_format,
+        tz_name,
+    )
+    return _frequency_cache.get_or_compute(
+        key,
+        lambda: _detect(uploaded_file, column_name, sheet_name, timestamp_format, tz_name),
+    )
+
+
+def _detect(
+    uploaded_file: UploadedFile,
+    column_name: str,
+    sheet_name: Optional[str],
+    timestamp_format: Optional[str],
+    tz_name: Optional[str],
+) -> Optional[Dict[str, Any]]:
+    cells = sample_timestamp_cells(uploaded_file, column_name, sheet_name)
+    texts = [str(c).strip() if c not in (None, "") else "" for c in cells]
+    if timestamp_format is None:
+        timestamp_format = detect_timestamp_format([t for t in texts if t])
+    ts_epoch = parse_timestamp_column(cells, timestamp_format, tz_name)
+
+    result = detect_frequency(ts_epoch)
+    if result is None:
+        return None
+    result["timezone_hints"] = timezone_hints(texts, ts_epoch, tz_name)
+    return result
@@ -0,0 +1,196 @@
+"""
+Incremental Estimation
+Per-month generation aggregates reused across credit estimations
+"""
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from ..models import EstimationMonthAggregate, GenerationMonth
+from .aggregation import monthly_generation
+
+
+ONE_MICROSECOND = timedelta(microseconds=1)
+
+
+def month_key(ts: datetime) -> str:
+    """YYYY-MM key of a timestamp."""
+    return ts.strftime("%Y-%m")
+
+
+def month_bounds(key: str) -> Tuple[datetime, datetime]:
+    """First instant of a month and of the following month."""
+    year, month = int(key[:4]), int(key[5:7])
+    start = datetime(year, month, 1)
+    end = datetime(year + 1, 1, 1) if month == 12 else datetime(year, month + 1, 1)
+    return start, end
+
+
+def months_between(first: str, last: str) -> List[str]:
+    """All month keys from first to last, inclusive."""
+    months = []
+    key = first
+    while key <= last:
+        months.append(key)
+        key = month_key(month_bounds(key)[1])
+    return months
+
+
+def ef_version(ef_value: float, ef_source: str, ef_year: Optional[int]) -> str:
+    """Cache key component identifying the grid EF an estimation used."""
+    return f"{ef_source}|{ef_year}|{ef_value}"
+
+
+def touch_months(db: Session, project_id: int, ts_min: datetime, ts_max: datetime) -> None:
+    """
+    Record that a project's rows between two timestamps changed.
+
+    Not committed; call inside the transaction that changes the rows.
+    """
+    months = months_between(month_key(ts_min), month_key(ts_max))
+    existing = {
+        m.month: m
+        for m in db.query(GenerationMonth).filter(
+            GenerationMonth.project_id == project_id,
+            GenerationMonth.month.in_(months),
+        )
+    }
+    now = datetime.utcnow()
+    for key in months:
+        if key in existing:
+            existing[key].changed_at = now
+        else:
+            db.add(GenerationMonth(project_id=project_id, month=key, changed_at=now))
+
+
+class IncrementalEstimator:
+    """
+    Monthly generation for estimation, recomputing only changed months.
+
+    Whole months inside the requested period are served from
+    EstimationMonthAggregate rows keyed by (project, month); generation
+    does not depend on the methodology or grid EF, so every estimation of
+    a project shares them and applies its own EF on top. Ingestion stamps the months it touches in GenerationMonth;
+    only months stamped after their aggregate was computed (or never
+    aggregated) go back to the timeseries. Partial months at the period
+    edges are always computed directly and not stored.
+
+    Usage:
+        estimator = IncrementalEstimator(db)
+        monthly = estimator.monthly_generation(project_id, start, end)
+        result = calculator.calculate_from_monthly(monthly, ...)
+    """
+
+    def __init__(self, db: Session):
+        self.db = db
+
+    def monthly_generation(
+        self,
+        project_id: int,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None,
+    ) -> Dict[str, float]:
+        """
+        Generation per month for a project period.
+
+        Args:
+            project_id: Project to estimate
+            start: Inclusive period start (UTC)
+            end: Inclusive period end (UTC)
+
+        Returns:
+            {"YYYY-MM": MWh} in chronological order; empty when there is no data
+        """
+        catalog = self._catalog(project_id)
+        first = month_key(start) if start is not None else None
+        last = month_key(end) if end is not None else None
+        months = [m for m in catalog if (first is None or m >= first) and (last is None or m <= last)]
+
+        partial = []
+        if start is not None and first in months and start > month_bounds(first)[0]:
+            partial.append(first)
+        if end is not None and last in months and last not in partial and end + ONE_MICROSECOND < month_bounds(last)[1]:
+            partial.append(last)
+        whole = [m for m in months if m not in partial]
+
+        cached = {
+            a.month: a
+            for a in self.db.query(EstimationMonthAggregate).filter(
+                EstimationMonthAggregate.project_id == project_id,
+                EstimationMonthAggregate.month.in_(whole),
+            )
+        } if whole else {}
+        dirty = [m for m in whole if m not in cached or cached[m].computed_at < catalog[m]]
+
+        # Stamp before reading, so rows written meanwhile mark the month dirty again
+        computed_at = datetime.utcnow()
+        fresh: Dict[str, float] = {}
+        for run_start, run_end in self._runs(dirty):
+            fresh.update(monthly_generation(self.db, project_id, run_start, run_end))
+
+        result = {m: float(cached[m].generation_mwh) for m in whole if m not in dirty}
+        for key in dirty:
+            aggregate = cached.get(key)
+            if key not in fresh:
+                # The month no longer holds rows
+                if aggregate is not None:
+                    self.db.delete(aggregate)
+                self.db.query(GenerationMonth).filter(
+                    GenerationMonth.project_id == project_id,
+                    GenerationMonth.month == key,
+                    GenerationMonth.changed_at <= computed_at,
+                ).delete(synchronize_session=False)
+                continue
+            result[key] = fresh[key]
+            if aggregate is None:
+                aggregate = EstimationMonthAggregate(project_id=project_id, month=key)
+                self.db.add(aggregate)
+            aggregate.generation_mwh = fresh[key]
+            aggregate.computed_at = computed_at
+
+        for key in partial:
+            month_start, month_end = month_bounds(key)
+            result.update(monthly_generation(
+                self.db,
+                project_id,
+                max(start, month_start) if start is not None else month_start,
+                min(end, month_end - ONE_MICROSECOND) if end is not None else month_end - ONE_MICROSECOND,
+            ))
+
+        try:
+            self.db.commit()
+        except IntegrityError:
+            # A concurrent estimation stored the same months first
+            self.db.rollback()
+
+        return dict(sorted(result.items()))
+
+    def _catalog(self, project_id: int) -> Dict[str, datetime]:
+        """Months with data and their last change; built once for older projects."""
+        catalog = {
+            m.month: m.changed_at
+            for m in self.db.query(GenerationMonth).filter(GenerationMonth.project_id == project_id)
+        }
+        if catalog:
+            return catalog
+
+        now = datetime.utcnow()
+        for key in monthly_generation(self.db, project_id):
+            self.db.add(GenerationMonth(project_id=project_id, month=key, changed_at=now))
+            catalog[key] = now
+        self.db.flush()
+        return catalog
+
+    @staticmethod
+    def _runs(months: List[str]) -> List[Tuple[datetime, datetime]]:
+        """Collapse month keys into contiguous inclusive time ranges."""
+        runs: List[Tuple[datetime, datetime]] = []
+        for key in sorted(months):
+            month_start, month_end = month_bounds(key)
+            if runs and runs[-1][1] + ONE_MICROSECOND == month_start:
+                runs[-1] = (runs[-1][0], month_end - ONE_MICROSECOND)
+            else:
+                runs.append((month_start, month_end - ONE_MICROSECOND))
+        return runs
@@ -0,0 +1,288 @@
+"""
+Generation Ingestion Service
+Streams mapped upload files into canonical GenerationTimeseries rows
+"""
+import time
+from datetime import datetime
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from ..models import UploadedFile, DatasetMapping, GenerationTimeseries
+from .archive import archive_available, mark_archives_stale, rebuild_project_archive
+from .bulk_writer import TimeseriesWriter
+from .conversion import ConvertedSeries, GenerationConverter, epoch_to_datetimes
+from .file_parser import iter_file_rows
+from .incremental import touch_months
+from .quality import QualityChecker, project_capacity_mw
+from .storage import local_file_path
+from .type_inference import (
+    detect_timestamp_format,
+    parse_number_column,
+    parse_timestamp_column,
+    to_strptime_format,
+)
+
+
+# Rows converted and written per batch; memory use is bounded by this, not file size
+BATCH_SIZE = 5000
+
+# Maximum number of row-level warnings kept on the mapping
+MAX_PARSE_WARNINGS = 20
+
+
+class GenerationIngestionService:
+    """
+    Converts a mapped upload into GenerationTimeseries rows.
+
+    The file is read row by row and passed to the conversion engine in
+    fixed-size chunks, so memory stays flat regardless of file size. Each
+    chunk's timestamps and values are parsed as whole columns with the
+    mapping's fixed timestamp format. A QualityChecker resolves DST
+    repeats before conversion and sets quality flags on each converted
+    chunk; its summary ends up in the mapping's parse_warnings. Converted
+    chunks are upserted by a TimeseriesWriter (binary COPY on PostgreSQL).
+    Progress (rows processed and rows/second) is committed to the
+    UploadedFile after every batch.
+
+    Usage:
+        service = GenerationIngestionService(db)
+        stats = service.process_file(uploaded_file, mapping)
+    """
+
+    def __init__(self, db: Session, batch_size: int = BATCH_SIZE):
+        self.db = db
+        self.batch_size = batch_size
+
+    def process_file(self, uploaded_file: UploadedFile, mapping: DatasetMapping) -> Dict[str, Any]:
+        """
+        Stream the file through unit conversion into the timeseries table.
+
+        Args:
+            uploaded_file: File to ingest
+            mapping: Column mapping saved for the file
+
+        Returns:
+            Dictionary with ingestion statistics
+        """
+        started = time.monotonic()
+        uploaded_file.status = "processing"
+        uploaded_file.error_message = None
+        uploaded_file.rows_processed = 0
+        uploaded_file.processing_stats = {"started_at": datetime.utcnow().isoformat()}
+
+        # Re-processing a file replaces its previous output
+        previous = self.db.query(
+            func.min(GenerationTimeseries.ts_utc), func.max(GenerationTimeseries.ts_utc)
+        ).filter(GenerationTimeseries.file_id == uploaded_file.id).one()
+        if previous[0] is not None:
+            touch_months(self.db, uploaded_file.project_id, *previous)
+        self.db.query(GenerationTimeseries).filter(
+            GenerationTimeseries.file_id == uploaded_file.id
+        ).delete(synchronize_session=False)
+        mark_archives_stale(self.db, uploaded_file.project_id)
+        self.db.commit()
+
+        project_id = uploaded_file.project_id
+        writer = TimeseriesWriter(self.db, project_id, uploaded_file.id, mapping.unit)
+        ts_format = to_strptime_format(mapping.timestamp_format)
+
+        stats = {
+            "rows_read": 0,
+            "rows_written": 0,
+            "rows_skipped": 0,
+            "rows_late": 0,
+            "rows_missing": 0,
+            "rows_interpolated": 0,
+            "rows_outlier": 0,
+            "batches": 0,
+        }
+        warnings: List[str] = []
+        chunk_lines: List[int] = []
+        chunk_ts: List[Any] = []
+        chunk_values: List[Any] = []
+        ambiguous_rows = 0
+
+        def write(series: ConvertedSeries):
+            if not len(series):
+                return
+            checker.check(series)
+            writer.write(series)
+            first, last = epoch_to_datetimes(series.ts_epoch[[0, -1]])
+            # Stamped in the batch's own transaction, so months holding rows
+            # from a run that later fails still invalidate cached aggregates
+            touch_months(self.db, project_id, first, last)
+            stats["rows_written"] += len(series)
+            stats["rows_missing"] += series.counts.get("missing", 0)
+            stats["rows_interpolated"] += series.counts.get("interpolated", 0)
+            stats["rows_outlier"] += series.counts.get("outlier", 0)
+            stats["batches"] += 1
+            self._report_progress(uploaded_file, stats, started)
+
+        def flush():
+            nonlocal ts_format, ambiguous_rows
+            if ts_format is None and not mapping.timestamp_format:
+                # Learn the format once so the rest of the file takes the fast path.
+                # Chunks whose day/month order is ambiguous are read month-first
+                # by dateutil, and detection is retried on the next chunk.
+                ts_format = detect_timestamp_format(chunk_ts)
+                if ts_format is None:
+                    ambiguous_rows += len(chunk_ts)
+                else:
+                    mapping.timestamp_format = ts_format
+                    if ambiguous_rows and ts_format.startswith("%d/%m"):
+                        warnings.append(
+                            f"First {ambiguous_rows} rows read as month/day before the file "
+                            "showed day/month order; set the timestamp format and re-process"
+                        )
+
+            ts_epoch = parse_timestamp_column(chunk_ts, ts_format, tz_name)
+            bad = np.isnan(ts_epoch)
+            if bad.any():
+                bad_idx = np.flatnonzero(bad)
+                stats["rows_skipped"] += len(bad_idx)
+                for i in bad_idx[:MAX_PARSE_WARNINGS - len(warnings)]:
+                    warnings.append(f"Row {chunk_lines[i]}: unparseable timestamp '{chunk_ts[i]}'")
+
+            values = parse_number_column(chunk_values)
+            write(converter.push(checker.prepare(ts_epoch[~bad]), values[~bad]))
+            chunk_lines.clear()
+            chunk_ts.clear()
+            chunk_values.clear()
+
+        try:
+            tz_name = mapping.timezone or "UTC"
+            ZoneInfo(tz_name)  # Fail fast on an unknown timezone
+            converter = GenerationConverter(
+                mapping.unit,
+                mapping.value_semantics,
+                mapping.frequency_seconds,
+                mapping.missing_value_treatment or "interpolate",
+            )
+            checker = QualityChecker(
+                mapping.frequency_seconds,
+                project_capacity_mw(uploaded_file.project),
+                tz_name,
+            )
+            rows = iter_file_rows(
+                local_file_path(uploaded_file.storage_uri),
+                uploaded_file.original_filename,
+                mapping.sheet_name,
+            )
+            ts_idx, value_idx = self._resolve_columns(rows, mapping)
+
+            for line_no, row in enumerate(rows, start=(mapping.start_row or 1) + 1):
+                if not row or all(cell in (None, "") for cell in row):
+                    continue
+                stats["rows_read"] += 1
+
+                chunk_lines.append(line_no)
+                chunk_ts.append(row[ts_idx] if ts_idx < len(row) else None)
+                chunk_values.append(row[value_idx] if value_idx < len(row) else None)
+
+                if len(chunk_ts) >= self.batch_size:
+                    flush()
+
+            if chunk_ts:
+                flush()
+            write(converter.finish())
+            stats["rows_late"] = converter.late_rows
+            if converter.late_rows:
+                warnings.append(
+                    f"{converter.late_rows} rows skipped: they were out of order and "
+                    "their interval had already been written"
+                )
+        except Exception as e:
+            self.db.rollback()
+            uploaded_file.status = "error"
+            uploaded_file.error_message = str(e)
+            self.db.commit()
+            raise
+
+        elapsed = time.monotonic() - started
+        stats["elapsed_seconds"] = round(elapsed, 3)
+        stats["rows_per_second"] = round(stats["rows_read"] / elapsed, 1) if elapsed > 0 else None
+
+        uploaded_file.status = "processed"
+        uploaded_file.rows_processed = stats["rows_read"]
+        uploaded_file.processing_stats = {
+            **(uploaded_file.processing_stats or {}),
+            **stats,
+            "quality": checker.summary(),
+            "writer": writer.stats(),
+            "finished_at": datetime.utcnow().isoformat(),
+        }
+        mapping.parse_warnings = warnings + checker.warnings()
+        self.db.commit()
+
+        return stats
+
+    def _resolve_columns(self, rows: Iterator[List[Any]], mapping: DatasetMapping) -> Tuple[int, int]:
+        """Advance past the header row and locate the mapped columns."""
+        header = None
+        for _ in range(mapping.start_row or 1):
+            header = next(rows, None)
+        if header is None:
+            raise ValueError("File contains no header row")
+
+        names = [
+            str(cell).strip() if cell not in (None, "") else f"Column_{i+1}"
+            for i, cell in enumerate(header)
+        ]
+
+        try:
+            ts_idx = names.index(mapping.timestamp_column)
+        except ValueError:
+            raise ValueError(f"Timestamp column '{mapping.timestamp_column}' not found in file")
+        try:
+            value_idx = names.index(mapping.value_column)
+        except ValueError:
+            raise ValueError(f"Value column '{mapping.value_column}' not found in file")
+
+        return ts_idx, value_idx
+
+    def _report_progress(self, uploaded_file: UploadedFile, stats: Dict[str, Any], started: float):
+        """
+        Commit the current batch together with progress counters.
+
+        Progress counts file rows read, the unit of UploadedFile.row_count;
+        converted intervals written are reported separately.
+        """
+        elapsed = time.monotonic() - started
+        uploaded_file.rows_processed = stats["rows_read"]
+        uploaded_file.processing_stats = {
+            **(uploaded_file.processing_stats or {}),
+            "rows_per_second": round(stats["rows_read"] / elapsed, 1) if elapsed > 0 else None,
+            "rows_written": stats["rows_written"],
+            "batches": stats["batches"],
+        }
+        self.db.commit()
+
+
+def process_uploaded_file(file_id: int) -> Optional[Dict[str, Any]]:
+    """
+    Run ingestion for a file in its own database session.
+
+    Intended for background execution after the request has returned.
+    """
+    from backend.core.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        uploaded_file = db.query(UploadedFile).filter(UploadedFile.id == file_id).first()
+        if not uploaded_file or not uploaded_file.mapping:
+            return None
+        try:
+            stats = GenerationIngestionService(db).process_file(uploaded_file, uploaded_file.mapping)
+        except Exception:
+            # Failure is recorded on the file record by process_file
+            return None
+
+        if archive_available():
+            rebuild_project_archive(uploaded_file.project_id)
+        return stats
+    finally:
+        db.close()
@@ -0,0 +1,135 @@
+"""
+Methodology Matcher
+Eligible methodologies for a project, ranked by a quick annual ER estimate
+"""
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Tuple
+
+from ..grid_ef_database import get_grid_ef, grid_ef_store
+from ..methodologies.registry import MethodologyRegistry
+
+
+HOURS_PER_YEAR = 8760
+
+# Typical annual capacity factors used for the indicative generation estimate
+TYPICAL_CAPACITY_FACTORS = {
+    "solar": 0.20,
+    "wind": 0.32,
+    "hydro": 0.45,
+    "geothermal": 0.80,
+    "biomass": 0.70,
+    "biogas": 0.80,
+    "tidal": 0.25,
+    "wave": 0.25,
+}
+DEFAULT_CAPACITY_FACTOR = 0.30
+
+
+def eligible_methodology_ids(
+    project_type: str,
+    capacity_mw: float,
+    registry: Optional[str] = None,
+) -> Tuple[str, ...]:
+    """
+    Methodologies whose type and capacity limits admit a project.
+
+    Intersects the registry's type index with its capacity interval index;
+    no methodology is instantiated or checked one by one.
+
+    Returns:
+        Methodology IDs in registration order
+    """
+    admitted = MethodologyRegistry.ids_for_capacity(capacity_mw)
+    ids = [m for m in MethodologyRegistry.ids_for_project_type(project_type) if m in admitted]
+    if registry:
+        in_registry = MethodologyRegistry.ids_for_registry(registry)
+        ids = [m for m in ids if m in in_registry]
+    return tuple(ids)
+
+
+def match_methodologies(
+    project_type: str,
+    capacity_mw: float,
+    country_code: str,
+    registry: Optional[str] = None,
+    region_code: Optional[str] = None,
+) -> Dict[str, Any]:
+    """
+    Eligible methodologies ranked by estimated annual emission reductions.
+
+    Annual generation is estimated from capacity and a typical capacity
+    factor for the project type; each eligible methodology's vectorized
+    kernel is evaluated once on that generation and the grid's combined
+    margin. Results are memoized per input combination.
+
+    Args:
+        project_type: Type of project
+        capacity_mw: Installed capacity (MW)
+        country_code: ISO country code for grid EF lookup
+        registry: Restrict matches to one registry
+        region_code: Optional region code for sub-national grids
+
+    Returns:
+        Estimate inputs plus matches sorted by estimated ER, highest first
+
+    Raises:
+        ValueError: For negative capacity or a country without EF data
+    """
+    if capacity_mw < 0:
+        raise ValueError("capacity_mw must be non-negative")
+    return _match(
+        project_type.lower(),
+        float(capacity_mw),
+        country_code.upper(),
+        registry.upper() if registry else None,
+        region_code,
+        grid_ef_store.current_version(),
+    )
+
+
+@lru_cache(maxsize=4096)
+def _match(
+    project_type: str,
+    capacity_mw: float,
+    country_code: str,
+    registry: Optional[str],
+    region_code: Optional[str],
+    ef_store_version: int,
+) -> Dict[str, Any]:
+    # ef_store_version only keys the cache, so reindexed factors are picked up
+    ef_data = get_grid_ef(country_code, region_code)
+    if not ef_data:
+        raise ValueError(f"No emission factor data for country: {country_code}")
+
+    capacity_factor = TYPICAL_CAPACITY_FACTORS.get(project_type, DEFAULT_CAPACITY_FACTOR)
+    generation_mwh = capacity_mw * capacity_factor * HOURS_PER_YEAR
+    columns = {
+        "generation_mwh": generation_mwh,
+        "ef_grid": ef_data.combined_margin,
+        "capacity_mw": capacity_mw,
+        "project_type": project_type,
+        "biogas_captured_m3": generation_mwh * 500,  # Same default as the calculator
+    }
+
+    matches: List[Dict[str, Any]] = []
+    for methodology_id in eligible_methodology_ids(project_type, capacity_mw, registry):
+        methodology = MethodologyRegistry.get(methodology_id)
+        estimated_er = None
+        if methodology.has_kernel:
+            estimated_er = round(float(methodology.compute_kernel(columns).total_er_tco2e), 4)
+        matches.append({
+            **methodology.get_info(),
+            "estimated_er_tco2e": estimated_er,
+        })
+    matches.sort(key=lambda m: -1 if m["estimated_er_tco2e"] is None else m["estimated_er_tco2e"], reverse=True)
+
+    return {
+        "project_type": project_type,
+        "capacity_mw": capacity_mw,
+        "country_code": country_code,
+        "registry": registry,
+        "ef_value": ef_data.combined_margin,
+        "capacity_factor": capacity_factor,
+        "estimated_generation_mwh": round(generation_mwh, 4),
+        "methodologies": matches,
+    }
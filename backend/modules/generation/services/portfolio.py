@@ -0,0 +1,172 @@
+"""
+Portfolio Estimation
+Fans monthly generation of many projects out to every applicable methodology
+"""
+import asyncio
+import json
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, AsyncIterator, Dict, List, Optional, Tuple
+
+from ..methodologies.registry import MethodologyRegistry
+from .credit_calculator import CreditCalculator
+
+
+# Worker processes for portfolio runs; 0 means one per CPU
+ESTIMATION_WORKERS = int(os.environ.get("ESTIMATION_WORKERS", "0"))
+
+_pool: Optional[ProcessPoolExecutor] = None
+
+
+def get_process_pool() -> ProcessPoolExecutor:
+    """
+    Process pool shared by portfolio runs, created on first use.
+
+    Workers are spawned rather than forked so they never inherit the
+    parent's database connections or lock state. Tasks get plain data
+    only; grid EFs are resolved in the parent.
+    """
+    global _pool
+    if _pool is None:
+        _pool = ProcessPoolExecutor(
+            max_workers=ESTIMATION_WORKERS or None,
+            mp_context=multiprocessing.get_context("spawn"),
+        )
+    return _pool
+
+
+def estimate_project(
+    project_id: int,
+    monthly_generation: Dict[str, float],
+    methodology_ids: List[str],
+    country_code: str,
+    project_type: str,
+    grid_ef: Tuple[float, str, int],
+    additional_inputs: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    """
+    Run each methodology on one project's monthly generation.
+
+    Executed in a worker process; arguments and results are plain data.
+    The grid EF comes pre-resolved as (EF, source, year).
+
+    Returns:
+        One result dictionary per methodology, with status "ok" or "error"
+    """
+    results = []
+    for methodology_id in methodology_ids:
+        try:
+            result = CreditCalculator(methodology_id).calculate_from_monthly(
+                monthly_generation=monthly_generation,
+                country_code=country_code,
+                project_type=project_type,
+                additional_inputs=additional_inputs,
+                grid_ef=grid_ef,
+            )
+        except ValueError as e:
+            results.append(_error(project_id, methodology_id, str(e)))
+            continue
+        results.append({
+            "project_id": project_id,
+            "methodology_id": methodology_id,
+            "status": "ok",
+            "registry": result["registry"],
+            "total_generation_mwh": result["total_generation_mwh"],
+            "total_er_tco2e": result["total_er_tco2e"],
+            "baseline_emissions_tco2e": result["baseline_emissions_tco2e"],
+            "project_emissions_tco2e": result["project_emissions_tco2e"],
+            "leakage_tco2e": result["leakage_tco2e"],
+            "ef_value": result["ef_value"],
+            "ef_source": result["ef_source"],
+            "ef_year": result["ef_year"],
+            "annual_breakdown": result["annual_breakdown"],
+        })
+    return results
+
+
+async def stream_portfolio(
+    projects: List[Tuple[int, str]],
+    monthly_by_project: Dict[int, Dict[str, float]],
+    country_code: str,
+    methodology_ids: Optional[List[str]] = None,
+    ef_override: Optional[float] = None,
+    additional_inputs: Optional[Dict[str, Any]] = None,
+) -> AsyncIterator[str]:
+    """
+    Estimate every (project, methodology) pair and yield NDJSON lines.
+
+    Each project is one task on the process pool; its lines are yielded
+    as soon as that task finishes, so results arrive in completion order.
+
+    Args:
+        projects: (project_id, project_type) pairs
+        monthly_by_project: Monthly generation loaded once per project
+        country_code: ISO country code for grid EF lookup
+        methodology_ids: Restrict the run to these methodologies
+        ef_override: Optional manual EF value
+        additional_inputs: Additional methodology-specific inputs
+    """
+    try:
+        grid_ef = CreditCalculator.resolve_grid_ef(country_code, ef_override=ef_override)
+        ef_error = None
+    except ValueError as e:
+        grid_ef, ef_error = None, str(e)
+
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+
+    tasks = []
+    for project_id, project_type in projects:
+        applicable = list(MethodologyRegistry.ids_for_project_type(project_type or ""))
+        if methodology_ids is not None:
+            applicable = [m for m in applicable if m in methodology_ids]
+        monthly = monthly_by_project.get(project_id)
+        if not monthly:
+            yield _line(_error(project_id, None, "No generation data found"))
+            continue
+        if not applicable:
+            yield _line(_error(project_id, None, f"No applicable methodology for project type '{project_type}'"))
+            continue
+        if ef_error:
+            for methodology_id in applicable:
+                yield _line(_error(project_id, methodology_id, ef_error))
+            continue
+
+        future = loop.run_in_executor(
+            pool,
+            estimate_project,
+            project_id,
+            monthly,
+            applicable,
+            country_code,
+            project_type,
+            grid_ef,
+            additional_inputs,
+        )
+        tasks.append(_collect(project_id, future))
+
+    for done in asyncio.as_completed(tasks):
+        for item in await done:
+            yield _line(item)
+
+
+async def _collect(project_id: int, future: "asyncio.Future") -> List[Dict[str, Any]]:
+    """Await a worker task, turning a crashed worker into an error line."""
+    try:
+        return await future
+    except Exception as e:
+        return [_error(project_id, None, f"Estimation worker failed: {e}")]
+
+
+def _error(project_id: Optional[int], methodology_id: Optional[str], message: str) -> Dict[str, Any]:
+    return {
+        "project_id": project_id,
+        "methodology_id": methodology_id,
+        "status": "error",
+        "error": message,
+    }
+
+
+def _line(item: Dict[str, Any]) -> str:
+    return json.dumps(item, default=str) + "\n"
@@ -0,0 +1,164 @@
+"""
+Column Profile Cache
+Stores the parse result of an uploaded file as a sidecar keyed by checksum
+"""
+import gzip
+import hashlib
+import json
+import os
+import tempfile
+from dataclasses import dataclass, field, asdict
+from typing import Any, Dict, List, Optional
+
+from ..models import UploadedFile
+from .file_parser import PROFILE_PREVIEW_ROWS, is_excel_file, list_excel_sheets, profile_csv, profile_excel
+from .storage import local_file_path
+
+
+# Bump when the profile layout or parsing rules change to invalidate sidecars
+PROFILE_VERSION = 3
+
+PROFILE_CACHE_DIR = os.environ.get(
+    "PROFILE_CACHE_DIR",
+    os.path.join(os.environ.get("UPLOAD_DIR", "/tmp/uploads/generation"), "profiles"),
+)
+
+
+@dataclass
+class FileProfile:
+    """Parse result for an uploaded file"""
+    columns: List[Dict[str, Any]]
+    preview_rows: List[List[Any]]
+    total_rows: int
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def column_names(self) -> List[str]:
+        return [col["name"] for col in self.columns]
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {"version": PROFILE_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "FileProfile":
+        return cls(
+            columns=data["columns"],
+            preview_rows=data["preview_rows"],
+            total_rows=data["total_rows"],
+            metadata=data.get("metadata") or {},
+        )
+
+
+def build_profile(file_path: str, filename: str, sheet_name: Optional[str] = None) -> FileProfile:
+    """
+    Parse a file into a profile.
+
+    For workbooks the profile covers one sheet and lists all sheet names
+    in its metadata.
+
+    Raises:
+        ValueError: If the file format is not supported or the sheet is unknown
+    """
+    metadata: Dict[str, Any] = {}
+    if filename.lower().endswith(".csv"):
+        columns, preview_rows, total_rows = profile_csv(file_path, PROFILE_PREVIEW_ROWS)
+    elif is_excel_file(filename):
+        columns, preview_rows, total_rows = profile_excel(file_path, PROFILE_PREVIEW_ROWS, sheet_name)
+        metadata["sheets"] = list_excel_sheets(file_path)
+        metadata["sheet_name"] = sheet_name
+    else:
+        raise ValueError("Unsupported file format")
+
+    return FileProfile(columns=columns, preview_rows=preview_rows, total_rows=total_rows, metadata=metadata)
+
+
+def _profile_path(checksum: str, sheet_name: Optional[str] = None) -> str:
+    key = checksum
+    if sheet_name is not None:
+        key += "-" + hashlib.sha256(sheet_name.encode("utf-8")).hexdigest()[:16]
+    return os.path.join(PROFILE_CACHE_DIR, f"{key}.v{PROFILE_VERSION}.json.gz")
+
+
+def load_profile(checksum: str, sheet_name: Optional[str] = None) -> Optional[FileProfile]:
+    """Load a cached profile, or None if absent or unreadable."""
+    try:
+        with gzip.open(_profile_path(checksum, sheet_name), "rt", encoding="utf-8") as f:
+            data = json.load(f)
+    except (OSError, ValueError):
+        return None
+
+    if data.get("version") != PROFILE_VERSION:
+        return None
+    return FileProfile.from_dict(data)
+
+
+def save_profile(checksum: str, profile: FileProfile, sheet_name: Optional[str] = None) -> None:
+    """Write a profile sidecar atomically."""
+    os.makedirs(PROFILE_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=PROFILE_CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        with gzip.open(tmp_path, "wt", encoding="utf-8") as f:
+            json.dump(profile.to_dict(), f, default=str, separators=(",", ":"))
+        os.replace(tmp_path, _profile_path(checksum, sheet_name))
+    except OSError:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+def get_profile(
+    file_path: str,
+    filename: str,
+    checksum: Optional[str],
+    sheet_name: Optional[str] = None,
+) -> FileProfile:
+    """
+    Return the profile for a stored file, parsing it only on a cache miss.
+
+    Profiles are keyed by checksum (and sheet), so identical content shares
+    one sidecar.
+    """
+    if checksum:
+        cached = load_profile(checksum, sheet_name)
+        if cached is not None:
+            return cached
+    return _build_and_store(file_path, filename, checksum, sheet_name)
+
+
+def get_file_profile(uploaded_file: UploadedFile, sheet_name: Optional[str] = None) -> FileProfile:
+    """
+    Return the cached or freshly parsed profile for an uploaded file.
+
+    The file is only fetched from storage on a cache miss. Blocks while
+    it downloads; call from a worker thread, not the event loop.
+    """
+    if uploaded_file.checksum:
+        cached = load_profile(uploaded_file.checksum, sheet_name)
+        if cached is not None:
+            return cached
+    return _build_and_store(
+        local_file_path(uploaded_file.storage_uri),
+        uploaded_file.original_filename,
+        uploaded_file.checksum,
+        sheet_name,
+    )
+
+
+def _build_and_store(
+    file_path: str,
+    filename: str,
+    checksum: Optional[str],
+    sheet_name: Optional[str],
+) -> FileProfile:
+    """Parse a file and save its sidecar when it has a checksum."""
+    profile = build_profile(file_path, filename, sheet_name)
+
+    if checksum:
+        try:
+            save_profile(checksum, profile, sheet_name)
+        except OSError:
+            # Caching is best effort; the parse result is still valid
+            pass
+
+    return profile
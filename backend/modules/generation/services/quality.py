@@ -0,0 +1,289 @@
+"""
+Data Quality Checks
+Vectorized gap, plausibility, outlier and DST-duplicate checks run during ingestion
+"""
+from datetime import datetime, timezone
+from typing import Any, Dict, List, Optional
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+from .conversion import FLAG_MISSING, FLAG_OK, FLAG_OUTLIER, ConvertedSeries
+
+
+# Headroom over nameplate capacity before a reading counts as physically impossible
+CAPACITY_TOLERANCE = 1.05
+
+# Rolling outlier check. Sub-daily readings are compared with the same UTC time
+# of day (generation follows the sun, not DST) over the previous
+# ROLLING_WINDOW_DAYS days, so diurnal profiles do not widen the spread; daily
+# and coarser readings with the previous readings. A quarter of the window
+# must be filled before values are judged.
+ROLLING_WINDOW_DAYS = 28
+MIN_ROLLING_WINDOW = 8
+OUTLIER_Z_SCORE = 6.0
+
+# Lower bound on the window spread, relative to capacity × interval (or, without
+# a capacity, the largest earlier reading), so a spike after flat stretches
+# such as all-zero nights is still judged
+OUTLIER_SPREAD_FLOOR = 0.01
+
+# Wizard fields holding installed capacity (MW), in order of preference
+CAPACITY_FIELDS = ("installedCapacityAC", "installedCapacity", "installedCapacityDC")
+
+# Raw timestamps kept across chunks to catch a repeated DST hour split by a chunk boundary
+DST_CARRY_SECONDS = 2 * 3600
+
+
+def project_capacity_mw(project: Any) -> Optional[float]:
+    """Installed capacity from the project's wizard data, if entered."""
+    data = getattr(project, "wizard_data", None)
+    if not isinstance(data, dict):
+        return None
+    for name in CAPACITY_FIELDS:
+        try:
+            capacity = float(data.get(name))
+        except (TypeError, ValueError):
+            continue
+        if capacity > 0:
+            return capacity
+    return None
+
+
+class QualityChecker:
+    """
+    Data-quality stage between timestamp parsing and the database write.
+
+    Works on whole chunk columns and keeps just enough state between
+    chunks (recent raw timestamps, the rolling window and the last data
+    interval) for results not to depend on chunk boundaries.
+
+    - Repeated local hours at a DST fall-back, which parse to the same
+      UTC instant, are moved to their post-transition instant.
+    - Other duplicate timestamps are summed by the converter; their
+      interval is flagged OUTLIER.
+    - Intervals with negative energy or more than capacity × interval
+      are flagged OUTLIER.
+    - Intervals more than OUTLIER_Z_SCORE standard deviations from the
+      preceding readings at the same time of day are flagged OUTLIER.
+    - Gaps between intervals holding data are counted and measured.
+
+    Usage:
+        checker = QualityChecker(3600, capacity_mw=5.0, tz_name="Europe/Berlin")
+        ts_epoch = checker.prepare(ts_epoch)
+        series = converter.push(ts_epoch, values)
+        checker.check(series)
+        mapping.parse_warnings += checker.warnings()
+    """
+
+    def __init__(self, frequency_seconds: int, capacity_mw: Optional[float] = None, tz_name: Optional[str] = "UTC"):
+        self.frequency = float(frequency_seconds)
+        self.capacity_mw = capacity_mw
+        self.tz = None if not tz_name or tz_name in ("UTC", "Etc/UTC", "GMT") else ZoneInfo(tz_name)
+        if self.frequency < 86400 and 86400 % self.frequency == 0:
+            self.slots, self.window = int(86400 // self.frequency), ROLLING_WINDOW_DAYS
+        else:
+            self.slots, self.window = 1, max(int(ROLLING_WINDOW_DAYS * 86400 // self.frequency), MIN_ROLLING_WINDOW)
+
+        self.counts = {
+            "gaps": 0,
+            "missing_intervals": 0,
+            "longest_gap_seconds": 0.0,
+            "impossible_values": 0,
+            "rolling_outliers": 0,
+            "dst_duplicates_resolved": 0,
+            "duplicate_timestamps": 0,
+        }
+        self._recent_ts = np.empty(0, dtype=np.float64)
+        self._duplicate_buckets = np.empty(0, dtype=np.float64)
+        self._history_slot = np.empty(0, dtype=np.int64)
+        self._history = np.empty(0, dtype=np.float64)
+        self._scale = 0.0
+        self._last_present: Optional[float] = None
+
+    def prepare(self, ts_epoch: np.ndarray) -> np.ndarray:
+        """
+        Resolve DST repeats and note duplicate timestamps in parsed raw epochs.
+
+        Returns:
+            Epoch seconds with repeated fall-back hours moved to their second occurrence
+        """
+        ts = np.asarray(ts_epoch, dtype=np.float64)
+        if not len(ts):
+            return ts
+
+        # Compare against the previous chunk's tail as well; NaN never repeats
+        combined = np.concatenate([self._recent_ts, ts])
+        order = np.argsort(combined, kind="stable")
+        ordered = combined[order]
+        repeat_sorted = np.zeros(len(combined), dtype=bool)
+        repeat_sorted[1:] = ordered[1:] == ordered[:-1]
+        repeat = np.zeros(len(combined), dtype=bool)
+        repeat[order] = repeat_sorted
+        repeat = repeat[len(self._recent_ts):]
+
+        resolved = ts.copy()
+        if repeat.any():
+            for value in np.unique(ts[repeat]):
+                shift = self._fold_shift(value)
+                if shift:
+                    moved = repeat & (ts == value)
+                    resolved[moved] += shift
+                    self.counts["dst_duplicates_resolved"] += int(moved.sum())
+            duplicates = ts[repeat & (resolved == ts)]
+            if len(duplicates):
+                self.counts["duplicate_timestamps"] += len(duplicates)
+                self._duplicate_buckets = np.union1d(
+                    self._duplicate_buckets,
+                    np.floor(duplicates / self.frequency) * self.frequency,
+                )
+
+        valid = resolved[~np.isnan(resolved)]
+        if len(valid):
+            tail = np.concatenate([self._recent_ts, valid])
+            self._recent_ts = tail[tail >= tail.max() - DST_CARRY_SECONDS]
+        return resolved
+
+    def check(self, series: ConvertedSeries) -> None:
+        """Flag implausible intervals of a converted chunk in place and update the counts."""
+        if not len(series):
+            return
+        ts = series.ts_epoch
+        energy = series.energy_mwh
+        flags = series.quality_flag
+        present = flags == FLAG_OK
+
+        self._count_gaps(ts[present])
+
+        duplicate = present & np.isin(ts, self._duplicate_buckets)
+        if len(self._duplicate_buckets):
+            self._duplicate_buckets = self._duplicate_buckets[self._duplicate_buckets > ts[-1]]
+
+        limit = self.capacity_mw * self.frequency / 3600 * CAPACITY_TOLERANCE if self.capacity_mw else np.inf
+        impossible = present & ~duplicate & ((energy < 0) | (energy > limit))
+        self.counts["impossible_values"] += int(impossible.sum())
+
+        usable = present & ~impossible & ~duplicate
+        outlier = np.zeros(len(ts), dtype=bool)
+        outlier[usable] = self._rolling_outliers(ts[usable], energy[usable])
+        self.counts["rolling_outliers"] += int(outlier.sum())
+
+        flagged = duplicate | impossible | outlier
+        flags[flagged] = FLAG_OUTLIER
+        series.counts["outlier"] = series.counts.get("outlier", 0) + int(flagged.sum())
+
+    def summary(self) -> Dict[str, Any]:
+        """Counts for processing stats."""
+        return {
+            **self.counts,
+            "longest_gap_hours": round(self.counts["longest_gap_seconds"] / 3600, 3),
+            "capacity_mw": self.capacity_mw,
+            "rolling_window": self.window,
+            "rolling_by_time_of_day": self.slots > 1,
+        }
+
+    def warnings(self) -> List[str]:
+        """Human-readable summary lines for DatasetMapping.parse_warnings."""
+        c = self.counts
+        lines = []
+        if c["gaps"]:
+            lines.append(
+                f"Quality: {c['gaps']} gap(s) in the data, {c['missing_intervals']} interval(s) without readings "
+                f"(longest {c['longest_gap_seconds'] / 3600:g} h)"
+            )
+        if c["impossible_values"]:
+            bound = f"capacity {self.capacity_mw:g} MW × interval" if self.capacity_mw else "zero"
+            lines.append(f"Quality: {c['impossible_values']} interval(s) outside 0 to {bound}, flagged OUTLIER")
+        if c["rolling_outliers"]:
+            reference = (
+                f"the same time of day over the previous {self.window} days" if self.slots > 1
+                else f"the previous {self.window} readings"
+            )
+            lines.append(
+                f"Quality: {c['rolling_outliers']} interval(s) more than {OUTLIER_Z_SCORE:g} standard deviations "
+                f"from {reference}, flagged OUTLIER"
+            )
+        if c["dst_duplicates_resolved"]:
+            lines.append(
+                f"Quality: {c['dst_duplicates_resolved']} reading(s) in a repeated DST hour moved to standard time"
+            )
+        if c["duplicate_timestamps"]:
+            lines.append(
+                f"Quality: {c['duplicate_timestamps']} duplicate timestamp(s) summed into their interval, flagged OUTLIER"
+            )
+        return lines
+
+    def _fold_shift(self, epoch: float) -> float:
+        """Seconds from the first to the second occurrence of an ambiguous local time; 0 otherwise."""
+        if self.tz is None or np.isnan(epoch):
+            return 0.0
+        local = datetime.fromtimestamp(epoch, timezone.utc).astimezone(self.tz).replace(tzinfo=None)
+        first = self.tz.utcoffset(local.replace(fold=0))
+        second = self.tz.utcoffset(local.replace(fold=1))
+        return (first - second).total_seconds() if first > second else 0.0
+
+    def _count_gaps(self, present_ts: np.ndarray) -> None:
+        if not len(present_ts):
+            return
+        if self._last_present is not None:
+            present_ts = np.concatenate([[self._last_present], present_ts])
+        self._last_present = float(present_ts[-1])
+
+        diffs = np.diff(present_ts)
+        gaps = diffs[diffs > self.frequency * 1.5] - self.frequency
+        if len(gaps):
+            self.counts["gaps"] += len(gaps)
+            self.counts["missing_intervals"] += int(np.rint(gaps / self.frequency).sum())
+            self.counts["longest_gap_seconds"] = max(self.counts["longest_gap_seconds"], float(gaps.max()))
+
+    def _rolling_outliers(self, ts: np.ndarray, values: np.ndarray) -> np.ndarray:
+        """
+        Z-score of each value against the preceding window of its slot.
+
+        All slots are handled at once: values are ordered by (slot, time)
+        and window sums come from one cumulative sum, bounded per slot.
+        """
+        if not len(values):
+            return np.zeros(0, dtype=bool)
+        if self.slots > 1:
+            new_slot = np.floor(ts / self.frequency).astype(np.int64) % self.slots
+        else:
+            new_slot = np.zeros(len(ts), dtype=np.int64)
+        slot = np.concatenate([self._history_slot, new_slot])
+        combined = np.concatenate([self._history, values])
+        n_history = len(self._history)
+
+        # History precedes the chunk within each slot, both in time order
+        order = np.lexsort((np.arange(len(slot)), slot))
+        slot, combined = slot[order], combined[order]
+        csum = np.concatenate([[0.0], np.cumsum(combined)])
+        csq = np.concatenate([[0.0], np.cumsum(combined * combined)])
+
+        pos = np.arange(len(combined))
+        lo = np.maximum(np.searchsorted(slot, slot, side="left"), pos - self.window)
+        n = pos - lo
+        safe_n = np.maximum(n, 1)
+        mean = (csum[pos] - csum[lo]) / safe_n
+        std = np.sqrt(np.maximum((csq[pos] - csq[lo]) / safe_n - mean * mean, 0.0))
+
+        if self.capacity_mw:
+            scale = np.full(len(combined), self.capacity_mw * self.frequency / 3600)
+        else:
+            # Largest reading before each one, so the floor does not depend on chunking
+            running = np.maximum.accumulate(np.concatenate([[self._scale], np.abs(values)]))
+            self._scale = float(running[-1])
+            scale = np.zeros(len(combined))
+            scale[np.flatnonzero(order >= n_history)] = running[:-1][order[order >= n_history] - n_history]
+        spread = np.maximum(std, OUTLIER_SPREAD_FLOOR * scale)
+        judged = (order >= n_history) & (n >= max(self.window // 4, 2)) & (spread > 0)
+        outlier_sorted = judged & (np.abs(combined - mean) > OUTLIER_Z_SCORE * spread)
+
+        # Keep the last `window` accepted values of every slot
+        slot, combined = slot[~outlier_sorted], combined[~outlier_sorted]
+        from_end = np.searchsorted(slot, slot, side="right") - np.arange(len(slot))
+        self._history_slot = slot[from_end <= self.window]
+        self._history = combined[from_end <= self.window]
+
+        outlier = np.zeros(len(order), dtype=bool)
+        outlier[order] = outlier_sorted
+        return outlier[n_history:]
@@ -0,0 +1,130 @@
+"""
+Generation File Storage Helpers
+Local working copies of files kept behind FileStoragePort
+"""
+import asyncio
+import hashlib
+import os
+import tempfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+from backend.core.ports import FileStoragePort
+
+
+# Parsers need a seekable local file; remote objects are cached here
+LOCAL_CACHE_DIR = os.environ.get(
+    "GENERATION_CACHE_DIR",
+    os.path.join(os.environ.get("UPLOAD_DIR", "/tmp/uploads/generation"), "cache"),
+)
+
+# Total size of cached copies; least recently used files are evicted beyond it
+LOCAL_CACHE_MAX_BYTES = int(os.environ.get("GENERATION_CACHE_MAX_BYTES", str(2 * 1024 ** 3)))
+
+# Block size for hashing files on disk
+HASH_BLOCK_BYTES = 1024 * 1024
+
+
+async def fetch_local_copy(storage: FileStoragePort, storage_uri: str) -> str:
+    """
+    Return a local path for a stored file, downloading it once if needed.
+
+    Local adapters already return filesystem paths, which are used as-is.
+    Downloaded copies share a cache of LOCAL_CACHE_MAX_BYTES; the least
+    recently used copies are removed to make room for new ones.
+    """
+    if os.path.isfile(storage_uri):
+        return storage_uri
+
+    name = hashlib.sha256(storage_uri.encode("utf-8")).hexdigest()
+    cache_path = os.path.join(LOCAL_CACHE_DIR, name + os.path.splitext(storage_uri)[1])
+    if os.path.isfile(cache_path):
+        # The modification time orders entries for eviction
+        os.utime(cache_path)
+        return cache_path
+
+    os.makedirs(LOCAL_CACHE_DIR, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=LOCAL_CACHE_DIR, suffix=".tmp")
+    os.close(fd)
+    try:
+        # Streamed straight to disk so memory use does not grow with file size
+        await storage.download_to_file(storage_uri, tmp_path)
+    except BaseException:
+        os.remove(tmp_path)
+        raise
+    os.replace(tmp_path, cache_path)
+    evict_local_cache(keep=cache_path)
+    return cache_path
+
+
+def evict_local_cache(keep: Optional[str] = None, max_bytes: Optional[int] = None) -> int:
+    """
+    Remove least recently used cached copies until the cache fits its budget.
+
+    Args:
+        keep: Path that is never removed, usually the copy just returned
+        max_bytes: Budget in bytes; defaults to LOCAL_CACHE_MAX_BYTES
+
+    Returns:
+        Number of files removed
+    """
+    limit = LOCAL_CACHE_MAX_BYTES if max_bytes is None else max_bytes
+    entries = []
+    with os.scandir(LOCAL_CACHE_DIR) as it:
+        for entry in it:
+            # .tmp files are downloads still in progress
+            if entry.is_file() and not entry.name.endswith(".tmp"):
+                stat = entry.stat()
+                entries.append((stat.st_mtime, stat.st_size, entry.path))
+
+    total = sum(size for _, size, _ in entries)
+    removed = 0
+    for _, size, path in sorted(entries):
+        if total <= limit:
+            break
+        if path == keep:
+            continue
+        try:
+            os.remove(path)
+        except FileNotFoundError:
+            pass
+        total -= size
+        removed += 1
+    return removed
+
+
+def run_sync(coro):
+    """
+    Run a storage coroutine from synchronous code.
+
+    When called from inside a running event loop the coroutine runs on a
+    helper thread with its own loop.
+    """
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+def local_file_path(storage_uri: str) -> str:
+    """Synchronous variant of fetch_local_copy using the container's file storage."""
+    if os.path.isfile(storage_uri):
+        return storage_uri
+
+    from backend.core.container import container
+
+    return run_sync(fetch_local_copy(container.file_storage, storage_uri))
+
+
+def sha256_file(file_path: str) -> str:
+    """SHA-256 of a file on disk, read in fixed-size blocks."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as f:
+        while True:
+            block = f.read(HASH_BLOCK_BYTES)
+            if not block:
+                break
+            digest.update(block)
+    return digest.hexdigest()
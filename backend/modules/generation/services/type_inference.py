@@ -0,0 +1,431 @@
+"""
+Column Type Inference
+Regex- and format-based type detection and fixed-format timestamp parsing
+"""
+import re
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from zoneinfo import ZoneInfo
+
+import numpy as np
+
+
+NUMERIC_PATTERN = re.compile(
+    r"^[+-]?(?:\d+|\d{1,3}(?:,\d{3})+)?(?:\.\d+)?(?:[eE][+-]?\d+)?$"
+)
+
+# Candidate timestamp formats, most specific first. Day-first variants
+# precede month-first ones; when both fit, see _DAY_MONTH_SWAPS.
+TIMESTAMP_FORMATS = [
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%dT%H:%M:%S%z",
+    "%Y-%m-%d %H:%M:%S%z",
+    "%Y/%m/%d %H:%M:%S",
+    "%Y/%m/%d %H:%M",
+    "%d/%m/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M",
+    "%m/%d/%Y %H:%M:%S",
+    "%m/%d/%Y %H:%M",
+    "%d-%m-%Y %H:%M:%S",
+    "%d-%m-%Y %H:%M",
+    "%d.%m.%Y %H:%M:%S",
+    "%d.%m.%Y %H:%M",
+    "%m/%d/%Y %I:%M:%S %p",
+    "%m/%d/%Y %I:%M %p",
+    "%Y-%m-%d",
+    "%Y/%m/%d",
+    "%d/%m/%Y",
+    "%m/%d/%Y",
+    "%d-%m-%Y",
+    "%d.%m.%Y",
+]
+
+# Cheap shape check run before any strptime attempt
+TIMESTAMP_SHAPE = re.compile(
+    r"^\d{1,4}[-/.]\d{1,2}[-/.]\d{1,4}(?:[ T]\d{1,2}:\d{2}(?::\d{2}(?:\.\d+)?)?(?:\s?[AaPp][Mm])?(?:Z|[+-]\d{2}:?\d{2})?)?$"
+)
+
+# Formats numpy parses natively as ISO 8601
+ISO_FORMATS = {
+    "%Y-%m-%d %H:%M:%S.%f",
+    "%Y-%m-%dT%H:%M:%S.%f",
+    "%Y-%m-%d %H:%M:%S",
+    "%Y-%m-%dT%H:%M:%S",
+    "%Y-%m-%d %H:%M",
+    "%Y-%m-%dT%H:%M",
+    "%Y-%m-%d",
+}
+
+# Slash formats that also parse with day and month swapped. If a sample fits
+# both, a day above 12 somewhere in the column decides; otherwise the format
+# is ambiguous and left undetected.
+_DAY_MONTH_SWAPS = {
+    "%d/%m/%Y %H:%M:%S": "%m/%d/%Y %H:%M:%S",
+    "%d/%m/%Y %H:%M": "%m/%d/%Y %H:%M",
+    "%d/%m/%Y": "%m/%d/%Y",
+}
+
+# Leading day/month pair of a slash date, for resolving ambiguity
+_LEADING_PAIR = re.compile(r"^(\d{1,2})/(\d{1,2})/")
+
+# Fixed-width numeric directives, parsed by position without strptime
+_DIRECTIVE_WIDTHS = {"%Y": 4, "%m": 2, "%d": 2, "%H": 2, "%M": 2, "%S": 2}
+
+# Translation of display-style timestamp tokens to strptime directives
+_FORMAT_TOKENS = [
+    ("YYYY", "%Y"),
+    ("YY", "%y"),
+    ("MM", "%m"),
+    ("DD", "%d"),
+    ("HH", "%H"),
+    ("mm", "%M"),
+    ("ss", "%S"),
+]
+
+# Sample size used to learn a column's timestamp format
+FORMAT_SAMPLE_SIZE = 200
+
+_EPOCH = datetime(1970, 1, 1)
+
+
+def to_strptime_format(timestamp_format: Optional[str]) -> Optional[str]:
+    """
+    Normalize a mapping timestamp format to a strptime pattern.
+
+    Accepts either a strptime pattern ("%Y-%m-%d %H:%M") or the display
+    form used by the wizard ("YYYY-MM-DD HH:mm:ss").
+    """
+    if not timestamp_format:
+        return None
+    if "%" in timestamp_format:
+        return timestamp_format
+
+    result = timestamp_format
+    for token, directive in _FORMAT_TOKENS:
+        result = result.replace(token, directive)
+    return result
+
+
+def is_numeric(value: str) -> bool:
+    """Whether a string is a plain or thousands-separated number."""
+    return bool(value) and value not in "+-." and bool(NUMERIC_PATTERN.match(value))
+
+
+def detect_timestamp_format(values: Sequence[Any]) -> Optional[str]:
+    """
+    Learn the strptime format shared by a sample of timestamp strings.
+
+    Candidates are tried against the first FORMAT_SAMPLE_SIZE values. When
+    both the day-first and the month-first slash format fit them, all
+    values are scanned for a day above 12 to tell the two apart.
+
+    Returns:
+        The first candidate format that parses every non-empty sample, or
+        None if no candidate fits or day and month order stays ambiguous
+    """
+    return _detect_format(values)[0]
+
+
+def _detect_format(values: Sequence[Any]) -> Tuple[Optional[str], bool]:
+    """
+    Returns:
+        Tuple of (format, whether the values are timestamps at all)
+    """
+    samples = []
+    for value in values:
+        if value is None or value == "":
+            continue
+        text = str(value).strip()
+        if not TIMESTAMP_SHAPE.match(text):
+            return None, False
+        samples.append(text)
+        if len(samples) >= FORMAT_SAMPLE_SIZE:
+            break
+
+    if not samples:
+        return None, False
+
+    for fmt in TIMESTAMP_FORMATS:
+        if not _parses_all(samples, fmt):
+            continue
+        swapped = _DAY_MONTH_SWAPS.get(fmt)
+        if swapped and _parses_all(samples, swapped):
+            order = _day_month_order(values)
+            if order is None:
+                return None, True
+            return (fmt if order == "day" else swapped), True
+        return fmt, True
+
+    return None, False
+
+
+def _parses_all(samples: List[str], fmt: str) -> bool:
+    try:
+        for text in samples:
+            datetime.strptime(text, fmt)
+    except ValueError:
+        return False
+    return True
+
+
+def _day_month_order(values: Sequence[Any]) -> Optional[str]:
+    """"day" or "month" for whichever leading field exceeds 12 first, else None."""
+    for value in values:
+        if value is None or value == "":
+            continue
+        match = _LEADING_PAIR.match(str(value).strip())
+        if not match:
+            continue
+        if int(match.group(1)) > 12:
+            return "day"
+        if int(match.group(2)) > 12:
+            return "month"
+    return None
+
+
+def infer_column(values: Sequence[Any]) -> Tuple[str, Optional[str]]:
+    """
+    Infer column type and, for datetime columns, the timestamp format.
+
+    Returns:
+        Tuple of (inferred_type, timestamp_format)
+    """
+    present = [v for v in values if v is not None and v != ""]
+    if not present:
+        return "string", None
+
+    if all(isinstance(v, datetime) for v in present):
+        return "datetime", None
+    if all(isinstance(v, (int, float)) for v in present):
+        return "numeric", None
+
+    texts = [str(v).strip() for v in present]
+    if all(is_numeric(t) for t in texts):
+        return "numeric", None
+
+    fmt, is_timestamp = _detect_format(texts)
+    if is_timestamp:
+        # fmt is None if day and month order is ambiguous in the sample
+        return "datetime", fmt
+
+    return "string", None
+
+
+def parse_number_column(values: Sequence[Any]) -> np.ndarray:
+    """Parse raw cells to floats, NaN where missing or unparseable."""
+    cleaned = ["nan" if v is None or v == "" else v for v in values]
+    try:
+        return np.asarray(cleaned, dtype=np.float64)
+    except (ValueError, TypeError):
+        pass
+
+    result = np.empty(len(cleaned), dtype=np.float64)
+    for i, value in enumerate(cleaned):
+        if isinstance(value, (int, float)):
+            result[i] = value
+            continue
+        text = str(value).strip().replace(",", "")
+        try:
+            result[i] = float(text) if text else np.nan
+        except ValueError:
+            result[i] = np.nan
+    return result
+
+
+def parse_timestamp_column(
+    values: Sequence[Any],
+    timestamp_format: Optional[str],
+    tz_name: Optional[str] = "UTC",
+) -> np.ndarray:
+    """
+    Parse a column of timestamps with one fixed format.
+
+    ISO formats are parsed by numpy in C. Other formats made of zero-padded
+    numeric directives are decoded by byte position as one uint8 matrix.
+    Anything else falls back to strptime per value, and without a format
+    to dateutil per value.
+
+    Args:
+        values: Raw cells (strings or datetimes)
+        timestamp_format: strptime format, or None if unknown
+        tz_name: IANA timezone of naive timestamps
+
+    Returns:
+        UTC epoch seconds, NaN where a value could not be parsed
+    """
+    texts = []
+    has_datetimes = False
+    for value in values:
+        if value is None or value == "":
+            texts.append("NaT")
+        elif isinstance(value, datetime):
+            has_datetimes = True
+            texts.append(value)
+        else:
+            texts.append(str(value).strip())
+
+    if has_datetimes or not timestamp_format:
+        return _parse_per_value(texts, timestamp_format, tz_name)
+    if timestamp_format in ISO_FORMATS:
+        return localize_to_utc(_parse_iso(texts), tz_name)
+    layout = _fixed_width_layout(timestamp_format)
+    if layout:
+        return localize_to_utc(_parse_fixed_width(texts, timestamp_format, layout), tz_name)
+    return _parse_per_value(texts, timestamp_format, tz_name)
+
+
+def localize_to_utc(local_epoch: np.ndarray, tz_name: Optional[str]) -> np.ndarray:
+    """
+    Convert naive local epoch seconds to UTC.
+
+    Offsets are looked up once per distinct local hour, so a year of
+    data costs at most ~8,760 zone lookups regardless of row count.
+    """
+    if not tz_name or tz_name in ("UTC", "Etc/UTC", "GMT"):
+        return local_epoch
+
+    tz = ZoneInfo(tz_name)
+    result = local_epoch.copy()
+    valid = ~np.isnan(local_epoch)
+    if not valid.any():
+        return result
+
+    hours, inverse = np.unique(np.floor(local_epoch[valid] / 3600), return_inverse=True)
+    offsets = np.array([
+        tz.utcoffset(_EPOCH + timedelta(hours=float(h))).total_seconds()
+        for h in hours
+    ])
+    result[valid] = local_epoch[valid] - offsets[inverse]
+    return result
+
+
+def _parse_iso(texts: List[str]) -> np.ndarray:
+    """Parse ISO strings with numpy, element-wise only if the bulk parse fails."""
+    try:
+        parsed = np.array(texts, dtype="datetime64[us]")
+    except ValueError:
+        parsed = np.empty(len(texts), dtype="datetime64[us]")
+        for i, text in enumerate(texts):
+            try:
+                parsed[i] = np.datetime64(text, "us")
+            except ValueError:
+                parsed[i] = np.datetime64("NaT")
+    return _datetime64_to_epoch(parsed)
+
+
+def _fixed_width_layout(timestamp_format: str) -> Optional[Tuple[int, Dict[str, int], Dict[int, int]]]:
+    """
+    Byte layout of a format made only of fixed-width numeric directives.
+
+    Returns:
+        Tuple of (width, directive offsets, literal bytes by offset), or
+        None if the format needs strptime
+    """
+    offsets: Dict[str, int] = {}
+    literals: Dict[int, int] = {}
+    pos = 0
+    for part in re.split(r"(%.)", timestamp_format):
+        if part.startswith("%"):
+            if part not in _DIRECTIVE_WIDTHS or part in offsets:
+                return None
+            offsets[part] = pos
+            pos += _DIRECTIVE_WIDTHS[part]
+        else:
+            for char in part:
+                if ord(char) > 127:
+                    return None
+                literals[pos] = ord(char)
+                pos += 1
+
+    if not {"%Y", "%m", "%d"} <= set(offsets):
+        return None
+    return pos, offsets, literals
+
+
+def _parse_fixed_width(
+    texts: List[str],
+    timestamp_format: str,
+    layout: Tuple[int, Dict[str, int], Dict[int, int]],
+) -> np.ndarray:
+    """Decode fixed-width timestamps by position; odd rows go to strptime."""
+    width, offsets, literals = layout
+    try:
+        raw = np.array(texts, dtype=f"S{width + 1}")
+    except UnicodeEncodeError:
+        return _parse_per_value(texts, timestamp_format, None)
+
+    n = len(texts)
+    mat = raw.view(np.uint8).reshape(n, width + 1)
+    ok = (mat[:, width] == 0) & (mat[:, width - 1] != 0)
+    for pos, byte in literals.items():
+        ok &= mat[:, pos] == byte
+
+    def field(directive: str, default: int) -> np.ndarray:
+        if directive not in offsets:
+            return np.full(n, default, dtype=np.int64)
+        start = offsets[directive]
+        digits = mat[:, start:start + _DIRECTIVE_WIDTHS[directive]].astype(np.int64) - 48
+        ok[:] &= ((digits >= 0) & (digits <= 9)).all(axis=1)
+        return digits @ (10 ** np.arange(digits.shape[1] - 1, -1, -1))
+
+    year, month, day = field("%Y", 1970), field("%m", 1), field("%d", 1)
+    hour, minute, second = field("%H", 0), field("%M", 0), field("%S", 0)
+    ok &= (month >= 1) & (month <= 12) & (day >= 1) & (hour <= 23) & (minute <= 59) & (second <= 59)
+
+    months = ((year - 1970) * 12 + np.clip(month, 1, 12) - 1).astype("datetime64[M]")
+    month_days = ((months + 1).astype("datetime64[D]") - months.astype("datetime64[D]")).astype(np.int64)
+    ok &= day <= month_days
+
+    days = months.astype("datetime64[D]").astype(np.int64) + day - 1
+    result = (days * 86400 + hour * 3600 + minute * 60 + second).astype(np.float64)
+
+    if not ok.all():
+        # Unpadded or malformed values take the slow path individually
+        bad = np.flatnonzero(~ok)
+        result[bad] = _parse_per_value([texts[i] for i in bad], timestamp_format, None)
+    return result
+
+
+def _parse_per_value(
+    values: List[Any],
+    timestamp_format: Optional[str],
+    tz_name: Optional[str],
+) -> np.ndarray:
+    """Slow path: parse each value individually, then localize naive ones."""
+    result = np.full(len(values), np.nan)
+    aware = np.zeros(len(values), dtype=bool)
+    for i, value in enumerate(values):
+        if isinstance(value, datetime):
+            ts = value
+        elif value == "NaT":
+            continue
+        else:
+            try:
+                if timestamp_format:
+                    ts = datetime.strptime(value, timestamp_format)
+                else:
+                    from dateutil import parser
+                    ts = parser.parse(value)
+            except (ValueError, OverflowError):
+                continue
+
+        if ts.tzinfo is not None:
+            ts = ts.astimezone(timezone.utc).replace(tzinfo=None)
+            aware[i] = True
+        result[i] = (ts - _EPOCH).total_seconds()
+
+    if aware.any():
+        result[~aware] = localize_to_utc(result[~aware], tz_name)
+        return result
+    return localize_to_utc(result, tz_name)
+
+
+def _datetime64_to_epoch(parsed: np.ndarray) -> np.ndarray:
+    epoch = parsed.astype("datetime64[us]").astype(np.int64) / 1e6
+    epoch[np.isnat(parsed)] = np.nan
+    return epoch
@@ -0,0 +1,245 @@
+"""
+Uncertainty Engine
+Monte-Carlo P50/P90 credit forecasts per vintage using the vectorized methodology kernels
+"""
+import asyncio
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+from ..grid_ef_database import get_grid_ef
+from ..methodologies.registry import MethodologyRegistry
+from .credit_calculator import CreditCalculator
+from .portfolio import get_process_pool
+
+
+# Draws simulated per worker task
+BATCH_DRAWS = 25000
+
+# Relative EF spread used when no operating/build margin range is published
+DEFAULT_EF_UNCERTAINTY = 0.10
+
+# Percentiles reported; P90 is the value exceeded in 90% of draws (10th percentile)
+EXCEEDANCE_LEVELS = {"p10": 90, "p50": 50, "p90": 10}
+
+# Inputs given as totals for the estimation period; each draw applies them
+# in proportion to its sampled generation, so they split across vintages
+PERIOD_TOTAL_INPUTS = (
+    "captive_generation_mwh",
+    "biogas_captured_m3",
+    "auxiliary_power_mwh",
+    "onsite_power_consumption_mwh",
+    "fossil_fuel_consumption_gj",
+)
+
+# Required inputs the deterministic calculator would otherwise fill with
+# placeholder values; simulations refuse to run without them
+NO_DEFAULT_INPUTS = ("capacity_mw", "biogas_captured_m3")
+
+
+def grid_ef_range(
+    country_code: str,
+    ef_override: Optional[float] = None,
+    ef_uncertainty: Optional[float] = None,
+) -> Tuple[float, float, float]:
+    """
+    Triangular (low, mode, high) distribution for the grid EF.
+
+    The combined margin is the mode. The operating and build margins bound
+    the range when published; otherwise (and for manual overrides) the
+    range is the mode ± ef_uncertainty.
+    """
+    spread = DEFAULT_EF_UNCERTAINTY if ef_uncertainty is None else ef_uncertainty
+    if ef_override is not None:
+        return ef_override * (1 - spread), ef_override, ef_override * (1 + spread)
+
+    ef_data = get_grid_ef(country_code)
+    if not ef_data:
+        raise ValueError(f"No emission factor data for country: {country_code}")
+
+    mode = ef_data.combined_margin
+    margins = [m for m in (ef_data.operating_margin, ef_data.build_margin) if m is not None]
+    if ef_uncertainty is None and margins:
+        low, high = min(margins + [mode]), max(margins + [mode])
+        if high > low:
+            return low, mode, high
+    return mode * (1 - spread), mode, mode * (1 + spread)
+
+
+def _sample(rng: np.random.Generator, spec: Sequence[float], size: int) -> np.ndarray:
+    """Uniform draws for [low, high], triangular for [low, mode, high]."""
+    if len(spec) == 2:
+        return rng.uniform(spec[0], spec[1], size)
+    if spec[0] == spec[2]:
+        return np.full(size, float(spec[1]))
+    return rng.triangular(spec[0], spec[1], spec[2], size)
+
+
+def simulate_batch(
+    methodology_id: str,
+    vintages: Dict[int, float],
+    ef_range: Tuple[float, float, float],
+    generation_cv: float,
+    parameter_ranges: Dict[str, Sequence[float]],
+    fixed_inputs: Dict[str, Any],
+    period_generation_mwh: float,
+    draws: int,
+    seed: np.random.SeedSequence,
+) -> Dict[int, np.ndarray]:
+    """
+    Simulate one batch of draws; executed in a worker process.
+
+    Each draw shares one grid EF and one set of parameter values across
+    vintages, while generation varies independently per vintage.
+    PERIOD_TOTAL_INPUTS are scaled by each vintage's sampled generation
+    over period_generation_mwh.
+
+    Returns:
+        {vintage: emission reductions per draw}
+    """
+    rng = np.random.default_rng(seed)
+    methodology = MethodologyRegistry.get(methodology_id)
+
+    shared = dict(fixed_inputs)
+    shared["ef_grid"] = _sample(rng, ef_range, draws)
+    for name, spec in parameter_ranges.items():
+        shared[name] = _sample(rng, spec, draws)
+
+    results = {}
+    for vintage, generation_mwh in vintages.items():
+        factor = np.maximum(rng.normal(1.0, generation_cv, draws), 0.0) if generation_cv > 0 else np.ones(draws)
+        columns = dict(shared)
+        columns["generation_mwh"] = generation_mwh * factor
+        for name in PERIOD_TOTAL_INPUTS:
+            if name in shared and period_generation_mwh > 0:
+                per_mwh = np.asarray(shared[name], dtype=np.float64) / period_generation_mwh
+                columns[name] = per_mwh * columns["generation_mwh"]
+        results[vintage] = methodology.compute_kernel(columns).total_er_tco2e
+    return results
+
+
+async def simulate_uncertainty(
+    methodology_id: str,
+    monthly_generation: Dict[str, float],
+    country_code: str,
+    project_type: str,
+    draws: int = 10000,
+    generation_cv: float = 0.1,
+    ef_override: Optional[float] = None,
+    ef_uncertainty: Optional[float] = None,
+    parameter_ranges: Optional[Dict[str, List[float]]] = None,
+    additional_inputs: Optional[Dict[str, Any]] = None,
+    seed: Optional[int] = None,
+    capacity_mw: Optional[float] = None,
+) -> Dict[str, Any]:
+    """
+    Monte-Carlo credit forecast with percentile bands per vintage.
+
+    Draws are split into batches that run on the shared process pool;
+    each batch evaluates the methodology's vectorized kernel once per
+    vintage. The deterministic estimate is computed first, so invalid
+    inputs fail with the same errors as a normal estimation.
+
+    Args:
+        methodology_id: Methodology with a vectorized kernel
+        monthly_generation: {"YYYY-MM": MWh}
+        country_code: ISO country code for grid EF lookup
+        project_type: Type of project
+        draws: Number of Monte-Carlo draws
+        generation_cv: Relative standard deviation of annual generation
+        ef_override: Manual EF value used as the distribution mode
+        ef_uncertainty: Relative EF spread (replaces the OM/BM range)
+        parameter_ranges: {input name: [low, high] or [low, mode, high]}
+        additional_inputs: Fixed methodology inputs; PERIOD_TOTAL_INPUTS
+            cover the whole period and are split by sampled generation
+        seed: Seed for reproducible draws
+        capacity_mw: The project's installed capacity, unless additional_inputs sets one
+
+    Returns:
+        Deterministic result summary plus percentile bands per vintage and in total
+
+    Raises:
+        ValueError: For invalid inputs or a methodology without a kernel
+    """
+    calculator = CreditCalculator(methodology_id)
+    if not calculator.methodology.has_kernel:
+        raise ValueError(f"Methodology {methodology_id} does not support uncertainty analysis")
+
+    parameter_ranges = parameter_ranges or {}
+    for name, spec in parameter_ranges.items():
+        if len(spec) not in (2, 3) or list(spec) != sorted(spec):
+            raise ValueError(f"Range for {name} must be [low, high] or [low, mode, high] in ascending order")
+
+    inputs = dict(additional_inputs or {})
+    if capacity_mw is not None:
+        inputs.setdefault("capacity_mw", capacity_mw)
+    schema = calculator.methodology.required_inputs_schema()
+    for name in NO_DEFAULT_INPUTS:
+        if schema.get(name, {}).get("required") and name not in inputs and name not in parameter_ranges:
+            raise ValueError(
+                f"{name} is required for {methodology_id} uncertainty analysis; "
+                "set it in additional_inputs or parameter_ranges"
+            )
+
+    deterministic = calculator.calculate_from_monthly(
+        monthly_generation=monthly_generation,
+        country_code=country_code,
+        project_type=project_type,
+        ef_override=ef_override,
+        additional_inputs=inputs,
+    )
+    annual = calculator._calculate_annual_breakdown(monthly_generation, deterministic["ef_value"])
+    vintages = {a["vintage"]: a["generation_mwh"] for a in annual}
+    ef_range = grid_ef_range(country_code, ef_override, ef_uncertainty)
+
+    fixed_inputs = {
+        "project_type": project_type,
+        **{k: v for k, v in inputs.items() if isinstance(v, (int, float, str))},
+    }
+
+    loop = asyncio.get_running_loop()
+    pool = get_process_pool()
+    sizes = [BATCH_DRAWS] * (draws // BATCH_DRAWS) + ([draws % BATCH_DRAWS] if draws % BATCH_DRAWS else [])
+    seeds = np.random.SeedSequence(seed).spawn(len(sizes))
+    batches = await asyncio.gather(*(
+        loop.run_in_executor(
+            pool,
+            simulate_batch,
+            methodology_id,
+            vintages,
+            ef_range,
+            generation_cv,
+            parameter_ranges,
+            fixed_inputs,
+            deterministic["total_generation_mwh"],
+            size,
+            batch_seed,
+        )
+        for size, batch_seed in zip(sizes, seeds)
+    ))
+
+    per_vintage = {v: np.concatenate([b[v] for b in batches]) for v in vintages}
+    total = np.sum(list(per_vintage.values()), axis=0)
+
+    return {
+        "methodology_id": methodology_id,
+        "draws": draws,
+        "ef_range": {"low": ef_range[0], "mode": ef_range[1], "high": ef_range[2]},
+        "deterministic_er_tco2e": deterministic["total_er_tco2e"],
+        "total_generation_mwh": deterministic["total_generation_mwh"],
+        "vintages": [
+            {"vintage": v, "generation_mwh": vintages[v], **_bands(per_vintage[v])}
+            for v in sorted(vintages)
+        ],
+        "total": _bands(total),
+    }
+
+
+def _bands(values: np.ndarray) -> Dict[str, float]:
+    """Mean, standard deviation and exceedance percentiles of a draw column."""
+    percentiles = np.percentile(values, list(EXCEEDANCE_LEVELS.values()))
+    return {
+        "mean": round(float(values.mean()), 4),
+        "std": round(float(values.std()), 4),
+        **{label: round(float(p), 4) for label, p in zip(EXCEEDANCE_LEVELS, percentiles)},
+    }
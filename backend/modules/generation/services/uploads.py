@@ -0,0 +1,383 @@
+"""
+Chunked Upload Service
+Resumable init / append / finalize uploads streamed through FileStoragePort
+"""
+import asyncio
+import hashlib
+import os
+import uuid
+from datetime import datetime, timedelta
+from typing import Dict, Optional, Tuple
+
+from sqlalchemy.orm import Session
+
+from backend.core.models import Project
+from backend.core.ports import FileStoragePort
+
+from ..models import UploadSession, UploadedFile
+from .profile_cache import get_file_profile
+from .storage import fetch_local_copy, sha256_file
+
+
+# Chunk size suggested to clients; each chunk becomes one storage part
+CHUNK_SIZE = 8 * 1024 * 1024
+
+# Largest chunk accepted in a single append request
+MAX_CHUNK_BYTES = 64 * 1024 * 1024
+
+# Open sessions without an append for this long are expired and their parts discarded
+UPLOAD_SESSION_TTL = timedelta(hours=int(os.environ.get("UPLOAD_SESSION_TTL_HOURS", "24")))
+
+# Incremental SHA-256 state per open upload: (hasher, bytes hashed)
+_hashers: Dict[str, Tuple["hashlib._Hash", int]] = {}
+
+# Serializes appends to the same upload within this process
+_locks: Dict[str, asyncio.Lock] = {}
+
+
+class ChunkedUploadService:
+    """
+    Resumable upload of large generation files.
+
+    Each appended chunk is written straight to storage as one part, so
+    neither the request handler nor the process ever holds the whole file.
+    The SHA-256 is updated chunk by chunk; if the process restarts mid-upload
+    the digest is recomputed from the assembled file on finalize.
+
+    Resuming: a client that lost its connection reads `received_bytes` from
+    the session and continues appending from that offset. Sessions idle
+    for longer than UPLOAD_SESSION_TTL are expired by expire_stale().
+
+    Usage:
+        service = ChunkedUploadService(db, storage)
+        session = service.start(project_id, "scada.csv", "text/csv", None, user_id)
+        await service.append(session, 0, chunk)
+        uploaded_file = await service.finalize(session)
+    """
+
+    def __init__(self, db: Session, storage: FileStoragePort):
+        self.db = db
+        self.storage = storage
+
+    def start(
+        self,
+        project_id: int,
+        filename: str,
+        content_type: Optional[str],
+        total_bytes: Optional[int],
+        user_id: Optional[int],
+        checksum: Optional[str] = None,
+    ) -> UploadSession:
+        """
+        Open a new upload session.
+
+        If the client declares the checksum and size of content it already
+        uploaded to one of its own projects, the session completes at once
+        as a reference to that file and no bytes need to be sent.
+        """
+        session = UploadSession(
+            id=uuid.uuid4().hex,
+            project_id=project_id,
+            original_filename=filename,
+            mime_type=content_type or "application/octet-stream",
+            total_bytes=total_bytes,
+            received_bytes=0,
+            part_count=0,
+            status="open",
+            uploaded_by=user_id,
+        )
+        self.db.add(session)
+
+        existing = None
+        if checksum and total_bytes is not None and user_id is not None:
+            existing = self.find_duplicate(checksum.lower(), total_bytes, project_id, owner_id=user_id)
+        if existing is not None:
+            uploaded_file = self._reference(existing, session)
+            session.received_bytes = total_bytes
+            session.status = "completed"
+            session.file_id = uploaded_file.id
+            self.db.commit()
+            self.db.refresh(session)
+            return session
+
+        self.db.commit()
+        self.db.refresh(session)
+
+        _hashers[session.id] = (hashlib.sha256(), 0)
+        return session
+
+    def find_duplicate(
+        self,
+        checksum: str,
+        size: int,
+        project_id: int,
+        owner_id: Optional[int] = None,
+    ) -> Optional[UploadedFile]:
+        """
+        Find a stored file with identical content.
+
+        A file in the target project wins over one elsewhere. With owner_id,
+        only projects of that developer are considered.
+
+        Args:
+            checksum: SHA-256 of the content
+            size: Content size in bytes
+            project_id: Project the new upload belongs to
+            owner_id: Restrict matches to projects owned by this user
+        """
+        query = self.db.query(UploadedFile).filter(
+            UploadedFile.checksum == checksum,
+            UploadedFile.file_size_bytes == size,
+        )
+        if owner_id is not None:
+            query = query.join(Project, Project.id == UploadedFile.project_id).filter(
+                Project.developer_id == owner_id
+            )
+
+        candidates = query.order_by(UploadedFile.id).all()
+        candidates.sort(key=lambda f: f.project_id != project_id)
+        for candidate in candidates:
+            # Local copies can disappear (e.g. ephemeral /tmp); remote URIs are trusted
+            if "://" in candidate.storage_uri or os.path.isfile(candidate.storage_uri):
+                return candidate
+        return None
+
+    async def append(self, session: UploadSession, offset: int, content: bytes) -> UploadSession:
+        """
+        Store the next chunk of an upload.
+
+        Args:
+            session: Open upload session
+            offset: Byte offset of the chunk; must equal received_bytes
+            content: Chunk content
+
+        Raises:
+            ValueError: If the session is closed, the offset does not match
+                or the chunk exceeds the declared size
+        """
+        lock = _locks.setdefault(session.id, asyncio.Lock())
+        async with lock:
+            self.db.refresh(session)
+            if session.status != "open":
+                raise ValueError(f"Upload is {session.status}")
+            if offset != session.received_bytes:
+                raise ValueError(f"Expected offset {session.received_bytes}, got {offset}")
+            if session.total_bytes is not None and offset + len(content) > session.total_bytes:
+                raise ValueError("Chunk exceeds the declared upload size")
+            if not content:
+                return session
+
+            part_number = session.part_count + 1
+            await self.storage.upload_part(session.id, part_number, content)
+
+            hasher, hashed = _hashers.get(session.id, (None, -1))
+            if hasher is not None and hashed == offset:
+                await asyncio.to_thread(hasher.update, content)
+                _hashers[session.id] = (hasher, hashed + len(content))
+            else:
+                # State lost (e.g. restart); the digest is rebuilt on finalize
+                _hashers.pop(session.id, None)
+
+            session.part_count = part_number
+            session.received_bytes = offset + len(content)
+            self.db.commit()
+            return session
+
+    async def finalize(self, session: UploadSession, expected_checksum: Optional[str] = None) -> UploadedFile:
+        """
+        Assemble the parts, verify the checksum and register the file.
+
+        Args:
+            session: Open upload session with at least one part
+            expected_checksum: Optional client-side SHA-256 to verify against
+
+        Content that is already stored (same SHA-256 and size) is not
+        written again; the upload becomes a reference to the existing file.
+        A new file is registered as pending: profiling it is left to
+        profile_uploaded_file() so finalizing does not scale with file size.
+
+        Returns:
+            The new or referenced UploadedFile record
+
+        Raises:
+            ValueError: If the upload is incomplete or the checksum differs
+        """
+        async with _locks.setdefault(session.id, asyncio.Lock()):
+            self.db.refresh(session)
+            if session.status != "open":
+                raise ValueError(f"Upload is {session.status}")
+            if session.part_count == 0:
+                raise ValueError("Upload has no data")
+            if session.total_bytes is not None and session.received_bytes != session.total_bytes:
+                raise ValueError(
+                    f"Upload incomplete: received {session.received_bytes} of {session.total_bytes} bytes"
+                )
+
+            hasher, hashed = _hashers.pop(session.id, (None, -1))
+            checksum = None
+            if hasher is not None and hashed == session.received_bytes:
+                checksum = hasher.hexdigest()
+                try:
+                    self._verify_checksum(session, checksum, expected_checksum)
+                except ValueError:
+                    await self.storage.abort_upload(session.id)
+                    raise
+                existing = self._find_session_duplicate(session, checksum)
+                if existing is not None:
+                    # Same content is already stored: drop the parts unassembled
+                    await self.storage.abort_upload(session.id)
+                    return self._complete(session, self._reference(existing, session))
+
+            timestamp = datetime.utcnow().strftime("%Y%m%d_%H%M%S")
+            storage_name = f"generation/{session.project_id}_{timestamp}_{session.original_filename}"
+            storage_uri = await self.storage.complete_upload(
+                session.id, storage_name, session.part_count, session.mime_type
+            )
+
+            if checksum is None:
+                local_path = await fetch_local_copy(self.storage, storage_uri)
+                checksum = await asyncio.to_thread(sha256_file, local_path)
+                try:
+                    self._verify_checksum(session, checksum, expected_checksum)
+                except ValueError:
+                    await self.storage.delete(storage_uri)
+                    raise
+                existing = self._find_session_duplicate(session, checksum)
+                if existing is not None:
+                    await self.storage.delete(storage_uri)
+                    return self._complete(session, self._reference(existing, session))
+
+            uploaded_file = UploadedFile(
+                project_id=session.project_id,
+                original_filename=session.original_filename,
+                mime_type=session.mime_type,
+                storage_uri=storage_uri,
+                file_size_bytes=session.received_bytes,
+                checksum=checksum,
+                uploaded_by=session.uploaded_by,
+                status="pending",  # Columns are detected by a background task
+            )
+            self.db.add(uploaded_file)
+            self.db.flush()
+            return self._complete(session, uploaded_file)
+
+    async def abort(self, session: UploadSession) -> None:
+        """Discard an open upload and its stored parts."""
+        if session.status != "open":
+            return
+        await self.storage.abort_upload(session.id)
+        _hashers.pop(session.id, None)
+        _locks.pop(session.id, None)
+        session.status = "aborted"
+        self.db.commit()
+
+    async def expire_stale(self) -> int:
+        """
+        Expire open sessions idle for longer than UPLOAD_SESSION_TTL.
+
+        Their stored parts are discarded, and this process's hashing state
+        and locks are released, including those of sessions another
+        process has already closed.
+
+        Returns:
+            Number of sessions expired
+        """
+        cutoff = datetime.utcnow() - UPLOAD_SESSION_TTL
+        stale = self.db.query(UploadSession).filter(
+            UploadSession.status == "open",
+            UploadSession.updated_at < cutoff,
+        ).all()
+        for session in stale:
+            lock = _locks.get(session.id)
+            if lock is not None and lock.locked():
+                continue  # An append is in progress
+            await self.storage.abort_upload(session.id)
+            session.status = "expired"
+            _hashers.pop(session.id, None)
+            _locks.pop(session.id, None)
+        self.db.commit()
+
+        tracked = set(_locks) | set(_hashers)
+        if tracked:
+            still_open = {
+                upload_id for (upload_id,) in self.db.query(UploadSession.id).filter(
+                    UploadSession.id.in_(tracked),
+                    UploadSession.status == "open",
+                )
+            }
+            for upload_id in tracked - still_open:
+                _hashers.pop(upload_id, None)
+                lock = _locks.get(upload_id)
+                if lock is not None and not lock.locked():
+                    _locks.pop(upload_id, None)
+        return len(stale)
+
+    def _find_session_duplicate(self, session: UploadSession, checksum: str) -> Optional[UploadedFile]:
+        """Stored file with the session's content among its uploader's projects."""
+        if session.uploaded_by is None:
+            # Without a known owner only the session's own project is safe to match
+            existing = self.find_duplicate(checksum, session.received_bytes, session.project_id)
+            return existing if existing is not None and existing.project_id == session.project_id else None
+        return self.find_duplicate(
+            checksum, session.received_bytes, session.project_id, owner_id=session.uploaded_by
+        )
+
+    def _verify_checksum(self, session: UploadSession, checksum: str, expected_checksum: Optional[str]):
+        """Close the session and raise if the client-side checksum differs."""
+        if expected_checksum and expected_checksum.lower() != checksum:
+            session.status = "aborted"
+            self.db.commit()
+            raise ValueError("Checksum mismatch: uploaded content differs from the expected SHA-256")
+
+    def _reference(self, existing: UploadedFile, session: UploadSession) -> UploadedFile:
+        """
+        Register an upload whose content is already stored.
+
+        Within the same project the existing record is returned as-is, so
+        its mapping and processed rows stay valid. For another project a
+        new record shares the stored bytes and parsed columns.
+        """
+        if existing.project_id == session.project_id:
+            return existing
+
+        uploaded_file = UploadedFile(
+            project_id=session.project_id,
+            original_filename=session.original_filename,
+            mime_type=session.mime_type,
+            storage_uri=existing.storage_uri,
+            file_size_bytes=existing.file_size_bytes,
+            checksum=existing.checksum,
+            row_count=existing.row_count,
+            column_count=existing.column_count,
+            detected_columns=existing.detected_columns,
+            uploaded_by=session.uploaded_by,
+            status="parsed" if existing.detected_columns else "pending",
+        )
+        self.db.add(uploaded_file)
+        self.db.flush()
+        return uploaded_file
+
+    def _complete(self, session: UploadSession, uploaded_file: UploadedFile) -> UploadedFile:
+        """Mark the session completed and link it to its file."""
+        session.status = "completed"
+        session.file_id = uploaded_file.id
+        self.db.commit()
+        self.db.refresh(uploaded_file)
+        _locks.pop(session.id, None)
+        return uploaded_file
+
+
+def profile_uploaded_file(uploaded_file: UploadedFile) -> None:
+    """
+    Profile a stored upload (the default sheet of a workbook) and record its columns.
+
+    A file that cannot be parsed stays pending; the preview reports the error.
+    """
+    try:
+        profile = get_file_profile(uploaded_file)
+    except Exception:
+        return
+    uploaded_file.detected_columns = profile.columns
+    uploaded_file.row_count = profile.total_rows
+    uploaded_file.column_count = len(profile.columns)
+    uploaded_file.status = "parsed" if profile.columns else "pending"
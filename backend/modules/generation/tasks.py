@@ -0,0 +1,92 @@
+"""
+Generation Background Tasks
+Parsing, ingestion, archiving and estimation handlers run through TaskQueuePort
+"""
+from typing import Any, Dict, Optional
+
+from backend.core.models import Project
+from backend.core.tasks import task_handler
+
+from .models import UploadedFile
+from .schemas import EstimationRequest
+from .services.archive import rebuild_project_archive
+from .services.estimation import estimate_project_credits
+from .services.ingestion import process_uploaded_file
+from .services.uploads import profile_uploaded_file
+
+
+PROFILE_FILE_TASK = "generation.profile_file"
+PROCESS_FILE_TASK = "generation.process_file"
+REBUILD_ARCHIVE_TASK = "generation.rebuild_archive"
+ESTIMATE_TASK = "generation.estimate"
+
+
+def _session():
+    from backend.core.database import SessionLocal
+
+    return SessionLocal()
+
+
+@task_handler(PROFILE_FILE_TASK)
+def profile_file(payload: Dict[str, Any]) -> None:
+    """Detect the columns of a new upload. Payload: {"file_id"}"""
+    db = _session()
+    try:
+        uploaded_file = db.query(UploadedFile).filter(UploadedFile.id == payload["file_id"]).first()
+        if not uploaded_file or uploaded_file.status != "pending":
+            return
+        profile_uploaded_file(uploaded_file)
+        db.commit()
+    finally:
+        db.close()
+
+
+@task_handler(PROCESS_FILE_TASK)
+def process_file(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Ingest a mapped upload. Payload: {"file_id"}; failures are recorded on the file."""
+    return process_uploaded_file(payload["file_id"])
+
+
+@task_handler(REBUILD_ARCHIVE_TASK)
+def rebuild_archive(payload: Dict[str, Any]) -> Any:
+    """Refresh a project's Parquet archive. Payload: {"project_id"}"""
+    return rebuild_project_archive(payload["project_id"])
+
+
+@task_handler(ESTIMATE_TASK)
+def estimate(payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """
+    Run and save a credit estimation.
+
+    Payload: {"user_id", "request": EstimationRequest fields}. The result
+    is listed under the project's estimations. Invalid inputs are returned
+    as an error instead of raised, since retrying cannot fix them.
+    """
+    request = EstimationRequest.model_validate(payload["request"])
+    db = _session()
+    try:
+        project = db.query(Project).filter(
+            Project.id == request.project_id,
+            Project.developer_id == payload["user_id"]
+        ).first()
+        if not project:
+            return {"error": "Project not found"}
+        try:
+            estimation = estimate_project_credits(
+                db,
+                project.id,
+                project.project_type,
+                request.methodology_id,
+                request.country_code,
+                ef_value=request.ef_value,
+                ef_timeseries=[(p.period, p.ef) for p in request.ef_timeseries or []],
+                period_start=request.period_start,
+                period_end=request.period_end,
+                additional_inputs=request.additional_inputs,
+                created_by=payload["user_id"],
+            )
+        except ValueError as e:
+            return {"error": str(e)}
+        return {"estimation_id": estimation.id}
+    finally:
+        db.close()
@@ -167,19 +167,25 @@ def delete_project(project_id: int, current_user: User = Depends(get_current_use
     
     # Manually delete related records to avoid FK constraint issues
     # Import models here to avoid circular imports
-    from backend.modules.generation.models import UploadedFile, DatasetMapping, GenerationTimeseries, CreditEstimation
+    from backend.modules.generation.models import UploadedFile, UploadSession, DatasetMapping, GenerationTimeseries, GenerationArchive, GenerationMonth, EstimationMonthAggregate, CreditEstimation
     
     # Delete credit estimations
     db.query(CreditEstimation).filter(CreditEstimation.project_id == project_id).delete()
+    db.query(EstimationMonthAggregate).filter(EstimationMonthAggregate.project_id == project_id).delete()
     
     # Delete generation timeseries
     db.query(GenerationTimeseries).filter(GenerationTimeseries.project_id == project_id).delete()
+    db.query(GenerationArchive).filter(GenerationArchive.project_id == project_id).delete()
+    db.query(GenerationMonth).filter(GenerationMonth.project_id == project_id).delete()
     
     # Delete dataset mappings (via uploaded files)
     file_ids = [f.id for f in db.query(UploadedFile.id).filter(UploadedFile.project_id == project_id).all()]
     if file_ids:
         db.query(DatasetMapping).filter(DatasetMapping.file_id.in_(file_ids)).delete(synchronize_session=False)
     
+    # Delete upload sessions (they reference uploaded files)
+    db.query(UploadSession).filter(UploadSession.project_id == project_id).delete()
+    
     # Delete uploaded files
     db.query(UploadedFile).filter(UploadedFile.project_id == project_id).delete()
     
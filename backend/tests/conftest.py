@@ -0,0 +1,32 @@
+import os
+
+# Tests run against SQLite; backend.core.database reads this at import time
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+
+from backend.core.database import Base
+from backend.core.models import Project, User, UserRole
+
+
+@pytest.fixture
+def db():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(engine)
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+@pytest.fixture
+def project(db):
+    user = User(email="dev@example.com", password_hash="x", role=UserRole.DEVELOPER)
+    db.add(user)
+    db.flush()
+    project = Project(developer_id=user.id, project_type="solar", name="Test", code="TEST-1")
+    db.add(project)
+    db.commit()
+    return project
@@ -0,0 +1,87 @@
+import logging
+import os
+import shutil
+from datetime import datetime, timedelta
+
+import numpy as np
+import pytest
+
+pytest.importorskip("pyarrow")
+
+from backend.core import database
+from backend.core.container import container
+from backend.modules.generation.models import GenerationArchive, GenerationTimeseries
+from backend.modules.generation.services import archive
+
+
+class DirectoryStorage:
+    def __init__(self, root):
+        self.root = root
+
+    async def upload_file(self, file_path, local_path, content_type):
+        target = os.path.join(self.root, os.path.basename(file_path))
+        shutil.copyfile(local_path, target)
+        return target
+
+    async def delete(self, storage_uri):
+        os.remove(storage_uri)
+        return True
+
+
+@pytest.fixture
+def timeseries(db, project):
+    start = datetime(2023, 12, 31)
+    for hour in range(48):
+        db.add(GenerationTimeseries(project_id=project.id, ts_utc=start + timedelta(hours=hour), energy_mwh=hour))
+    db.commit()
+
+
+@pytest.fixture
+def storage(tmp_path, monkeypatch):
+    storage = DirectoryStorage(str(tmp_path))
+    monkeypatch.setattr(type(container), "file_storage", property(lambda self: storage), raising=False)
+    return storage
+
+
+def test_rebuild_and_scan(db, project, timeseries, storage):
+    records = archive.TimeseriesArchive(db, storage).rebuild(project.id)
+
+    assert [(a.year, a.row_count) for a in records] == [(2023, 24), (2024, 24)]
+    timestamps, energy = archive.TimeseriesArchive(db, storage).scan(
+        project.id, datetime(2023, 12, 31, 22), datetime(2024, 1, 1, 1)
+    )
+    assert timestamps.astype("datetime64[h]").astype(str).tolist() == [
+        "2023-12-31T22", "2023-12-31T23", "2024-01-01T00", "2024-01-01T01",
+    ]
+    assert energy.tolist() == [22.0, 23.0, 24.0, 25.0]
+
+    archive.mark_archives_stale(db, project.id)
+    db.commit()
+    assert archive.TimeseriesArchive(db, storage).scan(project.id) is None
+
+
+def test_failed_rebuild_is_logged_and_recorded(db, project, timeseries, storage, monkeypatch, caplog):
+    project_id = project.id
+    monkeypatch.setattr(database, "SessionLocal", lambda: db)
+    archive.TimeseriesArchive(db, storage).rebuild(project_id)
+    archive.mark_archives_stale(db, project_id)
+    db.commit()
+
+    def failing_export(self, project_id, year, record):
+        raise OSError("bucket unavailable")
+
+    with monkeypatch.context() as m:
+        m.setattr(archive.TimeseriesArchive, "_export_year", failing_export)
+        with caplog.at_level(logging.ERROR, logger=archive.__name__):
+            archive.rebuild_project_archive(project_id)
+
+    assert "Archive rebuild failed for project" in caplog.text
+    records = db.query(GenerationArchive).all()
+    assert len(records) == 2
+    assert all(a.is_stale and a.last_error == "bucket unavailable" and a.failed_at for a in records)
+
+    archive.rebuild_project_archive(project_id)
+
+    records = db.query(GenerationArchive).all()
+    assert all(not a.is_stale and a.last_error is None and a.failed_at is None for a in records)
+    assert np.asarray(archive.TimeseriesArchive(db, storage).scan(project_id)[1]).sum() == sum(range(48))
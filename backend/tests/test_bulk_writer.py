@@ -0,0 +1,68 @@
+import struct
+
+import numpy as np
+
+from backend.modules.generation.models import GenerationTimeseries
+from backend.modules.generation.services.bulk_writer import PG_EPOCH_OFFSET, TimeseriesWriter, encode_copy_binary
+from backend.modules.generation.services.conversion import FLAG_MISSING, FLAG_OK, FLAG_OUTLIER, ConvertedSeries
+
+HOUR = 3600.0
+
+
+def _series(hours, energy, flags=None):
+    energy = np.asarray(energy, dtype=np.float64)
+    return ConvertedSeries(
+        ts_epoch=np.asarray(hours, dtype=np.float64) * HOUR,
+        energy_mwh=energy,
+        power_mw=energy.copy(),
+        original_value=energy * 1000,
+        quality_flag=np.asarray(flags if flags is not None else [FLAG_OK] * len(energy), dtype=np.int8),
+    )
+
+
+def _stored(db, project):
+    rows = db.query(GenerationTimeseries).filter(
+        GenerationTimeseries.project_id == project.id
+    ).order_by(GenerationTimeseries.ts_utc).all()
+    return [(row.ts_utc.hour, float(row.energy_mwh), row.file_id, row.quality_flag) for row in rows]
+
+
+def test_sqlite_rewrite_replaces_rows(db, project):
+    writer = TimeseriesWriter(db, project.id, 1, "kWh")
+    writer.write(_series([0, 1, 2], [1.0, 2.0, 3.0]))
+    db.commit()
+
+    rewriter = TimeseriesWriter(db, project.id, 2, "kWh")
+    rewriter.write(_series([2, 3], [5.0, 6.0], [FLAG_OUTLIER, FLAG_OK]))
+    db.commit()
+
+    assert _stored(db, project) == [
+        (0, 1.0, 1, "OK"),
+        (1, 2.0, 1, "OK"),
+        (2, 5.0, 2, "OUTLIER"),
+        (3, 6.0, 2, "OK"),
+    ]
+    assert writer.stats()["method"] == "insert"
+    assert writer.stats()["rows"] == 3
+
+
+def test_empty_series_writes_nothing(db, project):
+    writer = TimeseriesWriter(db, project.id, 1, "kWh")
+    assert writer.write(_series([], [])) == 0
+    assert writer.stats()["rows_per_minute"] is None
+
+
+def test_copy_rows_are_fixed_width():
+    series = _series([0, 1], [1.5, 0.0], [FLAG_OK, FLAG_MISSING])
+    payload = encode_copy_binary(series)
+
+    header, trailer = 19, 2
+    row_size = (len(payload) - header - trailer) // 2
+    assert len(payload) == header + 2 * row_size + trailer
+    fields, ts_len, ts, energy_len, energy = struct.unpack_from(">hiqid", payload, header)
+    assert (fields, ts_len, energy_len, energy) == (5, 8, 8, 1.5)
+    assert ts == (0 - PG_EPOCH_OFFSET) * 1_000_000
+
+    # Missing intervals carry no power reading
+    power = struct.unpack_from(">d", payload, header + row_size + 2 + 12 + 12 + 4)[0]
+    assert np.isnan(power)
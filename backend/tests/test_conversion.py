@@ -0,0 +1,121 @@
+import numpy as np
+import pytest
+
+from backend.modules.generation.services.conversion import (
+    FLAG_INTERPOLATED,
+    FLAG_MISSING,
+    FLAG_OK,
+    GenerationConverter,
+    convert_series,
+)
+
+HOUR = 3600.0
+
+
+def _hours(*hours):
+    return np.array(hours, dtype=np.float64) * HOUR
+
+
+def _push_all(converter, chunks):
+    parts = [converter.push(ts, values) for ts, values in chunks]
+    parts.append(converter.finish())
+    return parts
+
+
+def test_energy_units_are_scaled():
+    series = convert_series(_hours(0, 1, 2), np.array([1000.0, 2000.0, 3000.0]), "kWh", "ENERGY_PER_INTERVAL", 3600)
+    assert series.ts_epoch.tolist() == _hours(0, 1, 2).tolist()
+    assert series.energy_mwh.tolist() == [1.0, 2.0, 3.0]
+    assert series.power_mw is None
+
+
+def test_power_is_integrated_per_bucket():
+    ts = np.arange(5) * 900.0
+    series = convert_series(ts, np.full(5, 4.0), "MW", "POWER", 3600)
+    assert series.ts_epoch.tolist() == _hours(0, 1).tolist()
+    assert series.energy_mwh[0] == pytest.approx(4.0)
+    assert series.power_mw[0] == pytest.approx(4.0)
+
+
+def test_gap_is_interpolated():
+    series = convert_series(_hours(0, 1, 3), np.array([1.0, 2.0, 4.0]), "MWh", "ENERGY_PER_INTERVAL", 3600)
+    assert series.ts_epoch.tolist() == _hours(0, 1, 2, 3).tolist()
+    assert series.energy_mwh.tolist() == [1.0, 2.0, 3.0, 4.0]
+    assert series.quality_flag.tolist() == [FLAG_OK, FLAG_OK, FLAG_INTERPOLATED, FLAG_OK]
+
+
+def test_gap_filled_with_zero():
+    series = convert_series(_hours(0, 2), np.array([1.0, 2.0]), "MWh", "ENERGY_PER_INTERVAL", 3600, "zero")
+    assert series.energy_mwh.tolist() == [1.0, 0.0, 2.0]
+    assert series.quality_flag.tolist() == [FLAG_OK, FLAG_MISSING, FLAG_OK]
+
+
+def test_chunk_boundaries_do_not_change_result():
+    ts = np.arange(48) * 900.0
+    values = np.arange(48, dtype=np.float64)
+    values[10:14] = np.nan
+    whole = convert_series(ts, values, "kW", "POWER", 3600)
+
+    converter = GenerationConverter("kW", "POWER", 3600)
+    parts = _push_all(converter, [(ts[:7], values[:7]), (ts[7:30], values[7:30]), (ts[30:], values[30:])])
+    chunked_ts = np.concatenate([p.ts_epoch for p in parts])
+    chunked_energy = np.concatenate([p.energy_mwh for p in parts])
+    assert chunked_ts.tolist() == whole.ts_epoch.tolist()
+    assert chunked_energy == pytest.approx(whole.energy_mwh)
+
+
+@pytest.mark.parametrize("treatment", ["interpolate", "zero", "drop"])
+def test_late_row_does_not_reemit_written_buckets(treatment):
+    converter = GenerationConverter("MWh", "ENERGY_PER_INTERVAL", 3600, treatment)
+    first = np.arange(10, dtype=np.float64)
+    parts = _push_all(converter, [
+        (_hours(*range(10)), first + 1),
+        (_hours(2, 10, 11), np.array([99.0, 11.0, 12.0])),
+    ])
+
+    ts = np.concatenate([p.ts_epoch for p in parts])
+    energy = np.concatenate([p.energy_mwh for p in parts])
+    flags = np.concatenate([p.quality_flag for p in parts])
+    assert ts.tolist() == _hours(*range(12)).tolist()
+    assert energy.tolist() == [float(v) for v in range(1, 13)]
+    assert (flags == FLAG_OK).all()
+    assert converter.late_rows == 1
+
+
+def test_chunk_of_only_late_rows_is_dropped():
+    converter = GenerationConverter("MWh", "ENERGY_PER_INTERVAL", 3600)
+    converter.push(_hours(0, 1, 2), np.array([1.0, 2.0, 3.0]))
+    assert len(converter.push(_hours(0), np.array([5.0]))) == 0
+    tail = converter.finish()
+    assert tail.ts_epoch.tolist() == _hours(2).tolist()
+    assert tail.energy_mwh.tolist() == [3.0]
+    assert converter.late_rows == 1
+
+
+def test_invalid_arguments():
+    with pytest.raises(ValueError):
+        GenerationConverter("MWh", "ENERGY_PER_INTERVAL", 0)
+    with pytest.raises(ValueError):
+        GenerationConverter("MWh", "ENERGY_PER_INTERVAL", 3600, "guess")
+
+
+def test_last_power_sample_covers_source_interval():
+    # 1-minute samples resampled to 15 minutes: the final sample is one minute of energy
+    ts = np.arange(30) * 60.0
+    series = convert_series(ts, np.full(30, 60.0), "MW", "POWER", 900)
+    assert series.ts_epoch.tolist() == [0.0, 900.0]
+    assert series.energy_mwh.tolist() == pytest.approx([15.0, 15.0])
+
+
+def test_sample_before_gap_is_capped_at_source_interval():
+    ts = np.concatenate([np.arange(5) * 60.0, 900.0 + np.arange(15) * 60.0])
+    series = convert_series(ts, np.full(20, 60.0), "MW", "POWER", 900)
+    assert series.energy_mwh.tolist() == pytest.approx([5.0, 15.0])
+
+
+def test_source_interval_carries_across_chunks():
+    # The lone sample flushed by finish() has no neighbour to measure spacing from
+    converter = GenerationConverter("MW", "POWER", 900)
+    parts = _push_all(converter, [(np.arange(16) * 60.0, np.full(16, 60.0))])
+    energy = np.concatenate([p.energy_mwh for p in parts])
+    assert energy.tolist() == pytest.approx([15.0, 1.0])
@@ -0,0 +1,63 @@
+from datetime import datetime
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.modules.admin.dependencies import get_current_admin
+from backend.modules.generation.services import credit_calculator
+from backend.modules.generation.services.estimate_cache import TTLCache, quick_estimate_cache
+
+
+@pytest.fixture(autouse=True)
+def empty_cache():
+    quick_estimate_cache.clear()
+    yield
+    quick_estimate_cache.clear()
+
+
+class Clock(datetime):
+    now_value = datetime(2024, 1, 1, 12)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now_value
+
+
+def test_ttl_cache_counts_and_evicts():
+    cache = TTLCache(maxsize=2, ttl=60)
+    assert cache.get_or_compute("a", lambda: 1) == 1
+    assert cache.get_or_compute("a", lambda: 2) == 1
+    cache.get_or_compute("b", lambda: 3)
+    cache.get_or_compute("c", lambda: 4)
+
+    assert cache.get_or_compute("a", lambda: 5) == 5
+    assert cache.stats()["hits"] == 1
+    assert cache.stats()["size"] == 2
+
+
+def test_cached_quick_estimate_is_stamped_when_served(monkeypatch):
+    monkeypatch.setattr(credit_calculator, "datetime", Clock)
+    calculator = credit_calculator.CreditCalculator("CDM_AMS_ID")
+
+    first = calculator.calculate_simple(1000.0, "IN", "solar", ef_override=0.7)
+    Clock.now_value = datetime(2024, 1, 1, 12, 5)
+    second = calculator.calculate_simple(1000.0000001, "IN", "solar", ef_override=0.7)
+
+    assert quick_estimate_cache.stats()["hits"] == 1
+    assert second["total_er_tco2e"] == first["total_er_tco2e"]
+    assert first["calculation_date"] == "2024-01-01T12:00:00"
+    assert second["calculation_date"] == "2024-01-01T12:05:00"
+
+
+def test_cache_stats_require_admin():
+    client = TestClient(app)
+    assert client.get("/api/generation/quick-estimate/cache").status_code == 401
+
+    app.dependency_overrides[get_current_admin] = lambda: object()
+    try:
+        response = client.get("/api/generation/quick-estimate/cache")
+    finally:
+        app.dependency_overrides.pop(get_current_admin)
+    assert response.status_code == 200
+    assert response.json()["hits"] == 0
@@ -0,0 +1,121 @@
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.modules.generation import grid_ef_database
+from backend.modules.generation.grid_ef_database import GridEFData, GridEFStore
+
+# The package re-exports its APIRouter as "router"
+router = sys.modules["backend.modules.generation.router"]
+
+EXPIRY = datetime(2030, 6, 30)
+
+
+class Clock(datetime):
+    now_value = EXPIRY - timedelta(hours=1)
+
+    @classmethod
+    def utcnow(cls):
+        return cls.now_value
+
+
+def _factor(country_code="ZZ", **fields):
+    fields.setdefault("combined_margin", 0.5)
+    return GridEFData(country_code=country_code, country_name="Testland", **fields)
+
+
+@pytest.fixture
+def store(monkeypatch):
+    rows = []
+    store = GridEFStore(refresh_seconds=0)
+    monkeypatch.setattr(store, "_load_rows", lambda: (list(rows), len(rows)))
+    monkeypatch.setattr(grid_ef_database, "datetime", Clock)
+    Clock.now_value = EXPIRY - timedelta(hours=1)
+    monkeypatch.setattr(grid_ef_database, "grid_ef_store", store)
+    monkeypatch.setattr(router, "grid_ef_store", store)
+    router._grid_ef_list_payload.cache_clear()
+    router._countries_payload.cache_clear()
+    store.rows = rows
+    yield store
+    router._grid_ef_list_payload.cache_clear()
+    router._countries_payload.cache_clear()
+
+
+def _listed(response):
+    return [ef["country_code"] for ef in response.json()["emission_factors"]]
+
+
+def test_listing_turns_over_when_a_factor_expires(store):
+    store.rows.append((_factor(valid_until=EXPIRY), datetime(2030, 1, 1)))
+    client = TestClient(app)
+
+    Clock.now_value = EXPIRY - timedelta(hours=1)
+    before = client.get("/api/generation/grid-ef")
+    Clock.now_value = EXPIRY
+    assert "ZZ" in _listed(client.get("/api/generation/grid-ef"))
+    Clock.now_value = EXPIRY + timedelta(seconds=1)
+    after = client.get("/api/generation/grid-ef", headers={"If-None-Match": before.headers["ETag"]})
+
+    assert "ZZ" in _listed(before)
+    assert after.status_code == 200
+    assert "ZZ" not in _listed(after)
+    assert after.headers["ETag"] != before.headers["ETag"]
+
+
+def test_table_rows_rank_by_year_then_over_preloaded(store):
+    store.rows.extend([
+        (_factor("IN", combined_margin=0.7, data_year=2024), datetime(2030, 1, 1)),
+        (_factor("IN", combined_margin=0.6, data_year=2023, operating_margin=0.65), datetime(2030, 2, 1)),
+        (_factor("ZZ", combined_margin=0.4, data_year=2022), datetime(2030, 1, 1)),
+        (_factor("ZZ", combined_margin=0.3, data_year=2022), datetime(2030, 3, 1)),
+    ])
+    store.reload()
+
+    assert store.lookup("IN").combined_margin == 0.7
+    assert store.factor("IN", year=2023, margin="operating_margin") == 0.65
+    # The most recently updated row of a year wins
+    assert store.lookup("ZZ").combined_margin == 0.3
+    # Regions without factors of their own fall back to the national grid
+    assert store.lookup("zz", "north").combined_margin == 0.3
+    with pytest.raises(ValueError):
+        store.factor("ZZ", margin="median")
+
+
+def test_reindexes_only_when_the_table_changes(store, monkeypatch):
+    clock = [0.0]
+    monkeypatch.setattr(grid_ef_database.time, "monotonic", lambda: clock[0])
+    monkeypatch.setattr(store, "_table_stamp", lambda: len(store.rows))
+    store.refresh_seconds = 60
+
+    assert store.lookup("ZZ") is None
+    version = store.current_version()
+    store.rows.append((_factor(), datetime(2030, 1, 1)))
+
+    clock[0] = 30.0
+    assert store.lookup("ZZ") is None
+    assert store.current_version() == version
+
+    clock[0] = 61.0
+    assert store.lookup("ZZ").combined_margin == 0.5
+    assert store.current_version() == version + 1
+
+    clock[0] = 200.0
+    assert store.current_version() == version + 1
+
+
+def test_version_changes_when_a_window_opens(store):
+    store.rows.append((_factor(valid_from=EXPIRY), datetime(2030, 1, 1)))
+    Clock.now_value = EXPIRY - timedelta(seconds=1)
+    store.reload()
+    version = store.current_version()
+
+    assert store.lookup("ZZ") is None
+    assert store.next_transition() == EXPIRY
+
+    Clock.now_value = EXPIRY
+    assert store.current_version() == version + 1
+    assert store.lookup("ZZ").combined_margin == 0.5
+    assert store.next_transition() is None
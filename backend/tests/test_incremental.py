@@ -0,0 +1,69 @@
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.modules.generation.models import EstimationMonthAggregate, GenerationTimeseries
+from backend.modules.generation.services import incremental
+from backend.modules.generation.services.estimation import estimate_project_credits
+
+
+@pytest.fixture
+def timeseries(db, project):
+    start = datetime(2024, 1, 1)
+    for day in range(60):
+        db.add(GenerationTimeseries(project_id=project.id, ts_utc=start + timedelta(days=day), energy_mwh=2))
+    db.commit()
+
+
+@pytest.fixture
+def reads(monkeypatch):
+    calls = []
+    aggregate = incremental.monthly_generation
+
+    def counting(db, project_id, start=None, end=None):
+        calls.append((start, end))
+        return aggregate(db, project_id, start, end)
+
+    monkeypatch.setattr(incremental, "monthly_generation", counting)
+    return calls
+
+
+def _estimate(db, project, methodology_id="CDM_AMS_ID", ef_value=0.5):
+    return estimate_project_credits(
+        db,
+        project_id=project.id,
+        project_type="solar",
+        methodology_id=methodology_id,
+        country_code="IN",
+        ef_value=ef_value,
+    )
+
+
+def test_changed_ef_reuses_cached_months(db, project, timeseries, reads):
+    first = _estimate(db, project, ef_value=0.5)
+    computed_at = {a.month: a.computed_at for a in db.query(EstimationMonthAggregate)}
+    reads.clear()
+
+    second = _estimate(db, project, ef_value=0.8)
+    third = _estimate(db, project, methodology_id="CDM_ACM0002", ef_value=0.8)
+
+    # Whole months come from the cache for any EF or methodology
+    assert reads == []
+    assert {a.month: a.computed_at for a in db.query(EstimationMonthAggregate)} == computed_at
+    assert sorted(computed_at) == ["2024-01", "2024-02"]
+    assert float(first.total_generation_mwh) == float(second.total_generation_mwh) == 120
+    assert float(second.total_er_tco2e) == pytest.approx(float(first.total_er_tco2e) * 0.8 / 0.5)
+    assert float(third.total_generation_mwh) == 120
+
+
+def test_changed_month_is_recomputed(db, project, timeseries, reads):
+    _estimate(db, project)
+    incremental.touch_months(db, project.id, datetime(2024, 2, 10), datetime(2024, 2, 10))
+    db.add(GenerationTimeseries(project_id=project.id, ts_utc=datetime(2024, 2, 29, 12), energy_mwh=5))
+    db.commit()
+    reads.clear()
+
+    estimation = _estimate(db, project)
+
+    assert reads == [(datetime(2024, 2, 1), datetime(2024, 3, 1) - timedelta(microseconds=1))]
+    assert float(estimation.total_generation_mwh) == 125
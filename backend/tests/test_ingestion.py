@@ -0,0 +1,131 @@
+import csv
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.modules.generation.models import (
+    DatasetMapping,
+    GenerationMonth,
+    GenerationTimeseries,
+    UploadedFile,
+)
+from backend.modules.generation.services import quality
+from backend.modules.generation.services.ingestion import GenerationIngestionService
+
+
+def _mapped_file(db, project, path, rows):
+    with open(path, "w", newline="") as f:
+        writer = csv.writer(f)
+        writer.writerow(["timestamp", "energy_kwh"])
+        writer.writerows(rows)
+
+    uploaded_file = UploadedFile(
+        project_id=project.id,
+        original_filename="generation.csv",
+        mime_type="text/csv",
+        storage_uri=str(path),
+        file_size_bytes=path.stat().st_size,
+        uploaded_by=project.developer_id,
+        status="mapped",
+    )
+    db.add(uploaded_file)
+    db.flush()
+    mapping = DatasetMapping(
+        file_id=uploaded_file.id,
+        timestamp_column="timestamp",
+        value_column="energy_kwh",
+        unit="kWh",
+        value_semantics="ENERGY_PER_INTERVAL",
+        frequency_seconds=3600,
+        timezone="UTC",
+    )
+    db.add(mapping)
+    db.commit()
+    return uploaded_file, mapping
+
+
+def _hourly(start, hours, fmt="%Y-%m-%d %H:%M"):
+    return [[(start + timedelta(hours=h)).strftime(fmt), 1000] for h in hours]
+
+
+def test_process_file(db, project, tmp_path):
+    uploaded_file, mapping = _mapped_file(db, project, tmp_path / "generation.csv", _hourly(datetime(2024, 1, 1), range(48)))
+
+    stats = GenerationIngestionService(db, batch_size=10).process_file(uploaded_file, mapping)
+
+    assert stats["rows_written"] == 48
+    assert uploaded_file.status == "processed"
+    assert db.query(GenerationTimeseries).count() == 48
+    assert [m.month for m in db.query(GenerationMonth)] == ["2024-01"]
+
+
+def test_us_dates_are_not_swapped(db, project, tmp_path):
+    rows = _hourly(datetime(2024, 3, 1), range(24 * 20), fmt="%m/%d/%Y %H:%M")
+    uploaded_file, mapping = _mapped_file(db, project, tmp_path / "generation.csv", rows)
+
+    stats = GenerationIngestionService(db, batch_size=100).process_file(uploaded_file, mapping)
+
+    assert stats["rows_skipped"] == 0
+    assert mapping.timestamp_format == "%m/%d/%Y %H:%M"
+    stored = [ts for (ts,) in db.query(GenerationTimeseries.ts_utc).order_by(GenerationTimeseries.ts_utc)]
+    assert stored[0] == datetime(2024, 3, 1)
+    assert stored[-1] == datetime(2024, 3, 20, 23)
+
+
+def test_late_rows_do_not_overwrite_stored_values(db, project, tmp_path):
+    rows = _hourly(datetime(2024, 1, 1), range(10))
+    rows += [[datetime(2024, 1, 1, 2).strftime("%Y-%m-%d %H:%M"), 5000]]
+    rows += _hourly(datetime(2024, 1, 1), range(10, 12))
+    uploaded_file, mapping = _mapped_file(db, project, tmp_path / "generation.csv", rows)
+
+    stats = GenerationIngestionService(db, batch_size=10).process_file(uploaded_file, mapping)
+
+    assert stats["rows_late"] == 1
+    energy = [float(e) for (e,) in db.query(GenerationTimeseries.energy_mwh).order_by(GenerationTimeseries.ts_utc)]
+    assert energy == [1.0] * 12
+
+
+def test_failed_run_stamps_months_it_wrote(db, project, tmp_path, monkeypatch):
+    rows = _hourly(datetime(2024, 1, 31), range(72))
+    uploaded_file, mapping = _mapped_file(db, project, tmp_path / "generation.csv", rows)
+
+    check = quality.QualityChecker.check
+    calls = []
+
+    def failing_check(self, series):
+        calls.append(len(series))
+        if len(calls) == 3:
+            raise RuntimeError("disk full")
+        return check(self, series)
+
+    monkeypatch.setattr(quality.QualityChecker, "check", failing_check)
+    with pytest.raises(RuntimeError):
+        GenerationIngestionService(db, batch_size=20).process_file(uploaded_file, mapping)
+
+    assert uploaded_file.status == "error"
+    assert db.query(GenerationTimeseries).count() > 0
+    assert sorted(m.month for m in db.query(GenerationMonth)) == ["2024-01", "2024-02"]
+
+
+def test_progress_counts_file_rows(db, project, tmp_path, monkeypatch):
+    rows = [[(datetime(2024, 1, 1) + timedelta(minutes=15 * i)).strftime("%Y-%m-%d %H:%M"), 250] for i in range(96)]
+    uploaded_file, mapping = _mapped_file(db, project, tmp_path / "generation.csv", rows)
+    uploaded_file.row_count = len(rows)
+    db.commit()
+
+    report = GenerationIngestionService._report_progress
+    progress = []
+
+    def recording(self, uploaded_file, stats, started):
+        report(self, uploaded_file, stats, started)
+        progress.append((uploaded_file.rows_processed, uploaded_file.processing_stats["rows_written"]))
+
+    monkeypatch.setattr(GenerationIngestionService, "_report_progress", recording)
+    stats = GenerationIngestionService(db, batch_size=40).process_file(uploaded_file, mapping)
+
+    # 15-minute rows resampled to hourly intervals: progress follows rows read
+    assert stats["rows_read"] == 96
+    assert stats["rows_written"] == 24
+    assert uploaded_file.rows_processed == 96
+    assert [read for read, _ in progress] == [40, 80, 96, 96]
+    assert all(written * 4 <= read for read, written in progress)
@@ -0,0 +1,58 @@
+import pytest
+
+from backend.modules.generation.methodologies.registry import MethodologyRegistry
+from backend.modules.generation.services.matcher import eligible_methodology_ids
+
+
+def _admitted(capacity_mw):
+    """Capacity check of every methodology, one by one."""
+    admitted = set()
+    for m_id in MethodologyRegistry.get_ids():
+        methodology = MethodologyRegistry.get(m_id)
+        if methodology.min_capacity_mw is not None and capacity_mw < methodology.min_capacity_mw:
+            continue
+        if methodology.max_capacity_mw is not None and capacity_mw > methodology.max_capacity_mw:
+            continue
+        admitted.add(m_id)
+    return admitted
+
+
+def _probes():
+    MethodologyRegistry.get_ids()
+    breakpoints = MethodologyRegistry._capacity_breakpoints
+    assert breakpoints, "expected methodologies with capacity limits"
+    probes = {0.0, breakpoints[-1] * 10}
+    for b in breakpoints:
+        probes.update((b - 1e-9, b, b + 1e-9))
+    return sorted(probes)
+
+
+@pytest.mark.parametrize("capacity_mw", _probes())
+def test_capacity_index_matches_the_limits(capacity_mw):
+    assert MethodologyRegistry.ids_for_capacity(capacity_mw) == _admitted(capacity_mw)
+
+
+def test_limits_are_inclusive():
+    limits = {
+        m_id: MethodologyRegistry.get(m_id).max_capacity_mw for m_id in MethodologyRegistry.get_ids()
+        if MethodologyRegistry.get(m_id).max_capacity_mw is not None
+    }
+    assert limits
+    for m_id, limit in limits.items():
+        assert m_id in MethodologyRegistry.ids_for_capacity(limit)
+        assert m_id not in MethodologyRegistry.ids_for_capacity(limit + 1e-9)
+
+
+@pytest.mark.parametrize("project_type", ["solar", "wind", "biogas", "SOLAR"])
+@pytest.mark.parametrize("capacity_mw", [1.0, 15.0, 200.0])
+def test_eligible_ids_combine_type_capacity_and_registry(project_type, capacity_mw):
+    expected = [
+        m_id for m_id in MethodologyRegistry.get_ids()
+        if project_type.lower() in [t.lower() for t in MethodologyRegistry.get(m_id).applicable_project_types]
+        and m_id in _admitted(capacity_mw)
+    ]
+
+    assert list(eligible_methodology_ids(project_type, capacity_mw)) == expected
+    assert list(eligible_methodology_ids(project_type, capacity_mw, "cdm")) == [
+        m_id for m_id in expected if MethodologyRegistry.get(m_id).registry.upper() == "CDM"
+    ]
@@ -0,0 +1,41 @@
+from fastapi.testclient import TestClient
+
+from backend.main import app
+from backend.modules.generation.methodologies.registry import MethodologyRegistry
+
+URL = "/api/generation/methodologies"
+
+
+def test_listing_carries_an_etag():
+    response = TestClient(app).get(URL)
+
+    assert response.status_code == 200
+    assert response.headers["ETag"].startswith('"')
+    assert "max-age=3600" in response.headers["Cache-Control"]
+    listed = [m["id"] for m in response.json()["methodologies"]]
+    assert listed == [m["id"] for m in MethodologyRegistry.list_all()]
+
+
+def test_matching_etag_gets_not_modified():
+    client = TestClient(app)
+    etag = client.get(URL).headers["ETag"]
+
+    response = client.get(URL, headers={"If-None-Match": f'"stale", {etag}'})
+
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["ETag"] == etag
+    assert client.get(URL, headers={"If-None-Match": '"stale"'}).status_code == 200
+
+
+def test_filtered_listings_have_their_own_etag():
+    client = TestClient(app)
+    everything = client.get(URL)
+    solar = client.get(URL, params={"project_type": "solar"})
+    upper = client.get(URL, params={"project_type": "SOLAR"})
+
+    assert solar.headers["ETag"] != everything.headers["ETag"]
+    assert upper.headers["ETag"] == solar.headers["ETag"]
+    assert client.get(
+        URL, params={"project_type": "solar"}, headers={"If-None-Match": everything.headers["ETag"]}
+    ).status_code == 200
@@ -0,0 +1,84 @@
+import asyncio
+import json
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.modules.generation.services import portfolio
+from backend.modules.generation.services.credit_calculator import CreditCalculator
+
+MONTHLY = {"2023-11": 300.0, "2023-12": 200.0, "2024-01": 500.0}
+METHODOLOGIES = ["CDM_AMS_ID", "CDM_ACM0002"]
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        monkeypatch.setattr(portfolio, "get_process_pool", lambda: pool)
+        yield pool
+
+
+def _run(projects, monthly_by_project, country_code="IN", **kwargs):
+    async def collect():
+        return [line async for line in portfolio.stream_portfolio(projects, monthly_by_project, country_code, **kwargs)]
+    lines = asyncio.run(collect())
+    assert all(line.endswith("\n") and line.count("\n") == 1 for line in lines)
+    return [json.loads(line) for line in lines]
+
+
+def test_one_line_per_project_and_methodology():
+    # Runs on the spawned process pool, as the endpoint does
+    results = _run(
+        [(1, "solar"), (2, "solar")],
+        {1: MONTHLY, 2: {month: mwh * 2 for month, mwh in MONTHLY.items()}},
+        methodology_ids=METHODOLOGIES,
+        ef_override=0.8,
+    )
+
+    assert sorted((r["project_id"], r["methodology_id"], r["status"]) for r in results) == [
+        (1, "CDM_ACM0002", "ok"), (1, "CDM_AMS_ID", "ok"),
+        (2, "CDM_ACM0002", "ok"), (2, "CDM_AMS_ID", "ok"),
+    ]
+    expected = CreditCalculator("CDM_AMS_ID").calculate_from_monthly(
+        monthly_generation=MONTHLY, country_code="IN", project_type="solar", ef_override=0.8,
+    )
+    first = next(r for r in results if r["project_id"] == 1 and r["methodology_id"] == "CDM_AMS_ID")
+    assert first["total_er_tco2e"] == expected["total_er_tco2e"]
+    assert [a["vintage"] for a in first["annual_breakdown"]] == [2023, 2024]
+
+
+def test_projects_without_data_or_methodology_get_error_lines(thread_pool):
+    results = _run(
+        [(1, "solar"), (2, "solar"), (3, "spaceship")],
+        {1: MONTHLY, 3: MONTHLY},
+        methodology_ids=["CDM_AMS_ID"],
+        ef_override=0.8,
+    )
+
+    by_project = {r["project_id"]: r for r in results}
+    assert len(results) == 3
+    assert by_project[1]["status"] == "ok"
+    assert by_project[2] == {
+        "project_id": 2, "methodology_id": None, "status": "error", "error": "No generation data found",
+    }
+    assert "No applicable methodology" in by_project[3]["error"]
+
+
+def test_missing_grid_ef_is_reported_per_methodology(thread_pool):
+    results = _run([(1, "solar")], {1: MONTHLY}, country_code="XX", methodology_ids=METHODOLOGIES)
+
+    assert sorted(r["methodology_id"] for r in results) == sorted(METHODOLOGIES)
+    assert {r["status"] for r in results} == {"error"}
+
+
+def test_crashed_worker_becomes_an_error_line(thread_pool, monkeypatch):
+    def crash(*args):
+        raise RuntimeError("worker died")
+
+    monkeypatch.setattr(portfolio, "estimate_project", crash)
+    results = _run([(1, "solar")], {1: MONTHLY}, methodology_ids=["CDM_AMS_ID"], ef_override=0.8)
+
+    assert results == [{
+        "project_id": 1, "methodology_id": None, "status": "error",
+        "error": "Estimation worker failed: worker died",
+    }]
@@ -0,0 +1,41 @@
+import pytest
+
+from backend.modules.generation.models import UploadedFile
+from backend.modules.generation.services import profile_cache
+
+
+@pytest.fixture
+def uploaded_file(tmp_path, monkeypatch):
+    monkeypatch.setattr(profile_cache, "PROFILE_CACHE_DIR", str(tmp_path / "profiles"))
+    path = tmp_path / "generation.csv"
+    path.write_text("timestamp,energy_kwh\n2024-01-01 00:00,1000\n2024-01-01 01:00,1200\n")
+    return UploadedFile(
+        original_filename="generation.csv",
+        storage_uri="gs://bucket/generation.csv",
+        checksum="abc123",
+    ), str(path)
+
+
+def test_cache_miss_fetches_and_stores(uploaded_file, monkeypatch):
+    record, path = uploaded_file
+    fetched = []
+    monkeypatch.setattr(profile_cache, "local_file_path", lambda uri: fetched.append(uri) or path)
+
+    profile = profile_cache.get_file_profile(record)
+
+    assert fetched == ["gs://bucket/generation.csv"]
+    assert profile.column_names == ["timestamp", "energy_kwh"]
+    assert profile.total_rows == 2
+    assert profile_cache.load_profile("abc123") == profile
+
+
+def test_cache_hit_does_not_fetch(uploaded_file, monkeypatch):
+    record, path = uploaded_file
+    profile_cache.save_profile("abc123", profile_cache.build_profile(path, "generation.csv"))
+
+    def fail(uri):
+        raise AssertionError("cached profile must not download the file")
+
+    monkeypatch.setattr(profile_cache, "local_file_path", fail)
+
+    assert profile_cache.get_file_profile(record).total_rows == 2
@@ -0,0 +1,108 @@
+from datetime import datetime, timezone
+
+import numpy as np
+import pytest
+
+from backend.modules.generation.services.conversion import FLAG_OK, FLAG_OUTLIER, ConvertedSeries
+from backend.modules.generation.services.quality import QualityChecker
+
+HOUR = 3600.0
+
+# Europe/Berlin falls back from CEST to CET at 01:00 UTC on 2023-10-29
+FALL_BACK = datetime(2023, 10, 29, 1, tzinfo=timezone.utc).timestamp()
+
+
+def _series(ts, energy):
+    energy = np.asarray(energy, dtype=np.float64)
+    return ConvertedSeries(
+        ts_epoch=np.asarray(ts, dtype=np.float64),
+        energy_mwh=energy,
+        power_mw=None,
+        original_value=energy.copy(),
+        quality_flag=np.full(len(energy), FLAG_OK, dtype=np.int8),
+    )
+
+
+def _diurnal(days, seed=0):
+    """Hourly readings following a daily profile with a little noise."""
+    rng = np.random.default_rng(seed)
+    ts = np.arange(days * 24) * HOUR
+    profile = np.maximum(np.sin((np.arange(24) - 6) / 12 * np.pi), 0) * 4
+    return ts, np.tile(profile, days) + rng.uniform(0, 0.2, days * 24)
+
+
+def test_repeated_dst_hour_moves_to_standard_time():
+    # Local 01:00, 02:00 (CEST), 02:00 (CET), 03:00, both 02:00s parsed as CEST
+    raw = FALL_BACK + np.array([-2, -1, -1, 1]) * HOUR
+
+    checker = QualityChecker(3600, tz_name="Europe/Berlin")
+    resolved = checker.prepare(raw)
+
+    assert (resolved - FALL_BACK).tolist() == (np.array([-2, -1, 0, 1]) * HOUR).tolist()
+    assert checker.counts["dst_duplicates_resolved"] == 1
+    assert checker.counts["duplicate_timestamps"] == 0
+
+
+def test_repeated_dst_hour_is_found_across_chunks():
+    raw = FALL_BACK + np.array([-2, -1, -1, 1]) * HOUR
+
+    checker = QualityChecker(3600, tz_name="Europe/Berlin")
+    resolved = np.concatenate([checker.prepare(raw[:2]), checker.prepare(raw[2:])])
+
+    assert (resolved - FALL_BACK).tolist() == (np.array([-2, -1, 0, 1]) * HOUR).tolist()
+
+
+def test_other_duplicates_are_flagged():
+    checker = QualityChecker(3600, tz_name="UTC")
+    resolved = checker.prepare(np.array([0, HOUR, HOUR, 2 * HOUR]))
+    series = _series([0, HOUR, 2 * HOUR], [1.0, 4.0, 1.0])
+    checker.check(series)
+
+    assert resolved.tolist() == [0, HOUR, HOUR, 2 * HOUR]
+    assert checker.counts["duplicate_timestamps"] == 1
+    assert series.quality_flag.tolist() == [FLAG_OK, FLAG_OUTLIER, FLAG_OK]
+
+
+def test_values_beyond_capacity_are_impossible():
+    checker = QualityChecker(3600, capacity_mw=5.0)
+    series = _series(np.arange(4) * HOUR, [1.0, 6.0, -1.0, 5.2])
+    checker.check(series)
+
+    # 5.2 MWh is within the 5 % headroom over 5 MW × 1 h
+    assert series.quality_flag.tolist() == [FLAG_OK, FLAG_OUTLIER, FLAG_OUTLIER, FLAG_OK]
+    assert checker.counts["impossible_values"] == 2
+    assert series.counts["outlier"] == 2
+
+
+def test_spike_against_same_hour_history_is_an_outlier():
+    ts, energy = _diurnal(12)
+    spike = 11 * 24 + 3  # A night hour, normally zero
+    energy[spike] = 3.0
+
+    checker = QualityChecker(3600)
+    series = _series(ts, energy)
+    checker.check(series)
+
+    assert np.flatnonzero(series.quality_flag == FLAG_OUTLIER).tolist() == [spike]
+    assert checker.counts["rolling_outliers"] == 1
+
+
+@pytest.mark.parametrize("chunk_hours", [1, 7, 24, 100])
+def test_outliers_do_not_depend_on_chunking(chunk_hours):
+    ts, energy = _diurnal(12, seed=3)
+    energy[[10 * 24 + 2, 11 * 24 + 12]] = [3.0, 40.0]
+
+    whole = QualityChecker(3600)
+    expected = _series(ts, energy)
+    whole.check(expected)
+
+    chunked = QualityChecker(3600)
+    flags = []
+    for start in range(0, len(ts), chunk_hours):
+        part = _series(ts[start:start + chunk_hours], energy[start:start + chunk_hours])
+        chunked.check(part)
+        flags.extend(part.quality_flag.tolist())
+
+    assert flags == expected.quality_flag.tolist()
+    assert chunked.counts == whole.counts
+    assert whole.counts["rolling_outliers"] == 2
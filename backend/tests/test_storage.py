@@ -0,0 +1,61 @@
+import asyncio
+import os
+
+import pytest
+
+from backend.modules.generation.services import storage
+
+
+class FakeStorage:
+    def __init__(self, size):
+        self.size = size
+        self.downloads = []
+
+    async def download_to_file(self, storage_uri, local_path):
+        self.downloads.append(storage_uri)
+        with open(local_path, "wb") as f:
+            f.write(b"x" * self.size)
+
+
+@pytest.fixture
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setattr(storage, "LOCAL_CACHE_DIR", str(tmp_path))
+    monkeypatch.setattr(storage, "LOCAL_CACHE_MAX_BYTES", 250)
+    return tmp_path
+
+
+def _fetch(remote, uri):
+    return asyncio.run(storage.fetch_local_copy(remote, uri))
+
+
+def test_cached_copy_is_reused(cache_dir):
+    remote = FakeStorage(100)
+
+    first = _fetch(remote, "gs://bucket/a.csv")
+    second = _fetch(remote, "gs://bucket/a.csv")
+
+    assert first == second
+    assert remote.downloads == ["gs://bucket/a.csv"]
+
+
+def test_least_recently_used_copies_are_evicted(cache_dir):
+    remote = FakeStorage(100)
+    a = _fetch(remote, "gs://bucket/a.csv")
+    b = _fetch(remote, "gs://bucket/b.csv")
+    os.utime(a, (1, 1))
+    os.utime(b, (2, 2))
+    # Reading a again makes b the least recently used copy
+    _fetch(remote, "gs://bucket/a.csv")
+
+    c = _fetch(remote, "gs://bucket/c.csv")
+
+    assert os.path.isfile(a)
+    assert not os.path.isfile(b)
+    assert os.path.isfile(c)
+    assert sum(p.stat().st_size for p in cache_dir.iterdir()) <= 250
+
+
+def test_new_copy_is_kept_when_larger_than_budget(cache_dir):
+    path = _fetch(FakeStorage(1000), "gs://bucket/big.parquet")
+
+    assert os.path.isfile(path)
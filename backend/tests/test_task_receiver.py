@@ -0,0 +1,35 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from backend.core import tasks
+from backend.main import app
+
+TASK = "tests.echo"
+
+
+@pytest.fixture
+def client(monkeypatch):
+    calls = []
+    monkeypatch.setitem(tasks._handlers, TASK, calls.append)
+    client = TestClient(app)
+    client.calls = calls
+    return client
+
+
+def test_task_without_configured_token_is_refused(client, monkeypatch):
+    monkeypatch.delenv("TASKS_AUTH_TOKEN", raising=False)
+
+    response = client.post(f"/tasks/{TASK}", json={"n": 1})
+
+    assert response.status_code == 403
+    assert client.calls == []
+
+
+def test_task_requires_matching_token(client, monkeypatch):
+    monkeypatch.setenv("TASKS_AUTH_TOKEN", "secret")
+
+    assert client.post(f"/tasks/{TASK}", json={"n": 1}, headers={"X-Task-Token": "wrong"}).status_code == 403
+    response = client.post(f"/tasks/{TASK}", json={"n": 2}, headers={"X-Task-Token": "secret"})
+
+    assert response.status_code == 200
+    assert client.calls == [{"n": 2}]
@@ -0,0 +1,65 @@
+from datetime import datetime, timedelta
+
+import numpy as np
+
+from backend.modules.generation.services.type_inference import (
+    detect_timestamp_format,
+    infer_column,
+    parse_timestamp_column,
+)
+
+
+def _series(start: datetime, fmt: str, count: int, step_minutes: int = 5):
+    return [(start + timedelta(minutes=step_minutes * i)).strftime(fmt) for i in range(count)]
+
+
+def _epoch(*args) -> float:
+    return (datetime(*args) - datetime(1970, 1, 1)).total_seconds()
+
+
+def test_iso_format():
+    values = _series(datetime(2024, 3, 1), "%Y-%m-%d %H:%M:%S", 50)
+    assert detect_timestamp_format(values) == "%Y-%m-%d %H:%M:%S"
+
+
+def test_us_dates_resolved_beyond_sample():
+    # The first 200 rows all fall on 03/01; 03/13 onwards shows month-first order
+    values = _series(datetime(2024, 3, 1), "%m/%d/%Y %H:%M", 5000)
+    fmt = detect_timestamp_format(values)
+    assert fmt == "%m/%d/%Y %H:%M"
+
+    parsed = parse_timestamp_column(["03/20/2024 10:00", "03/05/2024 10:00"], fmt)
+    assert parsed.tolist() == [_epoch(2024, 3, 20, 10), _epoch(2024, 3, 5, 10)]
+
+
+def test_day_first_dates_resolved_beyond_sample():
+    values = _series(datetime(2024, 3, 1), "%d/%m/%Y %H:%M", 5000)
+    assert detect_timestamp_format(values) == "%d/%m/%Y %H:%M"
+
+
+def test_ambiguous_day_month_is_not_detected():
+    values = _series(datetime(2024, 3, 1), "%m/%d/%Y %H:%M", 200)
+    assert detect_timestamp_format(values) is None
+    assert infer_column(values) == ("datetime", None)
+
+
+def test_ambiguous_values_parse_month_first_without_format():
+    parsed = parse_timestamp_column(["03/05/2024 10:00", "03/20/2024 10:00"], None)
+    assert parsed.tolist() == [_epoch(2024, 3, 5, 10), _epoch(2024, 3, 20, 10)]
+
+
+def test_unambiguous_sample_is_detected_directly():
+    assert detect_timestamp_format(["13/01/2024", "14/01/2024"]) == "%d/%m/%Y"
+    assert detect_timestamp_format(["01/13/2024", "01/14/2024"]) == "%m/%d/%Y"
+
+
+def test_non_timestamps():
+    assert detect_timestamp_format(["abc", "def"]) is None
+    assert infer_column(["abc", "def"]) == ("string", None)
+    assert infer_column(["1.5", "2"]) == ("numeric", None)
+
+
+def test_unparseable_values_are_nan():
+    parsed = parse_timestamp_column(["2024-03-01 00:00", "", "garbage"], "%Y-%m-%d %H:%M")
+    assert parsed[0] == _epoch(2024, 3, 1)
+    assert np.isnan(parsed[1:]).all()
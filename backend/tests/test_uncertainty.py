@@ -0,0 +1,76 @@
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from backend.modules.generation.services import uncertainty
+
+MONTHLY = {"2023-06": 400.0, "2023-12": 600.0, "2024-06": 1000.0}
+
+
+@pytest.fixture
+def thread_pool(monkeypatch):
+    with ThreadPoolExecutor(max_workers=2) as pool:
+        monkeypatch.setattr(uncertainty, "get_process_pool", lambda: pool)
+        yield pool
+
+
+def _simulate(methodology_id="CDM_AMS_ID", project_type="solar", **kwargs):
+    kwargs.setdefault("ef_override", 0.5)
+    return asyncio.run(uncertainty.simulate_uncertainty(methodology_id, MONTHLY, "IN", project_type, **kwargs))
+
+
+def test_fixed_seed_reproduces_percentiles():
+    # Runs on the spawned process pool, as the endpoint does
+    first = _simulate(draws=2000, seed=7)
+    second = _simulate(draws=2000, seed=7)
+    other = _simulate(draws=2000, seed=8)
+
+    assert first["vintages"] == second["vintages"]
+    assert first["total"] == second["total"]
+    assert other["total"] != first["total"]
+    total = first["total"]
+    assert total["p90"] < total["p50"] < total["p10"]
+    assert total["p50"] == pytest.approx(first["deterministic_er_tco2e"], rel=0.05)
+
+
+def test_without_spread_every_draw_is_deterministic(thread_pool):
+    result = _simulate(draws=500, seed=1, generation_cv=0.0, ef_uncertainty=0.0)
+
+    assert [v["vintage"] for v in result["vintages"]] == [2023, 2024]
+    assert [v["p50"] for v in result["vintages"]] == pytest.approx([500.0, 500.0])
+    assert result["total"]["p90"] == result["total"]["p10"] == pytest.approx(result["deterministic_er_tco2e"])
+
+
+def test_captive_generation_is_split_by_sampled_generation(thread_pool):
+    result = _simulate(
+        "VERRA_AM0123",
+        draws=500,
+        seed=1,
+        generation_cv=0.0,
+        ef_uncertainty=0.0,
+        additional_inputs={"captive_generation_mwh": 1000.0},
+    )
+
+    # Half the period's generation is captive, in every vintage
+    assert [v["p50"] for v in result["vintages"]] == pytest.approx([250.0, 250.0])
+    assert result["total"]["p50"] == pytest.approx(result["deterministic_er_tco2e"])
+
+
+def test_capacity_comes_from_the_project(thread_pool):
+    with pytest.raises(ValueError, match="capacity_mw is required"):
+        _simulate("GS_RE", draws=100, seed=1)
+
+    result = _simulate("GS_RE", draws=100, seed=1, capacity_mw=40.0)
+    assert result["total"]["mean"] > 0
+
+
+def test_biogas_volume_is_required(thread_pool):
+    with pytest.raises(ValueError, match="biogas_captured_m3 is required"):
+        _simulate("CDM_AMS_III_D", "biogas", draws=100, seed=1)
+
+    result = _simulate(
+        "CDM_AMS_III_D", "biogas", draws=100, seed=1, generation_cv=0.0,
+        additional_inputs={"biogas_captured_m3": 50000.0, "biogas_utilization": "flared"},
+    )
+    assert result["total"]["mean"] == pytest.approx(result["deterministic_er_tco2e"])
@@ -0,0 +1,93 @@
+import asyncio
+import hashlib
+import os
+from datetime import datetime, timedelta
+
+import pytest
+
+from backend.core.models import Project, User, UserRole
+from backend.infra import adapters  # noqa: F401  (registers providers before the local module loads)
+from backend.infra.local.adapters import LocalFileStorageAdapter
+from backend.modules.generation.models import UploadSession
+from backend.modules.generation.services.uploads import UPLOAD_SESSION_TTL, ChunkedUploadService
+
+CONTENT = b"timestamp,power_kw\n2024-01-01 00:00,10\n2024-01-01 01:00,12\n"
+
+
+@pytest.fixture
+def service(db, tmp_path):
+    return ChunkedUploadService(db, LocalFileStorageAdapter(str(tmp_path)))
+
+
+def _add_project(db, email, code):
+    user = User(email=email, password_hash="x", role=UserRole.DEVELOPER)
+    db.add(user)
+    db.flush()
+    project = Project(developer_id=user.id, project_type="solar", name=code, code=code)
+    db.add(project)
+    db.commit()
+    return project
+
+
+def _upload(service, project, content=CONTENT):
+    async def run():
+        session = service.start(project.id, "scada.csv", "text/csv", len(content), project.developer_id)
+        await service.append(session, 0, content)
+        return await service.finalize(session)
+    return asyncio.run(run())
+
+
+def test_same_content_is_shared_across_the_owners_projects(db, service, project):
+    original = _upload(service, project)
+    sibling = Project(developer_id=project.developer_id, project_type="solar", name="Sibling", code="TEST-2")
+    db.add(sibling)
+    db.commit()
+
+    copy = _upload(service, sibling)
+
+    assert copy.id != original.id
+    assert copy.project_id == sibling.id
+    assert copy.storage_uri == original.storage_uri
+    assert _upload(service, project).id == original.id
+
+
+def test_other_developers_content_is_not_referenced(db, service, project):
+    original = _upload(service, project)
+    other = _add_project(db, "other@example.com", "OTHER-1")
+
+    upload = _upload(service, other)
+
+    assert upload.storage_uri != original.storage_uri
+    assert os.path.isfile(upload.storage_uri)
+    assert upload.checksum == original.checksum
+
+
+def test_start_with_known_checksum_completes_only_for_the_owner(db, service, project):
+    original = _upload(service, project)
+    checksum = hashlib.sha256(CONTENT).hexdigest()
+    other = _add_project(db, "other@example.com", "OTHER-1")
+
+    own = service.start(project.id, "again.csv", "text/csv", len(CONTENT), project.developer_id, checksum)
+    foreign = service.start(other.id, "copy.csv", "text/csv", len(CONTENT), other.developer_id, checksum)
+
+    assert own.status == "completed"
+    assert own.file_id == original.id
+    assert foreign.status == "open"
+    assert foreign.file_id is None
+
+
+def test_idle_sessions_expire(db, service, project):
+    idle = service.start(project.id, "idle.csv", "text/csv", None, project.developer_id)
+    active = service.start(project.id, "active.csv", "text/csv", None, project.developer_id)
+    asyncio.run(service.append(idle, 0, CONTENT))
+    db.query(UploadSession).filter(UploadSession.id == idle.id).update(
+        {"updated_at": datetime.utcnow() - UPLOAD_SESSION_TTL - timedelta(minutes=1)}
+    )
+    db.commit()
+
+    assert asyncio.run(service.expire_stale()) == 1
+    db.refresh(idle)
+    db.refresh(active)
+    assert idle.status == "expired"
+    assert active.status == "open"
+    assert not os.path.exists(service.storage._parts_dir(idle.id))